@@ -0,0 +1,18 @@
+"""
+관리자 API 인증
+
+- PII_ADMIN_TOKEN 미설정 시 관리자 API 비활성 (404)
+- 요청 헤더 X-Admin-Token 값이 일치해야 허용 (403)
+"""
+import hmac
+import os
+from fastapi import Header, HTTPException
+
+PII_ADMIN_TOKEN = os.getenv("PII_ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: str = Header(default="")) -> None:
+    if not PII_ADMIN_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(x_admin_token.encode(), PII_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Forbidden")
@@ -0,0 +1,121 @@
+"""
+비동기 구조화 감사 로그 (JSON Lines)
+
+- 요청 경로에서는 큐에 넣기만 함 (가득 차면 버리고 드롭 수 집계)
+- 백그라운드 스레드가 배치 단위로 파일/stdout에 기록
+- 기록 항목: request_id, endpoint, 판정, 라벨, 엔티티 유형별 개수, 단계별 소요 시간 (원문/마스킹 텍스트 미포함)
+- 차단 판정은 항상 기록, 미차단은 AUDIT_SAMPLE_RATE 비율로 샘플링
+"""
+import atexit
+import json
+import os
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+from app.metrics import Counter, register
+
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "1").lower() in ("1", "true", "on")
+AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "-")  # "-": stdout
+AUDIT_SAMPLE_RATE = float(os.getenv("AUDIT_SAMPLE_RATE", "1.0"))
+AUDIT_QUEUE_SIZE = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "256"))
+AUDIT_FLUSH_INTERVAL = float(os.getenv("AUDIT_FLUSH_INTERVAL", "1.0"))
+
+AUDIT_RECORDS = register(Counter("pii_audit_records_total", "Audit log records by outcome", ("outcome",)))
+
+
+class AuditLogger:
+    def __init__(self):
+        self._queue: "queue.Queue[Dict]" = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def emit(self, record: Dict) -> None:
+        """큐에 기록 요청 (블로킹 없음)"""
+        if not AUDIT_ENABLED:
+            return
+        if not record.get("blocked") and random.random() >= AUDIT_SAMPLE_RATE:
+            AUDIT_RECORDS.inc("sampled_out")
+            return
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            AUDIT_RECORDS.inc("dropped")
+
+    def _ensure_thread(self) -> None:
+        # fork 이후 워커에서 최초 기록 시 스레드 시작
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="pii-audit", daemon=True)
+                self._thread.start()
+
+    def _drain(self, first: Dict) -> List[Dict]:
+        batch = [first]
+        while len(batch) < AUDIT_BATCH_SIZE:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, batch: List[Dict]) -> None:
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in batch)
+        if AUDIT_LOG_PATH == "-":
+            sys.stdout.write(data)
+            sys.stdout.flush()
+        else:
+            with open(AUDIT_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(data)
+        AUDIT_RECORDS.inc("written", amount=len(batch))
+
+    def _run(self) -> None:
+        while True:
+            try:
+                first = self._queue.get(timeout=AUDIT_FLUSH_INTERVAL)
+            except queue.Empty:
+                continue
+            try:
+                self._write(self._drain(first))
+            except Exception as e:
+                AUDIT_RECORDS.inc("error")
+                sys.stderr.write(f"[AUDIT ERROR] {e}\n")
+
+    def flush(self) -> None:
+        """남은 레코드 동기 기록 (프로세스 종료 시)"""
+        while True:
+            try:
+                first = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            self._write(self._drain(first))
+
+
+AUDIT = AuditLogger()
+atexit.register(AUDIT.flush)
+
+
+def new_request_id(header_value: Optional[str] = None) -> str:
+    return header_value or uuid.uuid4().hex
+
+
+def log_verdict(endpoint: str, request_id: str, trace: Dict, blocked: bool, labels: List[str], reason: str, **extra) -> None:
+    """판정 결과 감사 로그 (원문/마스킹 텍스트는 기록하지 않음)"""
+    AUDIT.emit({
+        "ts": round(time.time(), 3),
+        "request_id": request_id,
+        "endpoint": endpoint,
+        "blocked": blocked,
+        "reason": reason,
+        "labels": labels,
+        "entities": trace.get("entities", {}),
+        "spans": sum(trace.get("entities", {}).values()),
+        "stages_ms": {k: round(v * 1000, 3) for k, v in trace.get("stages", {}).items()},
+        **extra,
+    })
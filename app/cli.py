@@ -0,0 +1,374 @@
+"""
+오프라인 대량 검사 CLI (pii_pipeline)
+
+- 입력: 파일/디렉토리/표준입력(-)
+  - .jsonl: 줄 단위 레코드 (--text-field, --id-field)
+  - .csv: 행 단위 레코드 (--text-field, --id-field)
+  - 그 외 텍스트 파일: 파일 1개 = 레코드 1개
+- 프로세스 풀: 프로세스 당 모델 1회 로드 (initializer), 레코드 배치 단위 분배
+- 출력: 입력 순서대로 JSONL 스트리밍 기록 (판정, 라벨, 사유, 마스킹 텍스트)
+- 체크포인트: 기록 완료 레코드 수 + 출력 파일 오프셋, --resume 시 이어서 처리
+- 진행 상황: records/s 를 stderr 로 주기 출력
+- table: CSV 열 유형 추정 후 번호형 열은 NumPy 일괄 검증, 자유 텍스트 열만 전체 분석 (app.pii_table)
+- names: KR_PERSON 이름 사전 컴파일 (app.gazetteer)
+
+실행:
+    uv run python -m app.cli scan <input ...> --out results.jsonl [--workers 4] [--resume]
+    uv run python -m app.cli table <csv ...> --out results.jsonl [--workers 4] [--resume]
+    uv run python -m app.cli names <names.txt ...> --out models/names/names.bin
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from app.resources import PLAN
+
+TEXT_EXTS = {".txt", ".log", ".md", ".json", ".html", ".xml"}
+
+Record = Tuple[str, str, str, Optional[str]]  # (id, source, text, 입력 오류)
+
+
+# --- 입력 ---
+
+def iter_paths(inputs: List[str]) -> Iterator[Path]:
+    """입력 경로 (디렉토리는 정렬된 재귀 목록, 순서 고정으로 재개 가능)"""
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            for p in sorted(path.rglob("*")):
+                if p.is_file() and (p.suffix.lower() in TEXT_EXTS or p.suffix.lower() in (".jsonl", ".csv")):
+                    yield p
+        else:
+            yield path
+
+
+def _iter_jsonl(lines, source: str, text_field: str, id_field: str) -> Iterator[Record]:
+    """잘못된 줄은 중단하지 않고 오류 레코드로 전달 (출처:줄 번호)"""
+    for lineno, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"{source}:{lineno}", source, "", f"JSONDecodeError: line {lineno} column {e.colno}: {e.msg}"
+            continue
+        if not isinstance(obj, dict):
+            yield f"{source}:{lineno}", source, "", f"ValueError: line {lineno}: expected JSON object"
+            continue
+        yield str(obj.get(id_field, f"{source}:{lineno}")), source, str(obj.get(text_field) or ""), None
+
+
+def _iter_csv(f, source: str, text_field: str, id_field: str) -> Iterator[Record]:
+    csv.field_size_limit(sys.maxsize)
+    for rowno, row in enumerate(csv.DictReader(f), 1):
+        yield str(row.get(id_field) or f"{source}:{rowno}"), source, row.get(text_field) or "", None
+
+
+def iter_records(inputs: List[str], text_field: str = "text", id_field: str = "id") -> Iterator[Record]:
+    for item in inputs:
+        if item == "-":
+            yield from _iter_jsonl(sys.stdin, "-", text_field, id_field)
+            continue
+        for path in iter_paths([item]):
+            suffix = path.suffix.lower()
+            if suffix == ".jsonl":
+                with open(path, encoding="utf-8-sig") as f:
+                    yield from _iter_jsonl(f, str(path), text_field, id_field)
+            elif suffix == ".csv":
+                with open(path, encoding="utf-8-sig", newline="") as f:
+                    yield from _iter_csv(f, str(path), text_field, id_field)
+            else:
+                yield str(path), str(path), path.read_text(encoding="utf-8", errors="replace"), None
+
+
+def batched(records: Iterator[Record], size: int) -> Iterator[List[Record]]:
+    batch: List[Record] = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# --- 워커 프로세스 ---
+
+_pipeline = None
+
+
+def _init_worker() -> None:
+    """프로세스 당 1회 모델 로드 (대용량 병렬 분석은 CLI 프로세스 풀과 중첩되지 않도록 비활성)"""
+    global _pipeline
+    os.environ["PARALLEL_ENABLED"] = "0"
+    os.environ.setdefault("AUDIT_ENABLED", "0")
+    from app.pii_main import pii_pipeline
+    _pipeline = pii_pipeline
+
+
+def scan_batch(batch: List[Record], with_text: bool = True) -> List[Dict]:
+    if _pipeline is None:
+        _init_worker()
+    out = []
+    for rid, source, text, error in batch:
+        if error is not None:
+            out.append({"id": rid, "source": source, "error": error})
+            continue
+        try:
+            blocked, masked_text, labels, reason = _pipeline(text)
+        except Exception as e:
+            out.append({"id": rid, "source": source, "error": f"{type(e).__name__}: {e}"})
+            continue
+        row = {"id": rid, "source": source, "blocked": blocked, "label_list": labels, "reason": reason}
+        if with_text:
+            row["masked_text"] = masked_text
+        out.append(row)
+    return out
+
+
+# --- 체크포인트 ---
+
+def load_checkpoint(path: Path, inputs: List[str]) -> Dict:
+    if not path.exists():
+        return {"inputs": inputs, "done": 0, "offset": 0}
+    state = json.loads(path.read_text(encoding="utf-8"))
+    if state.get("inputs") != inputs:
+        raise SystemExit(f"checkpoint {path} was created for different inputs: {state.get('inputs')}")
+    return state
+
+
+def save_checkpoint(path: Path, state: Dict) -> None:
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(state), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# --- 진행 상황 ---
+
+class Progress:
+    def __init__(self, start: int, interval: float):
+        self.start, self.interval = start, interval
+        self.done, self.blocked, self.errors = start, 0, 0
+        self.t0 = self.last = time.perf_counter()
+
+    def update(self, rows: List[Dict]) -> None:
+        self.done += len(rows)
+        self.blocked += sum(1 for r in rows if r.get("blocked"))
+        self.errors += sum(1 for r in rows if "error" in r)
+        now = time.perf_counter()
+        if now - self.last >= self.interval:
+            self.last = now
+            sys.stderr.write(f"[SCAN] {self.summary_line()}\n")
+
+    def summary(self) -> Dict:
+        elapsed = time.perf_counter() - self.t0
+        scanned = self.done - self.start
+        return {
+            "records": self.done,
+            "scanned": scanned,
+            "blocked": self.blocked,
+            "errors": self.errors,
+            "seconds": round(elapsed, 3),
+            "records_per_sec": round(scanned / elapsed, 2) if elapsed else 0.0,
+        }
+
+    def summary_line(self) -> str:
+        s = self.summary()
+        return f"records={s['records']} blocked={s['blocked']} errors={s['errors']} rate={s['records_per_sec']}/s"
+
+
+# --- 실행 (순서 유지 + 체크포인트) ---
+
+def run_jobs(args, make_tasks: Callable[[int], Iterator], fn: Callable[..., List[Dict]]) -> Dict:
+    """make_tasks(건너뛸 레코드 수)가 만든 작업을 fn 으로 처리하고 입력 순서대로 JSONL 기록"""
+    out_path = Path(args.out)
+    ckpt_path = Path(args.checkpoint or f"{args.out}.ckpt")
+    state = load_checkpoint(ckpt_path, args.inputs) if args.resume else {"inputs": args.inputs, "done": 0, "offset": 0}
+
+    # 마지막 체크포인트 이후 기록된 줄은 버리고 이어서 기록
+    out = open(out_path, "r+b" if args.resume and out_path.exists() else "wb")
+    out.seek(state["offset"])
+    out.truncate()
+
+    progress = Progress(state["done"], args.progress_interval)
+    last_ckpt = time.perf_counter()
+    with_text = not args.no_text
+
+    def _write(rows: List[Dict]) -> None:
+        nonlocal last_ckpt
+        out.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in rows).encode("utf-8"))
+        progress.update(rows)
+        if time.perf_counter() - last_ckpt >= args.checkpoint_interval:
+            out.flush()
+            state.update(done=progress.done, offset=out.tell())
+            save_checkpoint(ckpt_path, state)
+            last_ckpt = time.perf_counter()
+
+    try:
+        if args.workers <= 1:
+            for task in make_tasks(state["done"]):
+                _write(fn(task, with_text))
+        else:
+            with ProcessPoolExecutor(args.workers, initializer=_init_worker) as pool:
+                # 입력 순서 유지, 동시 처리 작업 수 제한 (메모리 상한)
+                inflight: deque = deque()
+                for task in make_tasks(state["done"]):
+                    inflight.append(pool.submit(fn, task, with_text))
+                    while len(inflight) >= args.workers * 2:
+                        _write(inflight.popleft().result())
+                while inflight:
+                    _write(inflight.popleft().result())
+    finally:
+        out.flush()
+        state.update(done=progress.done, offset=out.tell())
+        save_checkpoint(ckpt_path, state)
+        out.close()
+
+    summary = progress.summary()
+    sys.stderr.write(f"[SCAN] done {json.dumps(summary)}\n")
+    return summary
+
+
+# --- scan ---
+
+def scan(args) -> Dict:
+    def _tasks(skip: int) -> Iterator[List[Record]]:
+        records = iter_records(args.inputs, args.text_field, args.id_field)
+        for _ in range(skip):
+            next(records, None)
+        return batched(records, args.batch_size)
+
+    return run_jobs(args, _tasks, scan_batch)
+
+
+# --- table ---
+
+TableTask = Tuple[str, int, List[str], Dict[str, str], List[List[str]], Optional[int]]
+
+
+def iter_table_tasks(inputs: List[str], chunk_rows: int, sample_rows: int, id_field: str, skip: int = 0) -> Iterator[TableTask]:
+    """CSV 파일 별 열 유형 추정 후 (출처, 시작 행, 열, 열 유형, 행 묶음, id 열) 작업 생성"""
+    from app.pii_table import infer_column_types
+
+    csv.field_size_limit(sys.maxsize)
+    seen = 0
+    for path in iter_paths(inputs):
+        if path.suffix.lower() != ".csv":
+            continue
+        with open(path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.reader(f)
+            columns = next(reader, None)
+            if not columns:
+                continue
+            sample = [row for _, row in zip(range(sample_rows), reader)]
+            col_types = infer_column_types(columns, sample)
+            sys.stderr.write(f"[TABLE] {path} columns={json.dumps(col_types, ensure_ascii=False)}\n")
+            id_col = columns.index(id_field) if id_field in columns else None
+
+            chunk: List[List[str]] = []
+            start = 0
+            for rowno, row in enumerate(itertools.chain(sample, reader)):
+                seen += 1
+                if seen <= skip:
+                    start = rowno + 1
+                    continue
+                chunk.append(row)
+                if len(chunk) >= chunk_rows:
+                    yield str(path), start, columns, col_types, chunk, id_col
+                    start, chunk = rowno + 1, []
+            if chunk:
+                yield str(path), start, columns, col_types, chunk, id_col
+
+
+def scan_table_chunk(task: TableTask, with_text: bool = True) -> List[Dict]:
+    if _pipeline is None:
+        _init_worker()
+    from app.pii_table import scan_rows
+
+    source, start, columns, col_types, rows, id_col = task
+    out = []
+    for i, (blocked, labels, reason, masked) in enumerate(scan_rows(columns, col_types, rows)):
+        rowno = start + i + 1
+        rid = rows[i][id_col] if id_col is not None and id_col < len(rows[i]) else f"{source}:{rowno}"
+        row = {"id": rid, "source": source, "row": rowno, "blocked": blocked, "label_list": labels, "reason": reason}
+        if with_text:
+            row["masked"] = masked
+        out.append(row)
+    return out
+
+
+def table(args) -> Dict:
+    return run_jobs(
+        args,
+        lambda skip: iter_table_tasks(args.inputs, args.chunk_rows, args.sample_rows, args.id_field, skip),
+        scan_table_chunk,
+    )
+
+
+# --- names ---
+
+def names(args) -> Dict:
+    """이름 목록 → 이름 사전 바이너리 (KR_PERSON_BACKEND=gazetteer|cascade|union, NAME_GAZETTEER_PATH)"""
+    from app.gazetteer import build_file
+
+    t0 = time.perf_counter()
+    count, nodes = build_file(args.inputs, args.out, args.min_chars)
+    summary = {"out": args.out, "names": count, "nodes": nodes, "bytes": Path(args.out).stat().st_size,
+               "seconds": round(time.perf_counter() - t0, 3)}
+    print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    return summary
+
+
+def _common_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--out", required=True, help="결과 JSONL 경로")
+    p.add_argument("--workers", type=int, default=PLAN.cpus, help="프로세스 수 (기본: CPU 예산)")
+    p.add_argument("--id-field", default="id", help="JSONL/CSV 식별자 필드")
+    p.add_argument("--checkpoint", default="", help="체크포인트 경로 (기본: <out>.ckpt)")
+    p.add_argument("--checkpoint-interval", type=float, default=10.0, help="체크포인트 저장 주기 (초)")
+    p.add_argument("--resume", action="store_true", help="체크포인트에서 이어서 처리")
+    p.add_argument("--progress-interval", type=float, default=5.0, help="진행 상황 출력 주기 (초)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Korean PII offline bulk scanner")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("scan", help="파일/디렉토리/JSONL/CSV 검사 후 JSONL 출력")
+    p.add_argument("inputs", nargs="+", help="파일, 디렉토리 또는 - (표준입력 JSONL)")
+    _common_args(p)
+    p.add_argument("--batch-size", type=int, default=64, help="작업 단위 레코드 수")
+    p.add_argument("--text-field", default="text", help="JSONL/CSV 텍스트 필드")
+    p.add_argument("--no-text", action="store_true", help="masked_text 미출력")
+    p.set_defaults(func=scan)
+
+    p = sub.add_parser("table", help="CSV 열 단위 검사 (번호형 열 일괄 검증, 행 단위 조합 판정)")
+    p.add_argument("inputs", nargs="+", help="CSV 파일 또는 디렉토리")
+    _common_args(p)
+    p.add_argument("--chunk-rows", type=int, default=5000, help="작업 단위 행 수")
+    p.add_argument("--sample-rows", type=int, default=1000, help="열 유형 추정 샘플 행 수")
+    p.add_argument("--no-text", action="store_true", help="마스킹된 셀 미출력")
+    p.set_defaults(func=table)
+
+    p = sub.add_parser("names", help="이름 목록(줄 당 1개) → KR_PERSON 이름 사전 컴파일")
+    p.add_argument("inputs", nargs="+", help="이름 목록 파일 (UTF-8, # 주석)")
+    p.add_argument("--out", required=True, help="사전 바이너리 경로 (NAME_GAZETTEER_PATH)")
+    p.add_argument("--min-chars", type=int, default=2, help="최소 이름 길이")
+    p.set_defaults(func=names)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = build_parser().parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
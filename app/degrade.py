@@ -0,0 +1,84 @@
+"""
+부하 적응형 품질 단계 (degradation tier)
+
+- tier 1: 전체 파이프라인
+- tier 2: 패턴 인식기 + KR_PERSON 은 짝 엔티티 주변(window)에서만 추론
+  - KOELECTRA_ONNX_QUANT_FILE(양자화 모델) 설정 시 해당 모델 사용, OCR 최대 크기 DEGRADE_MAX_IMAGE_SIZE
+- tier 3: fail-closed, 정규식 인식기만 사용 (고유식별번호 + 패턴 인식기, 이름 사전 설정 시 사전)
+  - 조합 규칙의 짝이 텍스트 어디에든 함께 있으면 차단 (window 무시)
+  - KR_PERSON 은 찾지 않는 것으로 보고 짝 엔티티(전화번호, 계좌번호 등)가 단독으로 있어도 차단
+- 스케줄러가 작업 실행 직전 클래스 별 큐 점유율/대기 시간 EWMA 로 단계 결정
+  - 상향은 즉시, 하향은 DEGRADE_HOLD_S 동안 조건이 해소된 뒤 한 단계씩
+- 단계는 요청 컨텍스트(ContextVar)로 전달, 응답 tier 필드 / 감사 로그 / pii_tier_total, pii_tier
+"""
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Tuple
+from app.metrics import Counter, annotate, register, register_gauge
+
+DEGRADE_ENABLED = os.getenv("DEGRADE_ENABLED", "1").lower() in ("1", "true", "on")
+DEGRADE_FORCE_TIER = int(os.getenv("DEGRADE_FORCE_TIER", "0"))  # 0: 자동
+DEGRADE_TIER2_DEPTH = float(os.getenv("DEGRADE_TIER2_DEPTH", "0.25"))  # 큐 점유율
+DEGRADE_TIER3_DEPTH = float(os.getenv("DEGRADE_TIER3_DEPTH", "0.75"))
+DEGRADE_TIER2_WAIT_MS = float(os.getenv("DEGRADE_TIER2_WAIT_MS", "500"))  # 큐 대기 EWMA
+DEGRADE_TIER3_WAIT_MS = float(os.getenv("DEGRADE_TIER3_WAIT_MS", "2000"))
+DEGRADE_HOLD_S = float(os.getenv("DEGRADE_HOLD_S", "5"))
+DEGRADE_MAX_IMAGE_SIZE = int(os.getenv("DEGRADE_MAX_IMAGE_SIZE", "1024"))
+
+TIER: ContextVar[int] = ContextVar("pii_tier", default=1)
+TIER_JOBS = register(Counter("pii_tier_total", "Jobs processed per degradation tier", ("class", "tier")))
+
+
+def current_tier() -> int:
+    """현재 컨텍스트(요청)의 품질 단계 (스케줄러 밖에서는 1)"""
+    return TIER.get()
+
+
+def enter_tier(cls: str, tier: int) -> None:
+    """작업 컨텍스트에 단계 설정 (스케줄러 워커에서 job 컨텍스트로 호출)"""
+    TIER.set(tier)
+    TIER_JOBS.inc(cls, str(tier))
+    annotate("tier", tier)
+
+
+class TierController:
+    """워크로드 클래스 별 단계 (히스테리시스)"""
+    def __init__(self):
+        self._state: Dict[str, Tuple[int, float]] = {}  # 클래스 -> (단계, 조건 유지 시작 시각)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def target(depth_ratio: float, wait_s: float) -> int:
+        wait_ms = wait_s * 1000
+        if depth_ratio >= DEGRADE_TIER3_DEPTH or wait_ms >= DEGRADE_TIER3_WAIT_MS:
+            return 3
+        if depth_ratio >= DEGRADE_TIER2_DEPTH or wait_ms >= DEGRADE_TIER2_WAIT_MS:
+            return 2
+        return 1
+
+    def observe(self, cls: str, depth_ratio: float, wait_s: float) -> int:
+        if DEGRADE_FORCE_TIER:
+            return DEGRADE_FORCE_TIER
+        if not DEGRADE_ENABLED:
+            return 1
+        target = self.target(depth_ratio, wait_s)
+        now = time.monotonic()
+        with self._lock:
+            tier, since = self._state.get(cls, (1, now))
+            if target >= tier:
+                tier, since = target, now
+            elif now - since >= DEGRADE_HOLD_S:
+                tier, since = tier - 1, now
+            self._state[cls] = (tier, since)
+        return tier
+
+    def tiers(self) -> Dict[tuple, float]:
+        with self._lock:
+            return {(cls,): tier for cls, (tier, _) in self._state.items()}
+
+
+TIERS = TierController()
+
+register_gauge("pii_tier", "Current degradation tier per workload class", TIERS.tiers, ("class",))
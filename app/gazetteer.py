@@ -0,0 +1,192 @@
+"""
+이름 사전(gazetteer) 매칭 엔진 (KR_PERSON 사전 백엔드, app.recognizer.name_recognizer)
+
+- 이름 목록(직원 명부 등, 수십만 건)을 문자 단위 trie 로 컴파일한 바이너리 파일
+  - 노드 별 간선 시작 위치, 간선 문자(정렬), 간선 대상 노드, 종단 여부 배열 (uint32/uint8)
+  - mmap 으로 로드 (복사 없음, gunicorn 워커 간 페이지 캐시 공유), 간선 탐색은 이진 탐색
+- 탐색: 단어 시작 위치에서만 trie 를 따라감 → 텍스트 길이 × 최대 이름 길이 (선형)
+  - 왼쪽 경계: 앞 글자가 문자/숫자가 아님 (한글 음절 포함)
+  - 오른쪽 경계: 뒤 글자가 문자/숫자가 아니거나 조사/호칭(님, 씨, 은, 는, 에게 ...)으로 시작
+  - 같은 위치에서는 경계 조건을 만족하는 가장 긴 이름
+- 이름은 NFC 정규화, --min-chars(기본 2) 미만은 제외
+
+컴파일:
+    uv run python -m app.cli names names.txt --out models/names/names.bin
+"""
+import mmap
+import re
+import struct
+import unicodedata
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+MAGIC = b"KRNAME01"
+HEADER = struct.Struct("<8sIIII")  # magic, 노드 수, 간선 수, 이름 수, 최대 이름 길이
+HEADER_SIZE = 32
+
+# 이름 바로 뒤에 올 수 있는 조사/호칭
+SUFFIXES = (
+    "님", "씨", "군", "양", "은", "는", "이", "가", "을", "를", "의", "에", "과", "와", "도", "만",
+    "께", "한테", "에게", "으로", "로", "이가", "이는", "이를", "이의", "이랑", "랑",
+)
+
+WORD_START = re.compile(r"(?<!\w)\w")
+
+
+def _uint32() -> array:
+    arr = array("I")
+    if arr.itemsize != 4:
+        arr = array("L")
+    return arr
+
+
+def normalize(name: str) -> str:
+    return unicodedata.normalize("NFC", name.strip())
+
+
+def build(names: Iterable[str], min_chars: int = 2) -> bytes:
+    """이름 목록 → trie 바이너리"""
+    children: List[dict] = [{}]
+    terminal = bytearray(1)
+    count, max_len = 0, 0
+    for raw in names:
+        name = normalize(raw)
+        if len(name) < min_chars or name.startswith("#"):
+            continue
+        node = 0
+        for ch in name:
+            nxt = children[node].get(ch)
+            if nxt is None:
+                nxt = children[node][ch] = len(children)
+                children.append({})
+                terminal.append(0)
+            node = nxt
+        if not terminal[node]:
+            terminal[node] = 1
+            count += 1
+            max_len = max(max_len, len(name))
+
+    # BFS 순서로 노드 번호 재배정, 노드 별 간선은 문자 순 정렬
+    order, index = [0], {0: 0}
+    for node in order:
+        for ch in sorted(children[node]):
+            index[children[node][ch]] = len(order)
+            order.append(children[node][ch])
+    first, labels, targets = _uint32(), _uint32(), _uint32()
+    for node in order:
+        first.append(len(labels))
+        for ch in sorted(children[node]):
+            labels.append(ord(ch))
+            targets.append(index[children[node][ch]])
+    first.append(len(labels))
+    term = bytes(terminal[node] for node in order)
+
+    header = HEADER.pack(MAGIC, len(order), len(labels), count, max_len).ljust(HEADER_SIZE, b"\0")
+    return header + first.tobytes() + labels.tobytes() + targets.tobytes() + term
+
+
+def build_file(paths: Iterable[str], out: str, min_chars: int = 2) -> Tuple[int, int]:
+    """이름 파일(줄 당 1개, UTF-8, # 주석) → 바이너리 파일, (이름 수, 노드 수) 반환"""
+    def _lines():
+        for path in paths:
+            with open(path, encoding="utf-8-sig") as f:
+                yield from f
+
+    data = build(_lines(), min_chars)
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(f"{out}.tmp")
+    tmp.write_bytes(data)
+    tmp.replace(out)
+    _, nodes, _, names, _ = HEADER.unpack_from(data)
+    return names, nodes
+
+
+class Gazetteer:
+    """컴파일된 이름 사전 (파일 mmap 또는 메모리 바이트)"""
+    def __init__(self, data, source: str = "<memory>"):
+        self.source = source
+        view = memoryview(data)
+        magic, self.nodes, self.edges, self.names, self.max_len = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError(f"{source}: not a name gazetteer file")
+        off = HEADER_SIZE
+        self.first = view[off:off + 4 * (self.nodes + 1)].cast("I")
+        off += 4 * (self.nodes + 1)
+        self.labels = view[off:off + 4 * self.edges].cast("I")
+        off += 4 * self.edges
+        self.targets = view[off:off + 4 * self.edges].cast("I")
+        off += 4 * self.edges
+        self.terminal = view[off:off + self.nodes]
+        self._data = data  # mmap 유지 (프로세스 수명 동안)
+        # 이름 첫 글자 (단어 시작 위치 빠른 제외)
+        self.initials = frozenset(self.labels[self.first[0]:self.first[1]])
+
+    @classmethod
+    def open(cls, path: str) -> "Gazetteer":
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mm, str(path))
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], min_chars: int = 2) -> "Gazetteer":
+        return cls(build(names, min_chars))
+
+    def _child(self, node: int, code: int) -> int:
+        lo, hi = self.first[node], self.first[node + 1]
+        i = bisect_left(self.labels, code, lo, hi)
+        if i < hi and self.labels[i] == code:
+            return self.targets[i]
+        return -1
+
+    def __contains__(self, name: str) -> bool:
+        node = 0
+        for ch in normalize(name):
+            node = self._child(node, ord(ch))
+            if node < 0:
+                return False
+        return bool(self.terminal[node])
+
+    @staticmethod
+    def _right_ok(text: str, end: int) -> bool:
+        return end >= len(text) or not text[end].isalnum() or text.startswith(SUFFIXES, end)
+
+    def find(self, text: str) -> List[Tuple[int, int]]:
+        """(start, end) 목록 (겹치지 않음, 위치 순)"""
+        out: List[Tuple[int, int]] = []
+        n, last = len(text), 0
+        if not self.names:
+            return out
+        for m in WORD_START.finditer(text):
+            start = m.start()
+            if start < last or ord(text[start]) not in self.initials:
+                continue
+            node, best = 0, None
+            for j in range(start, min(n, start + self.max_len)):
+                node = self._child(node, ord(text[j]))
+                if node < 0:
+                    break
+                if self.terminal[node] and self._right_ok(text, j + 1):
+                    best = j + 1
+            if best is not None:
+                out.append((start, best))
+                last = best
+        return out
+
+
+def outside(text: str, spans: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """spans(사전 일치 구간)를 뺀 나머지 구간 (문자/숫자가 없는 구간 제외, cascade 모델 입력)"""
+    out: List[Tuple[int, int]] = []
+    pos = 0
+    for start, end in sorted(spans) + [(len(text), len(text))]:
+        if start > pos and any(ch.isalnum() for ch in text[pos:start]):
+            out.append((pos, start))
+        pos = max(pos, end)
+    return out
+
+
+def load(path: Optional[str]) -> Gazetteer:
+    if not path or not Path(path).is_file():
+        raise FileNotFoundError(f"name gazetteer not found: {path!r} (build with: python -m app.cli names)")
+    return Gazetteer.open(path)
@@ -0,0 +1,50 @@
+"""
+gunicorn 설정 (pre-fork 모델 로딩)
+
+- preload_app: 마스터에서 app.main을 1회 import (토크나이저, 정규식, 탐지 규칙(app/ruleset.yml), Presidio 레지스트리, ONNX 모델 바이트)
+- 워커는 fork 후 copy-on-write로 공유, ONNX 세션/OCR 엔진은 워커에서 최초 사용 시 생성
+- fork 직전 gc.freeze()로 GC가 공유 객체 페이지를 건드려 복사되는 것을 방지
+- 워커 부팅 시간과 메모리(RSS/PSS/USS)를 로그로 남겨 워커 당 메모리 측정
+- 워커 수/스레드 수는 CPU 예산(cgroup 할당량, affinity)에서 결정 (app.resources, WEB_CONCURRENCY 지정 시 우선)
+
+실행:
+    gunicorn -c python:app.gunicorn_conf app.main:app
+"""
+import gc
+import os
+import time
+from app.resources import PLAN
+
+preload_app = True
+worker_class = "uvicorn.workers.UvicornWorker"
+workers = PLAN.workers
+bind = os.getenv("BIND", "0.0.0.0:8000")
+timeout = 120
+graceful_timeout = 30
+keepalive = 30
+accesslog = "-"
+errorlog = "-"
+
+# HF tokenizers 내부 스레드 풀은 fork 후 교착 가능
+os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+# OpenMP/MKL 스레드 수 (Paddle, numpy import 전)
+PLAN.apply_env()
+
+_fork_started = {}
+
+
+def when_ready(server):
+    from app.startup import memory_kb  # preload 후 (app.startup 시작 시각에 영향 없음)
+    server.log.info("[PRELOAD] master pid=%d memory=%s", os.getpid(), memory_kb(os.getpid()))
+
+
+def pre_fork(server, worker):
+    gc.freeze()
+    _fork_started[worker.age] = time.perf_counter()
+
+
+def post_worker_init(worker):
+    from app.startup import memory_kb
+    started = _fork_started.get(worker.age)
+    boot = (time.perf_counter() - started) if started else -1.0
+    worker.log.info("[PRELOAD] worker pid=%d boot=%.3fs memory=%s", worker.pid, boot, memory_kb(worker.pid))
@@ -0,0 +1,401 @@
+"""
+비동기 작업 API (대용량 이미지/문서 배치, /pii/jobs)
+
+- POST 는 업로드를 JOBS_DIR 에 저장하고 작업 ID 를 즉시 반환 (OCR 시간이 HTTP 연결/gunicorn timeout 에 묶이지 않음)
+- 작업 저장소: JOBS_DIR/jobs.sqlite3 (WAL), 같은 호스트의 gunicorn 워커가 모두 공유하며 재시작 후에도 유지
+  - 워커 별 작업 스레드(JOBS_WORKERS)가 대기 작업을 트랜잭션(BEGIN IMMEDIATE)으로 가져감 → 한 작업은 한 워커만 처리
+  - 페이지 1장씩 스케줄러 job 클래스 큐에서 실행 (대화형 text/image 요청과 가중치로 경쟁, 나머지 작업은 저장소에서 대기)
+  - 페이지마다 진행 상황(pages_done)과 처리 시각 기록, 취소 여부 확인
+- 결과: 파일 별 판정 (파일 안에서는 /pii/image 와 같이 차단 페이지에서 종료), 원문/추출 텍스트는 저장하지 않음
+- 정리
+  - 입력 파일은 완료/실패/취소 즉시 삭제, 결과는 JOBS_TTL 후 삭제
+  - JOBS_TTL 안에 시작하지 못한 대기 작업은 실패(expired) 처리
+  - 처리 중 워커가 비정상 종료되면 JOBS_STALE_S 후 다시 대기 (JOBS_MAX_ATTEMPTS 회 시도 후 실패)
+"""
+import asyncio
+import json
+import logging
+import math
+import os
+import shutil
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from fastapi.concurrency import run_in_threadpool
+from app import audit, metrics, ruleset
+from app.metrics import Counter, register, register_gauge
+from app.pii_document import iter_upload_texts
+from app.pii_main import pii_pipeline
+from app.profiling import PROFILER
+from app.resources import PLAN
+from app.scheduler import SCHEDULER, SHED, Overloaded
+from app.upload import StoredUpload
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+JOBS_DIR = Path(os.getenv("JOBS_DIR", "/tmp/pii-jobs"))
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "1"))                 # 워커 프로세스 당 작업 스레드
+JOBS_MAX_QUEUED = int(os.getenv("JOBS_MAX_QUEUED", "256"))         # 대기 작업 상한 (초과 시 429)
+JOBS_TTL = int(os.getenv("JOBS_TTL", "3600"))                      # 결과 보관 / 대기 작업 만료 (초)
+JOBS_STALE_S = int(os.getenv("JOBS_STALE_S", "300"))               # 진행 기록이 없으면 워커 종료로 간주 (초)
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "2"))
+JOBS_POLL_INTERVAL = float(os.getenv("JOBS_POLL_INTERVAL", "1.0"))  # 대기 작업/long-poll 확인 주기 (초)
+JOBS_MAX_WAIT = float(os.getenv("JOBS_MAX_WAIT", "30"))            # GET ?wait= 상한 (초)
+JOBS_SWEEP_INTERVAL = float(os.getenv("JOBS_SWEEP_INTERVAL", "60"))
+
+ENDPOINT = "/pii/jobs"
+TERMINAL = ("done", "failed", "cancelled")
+
+FINISHED = register(Counter("pii_jobs_total", "Finished async jobs", ("status",)))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    request_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    files TEXT NOT NULL,
+    pages_done INTEGER NOT NULL DEFAULT 0,
+    files_done INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel INTEGER NOT NULL DEFAULT 0,
+    owner TEXT,
+    result TEXT,
+    error TEXT,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    expires REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created);
+"""
+
+
+def _view(row: sqlite3.Row) -> Dict:
+    return {
+        "job_id": row["id"],
+        "status": row["status"],
+        "files": json.loads(row["files"]),
+        "pages_done": row["pages_done"],
+        "files_done": row["files_done"],
+        "result": json.loads(row["result"]) if row["result"] else None,
+        "error": row["error"],
+        "created": row["created"],
+        "updated": row["updated"],
+        "expires": row["expires"],
+    }
+
+
+class JobStore:
+    """작업 저장소 (sqlite + 입력 파일 디렉터리, 스레드 별 연결)"""
+    def __init__(self, root: Path = JOBS_DIR):
+        self.root = root
+        self.inputs = root / "inputs"
+        self.service = 0.0  # 작업 처리 시간 EWMA (초, 이 프로세스 기준)
+        self._local = threading.local()
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            self.inputs.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self.root / "jobs.sqlite3", timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def _tx(self) -> Iterator[sqlite3.Connection]:
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    def _remove_inputs(self, job_id: str) -> None:
+        shutil.rmtree(self.inputs / job_id, ignore_errors=True)
+
+    def retry_after(self, queued: int) -> int:
+        slots = max(1, PLAN.workers * JOBS_WORKERS)
+        return max(1, math.ceil(max(self.service, 1.0) * queued / slots))
+
+    def create(self, uploads: List, request_id: str) -> Dict:
+        """업로드 파일 저장 후 대기 작업 등록 (대기 작업 JOBS_MAX_QUEUED 초과 시 Overloaded)"""
+        db = self._db()
+        queued = db.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+        if queued >= JOBS_MAX_QUEUED:
+            SHED.inc("job", "queue_full")
+            raise Overloaded("job", "queue_full", self.retry_after(queued))
+
+        job_id = uuid.uuid4().hex
+        folder = self.inputs / job_id
+        folder.mkdir(parents=True)
+        files = []
+        try:
+            for i, upload in enumerate(uploads):
+                upload.file.seek(0)
+                with open(folder / str(i), "wb") as out:
+                    shutil.copyfileobj(upload.file, out, 1024 * 1024)
+                files.append({"name": upload.filename, "type": upload.content_type, "size": upload.size})
+            now = time.time()
+            db.execute(
+                "INSERT INTO jobs (id, request_id, status, files, created, updated, expires) VALUES (?, ?, 'queued', ?, ?, ?, ?)",
+                (job_id, request_id, json.dumps(files, ensure_ascii=False), now, now, now + JOBS_TTL),
+            )
+        except BaseException:
+            self._remove_inputs(job_id)
+            raise
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        row = self._db().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return _view(row) if row else None
+
+    async def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """종료 상태가 되거나 timeout(최대 JOBS_MAX_WAIT)이 지날 때까지 대기 (long-poll)"""
+        deadline = time.monotonic() + min(max(timeout, 0.0), JOBS_MAX_WAIT)
+        while True:
+            job = await run_in_threadpool(self.get, job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job["status"] in TERMINAL or remaining <= 0:
+                return job
+            await asyncio.sleep(min(JOBS_POLL_INTERVAL, remaining))
+
+    def cancel(self, job_id: str) -> Optional[Dict]:
+        """대기 작업은 즉시 취소, 처리 중 작업은 다음 페이지 전에 중단, 종료된 작업은 결과 삭제"""
+        now = time.time()
+        with self._tx() as db:
+            row = db.execute("SELECT id, status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            status = row["status"]
+            if status == "queued":
+                db.execute("UPDATE jobs SET status = 'cancelled', cancel = 1, updated = ?, expires = ? WHERE id = ?",
+                           (now, now + JOBS_TTL, row["id"]))
+                status = "cancelled"
+            elif status == "running":
+                db.execute("UPDATE jobs SET cancel = 1 WHERE id = ?", (row["id"],))
+                status = "cancelling"
+            else:
+                db.execute("DELETE FROM jobs WHERE id = ?", (row["id"],))
+                status = "deleted"
+        if status in ("cancelled", "deleted"):
+            self._remove_inputs(row["id"])
+        return {"job_id": row["id"], "status": status}
+
+    def claim(self, owner: str) -> Optional[Dict]:
+        """가장 오래된 대기 작업을 owner 의 처리 중 작업으로 변경"""
+        with self._tx() as db:
+            row = db.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created LIMIT 1").fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', owner = ?, attempts = attempts + 1, pages_done = 0, files_done = 0, updated = ? WHERE id = ?",
+                (owner, time.time(), row["id"]),
+            )
+            job = db.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone()
+        return {**_view(job), "request_id": job["request_id"]}
+
+    def progress(self, job_id: str, owner: str, pages_done: int, files_done: int) -> bool:
+        """진행 상황 기록, 계속 처리할지 반환 (취소 요청 또는 다른 워커로 재할당 시 False)"""
+        cur = self._db().execute(
+            "UPDATE jobs SET pages_done = ?, files_done = ?, updated = ? WHERE id = ? AND owner = ? AND status = 'running' AND cancel = 0",
+            (pages_done, files_done, time.time(), job_id, owner),
+        )
+        return cur.rowcount > 0
+
+    def finish(self, job_id: str, owner: str, status: str, result: Optional[Dict], error: Optional[str]) -> bool:
+        now = time.time()
+        cur = self._db().execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, owner = NULL, updated = ?, expires = ? WHERE id = ? AND owner = ? AND status = 'running'",
+            (status, json.dumps(result, ensure_ascii=False) if result else None, error, now, now + JOBS_TTL, job_id, owner),
+        )
+        if cur.rowcount == 0:
+            return False  # 취소 후 삭제되었거나 다른 워커로 재할당됨 (입력은 그쪽에서 정리)
+        self._remove_inputs(job_id)
+        return True
+
+    def release(self, owner: str) -> int:
+        """owner 의 처리 중 작업을 다시 대기 상태로 (워커 정상 종료 시, 시도 횟수 미반영)"""
+        cur = self._db().execute(
+            "UPDATE jobs SET status = 'queued', owner = NULL, attempts = attempts - 1, updated = ? WHERE owner = ? AND status = 'running'",
+            (time.time(), owner),
+        )
+        return cur.rowcount
+
+    def sweep(self) -> Tuple[int, int]:
+        """중단된 작업 재시도/실패, 만료 작업 삭제, 남은 입력 파일 정리 → (재시도, 삭제) 수"""
+        now = time.time()
+        stale = now - JOBS_STALE_S
+        with self._tx() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'worker lost', owner = NULL, updated = ?, expires = ? "
+                "WHERE status = 'running' AND updated < ? AND attempts >= ?",
+                (now, now + JOBS_TTL, stale, JOBS_MAX_ATTEMPTS),
+            )
+            retried = db.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, updated = ? WHERE status = 'running' AND updated < ?",
+                (now, stale),
+            ).rowcount
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = 'expired', updated = ?, expires = ? WHERE status = 'queued' AND expires < ?",
+                (now, now + JOBS_TTL, now),
+            )
+            deleted = db.execute("DELETE FROM jobs WHERE status IN ('done', 'failed', 'cancelled') AND expires < ?", (now,)).rowcount
+            active = {r["id"] for r in db.execute("SELECT id FROM jobs WHERE status IN ('queued', 'running')")}
+        # 종료/삭제된 작업의 입력 (등록 중인 작업은 파일 저장이 끝날 시간을 두고 제외)
+        for folder in self.inputs.iterdir():
+            if folder.name not in active and folder.stat().st_mtime < stale:
+                shutil.rmtree(folder, ignore_errors=True)
+        return retried, deleted
+
+    def counts(self) -> Dict[tuple, float]:
+        try:
+            rows = self._db().execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        except sqlite3.Error:
+            return {}
+        return {(r["status"],): r["n"] for r in rows}
+
+
+def _scan_next(pages) -> Optional[tuple]:
+    """다음 페이지 1장 추출 + 검사 (job 큐 워커 스레드에서 실행), 마지막 페이지 이후 None"""
+    text = next(pages, None)
+    if text is None:
+        return None
+    blocked, _, labels, reason = pii_pipeline(text)
+    return blocked, labels, reason
+
+
+class JobRunner:
+    """워커 프로세스 별 작업 스레드 (gunicorn fork 이후 lifespan 에서 시작)"""
+    def __init__(self, store: JobStore, workers: int = JOBS_WORKERS):
+        self.store = store
+        self.workers = max(1, workers)
+        self.owner = ""
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid: Optional[int] = None
+
+    def start(self) -> None:
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self.owner = f"{socket.gethostname()}:{os.getpid()}"
+            for i in range(self.workers):
+                threading.Thread(target=self._loop, args=(i,), name=f"pii-job-{i}", daemon=True).start()
+            self._pid = os.getpid()
+        logger.info("[JOBS] pid=%d workers=%d dir=%s", os.getpid(), self.workers, self.store.root)
+
+    def stop(self) -> None:
+        """처리 중 작업을 다른 워커에 넘김 (남은 페이지는 처음부터 다시 처리)"""
+        if self._pid != os.getpid():
+            return
+        released = self.store.release(self.owner)
+        if released:
+            logger.info("[JOBS] released %d running job(s)", released)
+
+    def notify(self) -> None:
+        """새 작업 등록 시 대기 중인 작업 스레드 깨우기 (다른 워커는 JOBS_POLL_INTERVAL 마다 확인)"""
+        self._wake.set()
+
+    def _loop(self, index: int) -> None:
+        last_sweep = 0.0
+        while True:
+            job = None
+            try:
+                if index == 0 and time.monotonic() - last_sweep >= JOBS_SWEEP_INTERVAL:
+                    last_sweep = time.monotonic()
+                    retried, deleted = self.store.sweep()
+                    if retried or deleted:
+                        logger.info("[JOBS] sweep retried=%d deleted=%d", retried, deleted)
+                job = self.store.claim(self.owner)
+            except (sqlite3.Error, OSError):
+                logger.exception("[JOBS] store error")
+            if job is None:
+                self._wake.wait(JOBS_POLL_INTERVAL)
+                self._wake.clear()
+                continue
+            self._run(job)
+
+    def _run(self, job: Dict) -> None:
+        t0 = time.monotonic()
+        status, result, error = "done", None, None
+        try:
+            result = asyncio.run(self._process(job))
+            if result is None:
+                status = "cancelled"
+        except Exception as e:
+            logger.exception("[JOBS] job %s failed", job["job_id"])
+            status, error = "failed", f"{type(e).__name__}: {getattr(e, 'detail', e)}"[:500]
+        try:
+            if self.store.finish(job["job_id"], self.owner, status, result, error):
+                FINISHED.inc(status)
+        except sqlite3.Error:
+            logger.exception("[JOBS] could not store result of %s", job["job_id"])
+        elapsed = time.monotonic() - t0
+        self.store.service = elapsed if self.store.service == 0.0 else 0.8 * self.store.service + 0.2 * elapsed
+
+    async def _process(self, job: Dict) -> Optional[Dict]:
+        """파일 별 페이지 검사, 취소/재할당 시 None"""
+        trace = metrics.start_trace()
+        rules = ruleset.pin()
+        job_id, verdicts, pages_done, tier = job["job_id"], [], 0, 1
+        with metrics.timed("request_job"):
+            for i, meta in enumerate(job["files"]):
+                verdict = {"name": meta["name"], "blocked": False, "label_list": [], "reason": "", "pages": 0}
+                upload = StoredUpload(str(self.store.inputs / job_id / str(i)), meta["name"], meta["type"])
+                try:
+                    with closing(iter_upload_texts(upload)) as pages:
+                        while True:
+                            page = await SCHEDULER.run("job", _scan_next, pages)
+                            if page is None:
+                                break
+                            pages_done += 1
+                            verdict["pages"] += 1
+                            tier = max(tier, trace.get("tier", 1))
+                            if not self.store.progress(job_id, self.owner, pages_done, i):
+                                return None
+                            blocked, labels, reason = page
+                            if blocked:
+                                verdict.update(blocked=True, label_list=labels, reason=reason)
+                                break
+                finally:
+                    upload.close()
+                verdicts.append(verdict)
+                if not self.store.progress(job_id, self.owner, pages_done, i + 1):
+                    return None
+
+        flagged = [v for v in verdicts if v["blocked"]]
+        blocked = bool(flagged)
+        labels = list(dict.fromkeys(label for v in flagged for label in v["label_list"]))
+        reason = flagged[0]["reason"] if flagged else ""
+        metrics.record_verdict(ENDPOINT, blocked, reason)
+        PROFILER.tick()
+        audit.log_verdict(ENDPOINT, job["request_id"], trace, blocked, labels, reason,
+                          tier=tier, ruleset=rules.version, job_id=job_id, files=len(verdicts), pages=pages_done)
+        return {
+            "blocked": blocked,
+            "masked_text": "",
+            "label_list": labels,
+            "reason": reason,
+            "tier": tier,
+            "ruleset": rules.version,
+            "files": verdicts,
+        }
+
+
+STORE = JobStore()
+RUNNER = JobRunner(STORE)
+
+register_gauge("pii_jobs", "Async jobs in the shared store per status", STORE.counts, ("status",))
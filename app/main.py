@@ -1,20 +1,56 @@
+from app import startup
 from pydantic import BaseModel
-from typing import List
 from pathlib import Path
+from contextlib import asynccontextmanager, closing
+import codecs
+import json
+import os
 # --- module ---
-from app.pii_main import pii_pipeline
-from app.pii_ocr import pii_ocr_single
+with startup.trace("import app.pii_main"):
+    from app.pii_main import pii_pipeline
+from app import audit, metrics, ruleset, warmup
+from app.admin import require_admin
+from app.pii_general import PARALLEL_ENABLED
+from app.pii_stream import StreamMasker
+from app.pii_session import SESSIONS, SessionOffsetError
+from app.profiling import PROFILER
+from app.scheduler import SCHEDULER, Overloaded
 # --- FastAPI ---
-from fastapi import FastAPI, Request, File, UploadFile
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.openapi.docs import (
     get_swagger_ui_html,
     get_swagger_ui_oauth2_redirect_html,
 )
 
-# --- FastAPI 앱 초기화 ---
+# 동기 엔드포인트 스레드 풀 크기 (0: anyio 기본값 40)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+
+# --- FastAPI 앱 초기화 (워커 시작 시 백그라운드 워밍업) ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if THREADPOOL_SIZE > 0:
+        import anyio.to_thread
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+    if PARALLEL_ENABLED:
+        from app.pii_parallel import start_pools, stop_pools
+        start_pools()
+    SCHEDULER.start()
+    ruleset.start_watcher()
+    warmup.start_warmup()
+    if startup.OCR_ENABLED:
+        from app.jobs import RUNNER
+        RUNNER.start()
+    yield
+    if startup.OCR_ENABLED:
+        RUNNER.stop()
+    if PARALLEL_ENABLED:
+        stop_pools()
+
 app = FastAPI(
+    lifespan=lifespan,
     title="Korean PII API",
     version="1.0.0",
     docs_url=None,
@@ -51,6 +87,24 @@ class PingResponse(BaseModel):
 async def ping():
     return JSONResponse({"ping": True})
 
+class ReadyResponse(BaseModel):
+    ready: bool
+    timings: dict
+    error: str | None = None
+
+@app.get("/pii/ready", response_model=ReadyResponse, tags=["Ping"])
+async def ready():
+    body = {"ready": warmup.STATE["ready"], "timings": warmup.STATE["timings"], "error": warmup.STATE["error"]}
+    return JSONResponse(body, status_code=200 if warmup.STATE["ready"] else 503)
+
+@app.get("/pii/metrics", tags=["Ping"], response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+@app.get("/pii/startup", tags=["Ping"])
+async def startup_report():
+    return JSONResponse(startup.report())
+
 
 # --- 2. /pii/text ---
 
@@ -62,40 +116,243 @@ class Out(BaseModel):
     masked_text: str
     label_list: list[str]
     reason: str
+    tier: int = 1   # 품질 단계 (1: 전체, 2: 부분 NER, 3: 정규식 fail-closed)
+    ruleset: str = ""   # 판정에 사용한 규칙 버전 (app/ruleset.yml)
+
+async def _scheduled(cls: str, deadline_ms: int | None, fn, *args):
+    """워크로드 클래스 큐를 거쳐 실행 (과부하 시 429/503 + Retry-After)"""
+    try:
+        return await SCHEDULER.run(cls, fn, *args, deadline_ms=deadline_ms)
+    except Overloaded as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def _finish(endpoint: str, request_id: str, trace: dict, blocked: bool, labels: list, reason: str, **extra) -> None:
+    """요청 종료 공통 처리 (메트릭, 프로파일러, 감사 로그)"""
+    metrics.record_verdict(endpoint, blocked, reason)
+    PROFILER.tick()
+    audit.log_verdict(endpoint, request_id, trace, blocked, labels, reason, tier=trace.get("tier", 1), ruleset=trace.get("ruleset", ""), **extra)
 
 @app.post("/pii/text", response_model=Out)
-def analyze(inp: In):
-    blocked, masked_text, labels, reason = pii_pipeline(inp.text)
+async def analyze(
+    inp: In,
+    response: Response,
+    x_request_id: str | None = Header(default=None),
+    x_deadline_ms: int | None = Header(default=None),
+):
+    request_id = audit.new_request_id(x_request_id)
+    response.headers["X-Request-ID"] = request_id
+    trace = metrics.start_trace()
+    ruleset.pin()
+
+    with metrics.timed("request_text"):
+        blocked, masked_text, labels, reason = await _scheduled("text", x_deadline_ms, pii_pipeline, inp.text)
+    _finish("/pii/text", request_id, trace, blocked, labels, reason, chars=len(inp.text))
 
     return Out(
         blocked=blocked, 
         masked_text=masked_text, 
         label_list=labels,
-        reason=reason
+        reason=reason,
+        tier=trace.get("tier", 1),
+        ruleset=trace.get("ruleset", ""),
     )
 
-# --- 3. /pii/image ---
+# --- 3. /pii/image (OCR_ENABLED 일 때만 등록) ---
 
-@app.post("/pii/image", response_model=Out)
-async def analyze_image(files: List[UploadFile] = File(...)):
+if startup.OCR_ENABLED:
+    with startup.trace("import app.pii_document"):
+        from app.pii_document import DocumentError, iter_upload_texts
+        from app.upload import UPLOAD_OPENAPI, close_uploads, read_uploads
 
-    for file in files:
-        content = await file.read()
-        extracted_text = pii_ocr_single(content)
-        blocked, masked_text, labels, reason = pii_pipeline(extracted_text)
+    def _scan_uploads(files) -> tuple:
+        """업로드 파일 페이지 별 검사 (image 큐 워커 스레드에서 실행), 차단 페이지 발견 시 즉시 종료"""
+        pages_done = 0
+        for file in files:
+            with closing(iter_upload_texts(file)) as pages:
+                for extracted_text in pages:
+                    pages_done += 1
+                    blocked, _, labels, reason = pii_pipeline(extracted_text)
+                    if blocked:
+                        return blocked, labels, reason, pages_done
+        return False, [], "", pages_done
 
-        if blocked:
-            print(f"[PII DETECTED] IMAGE : {blocked} / {masked_text} / {labels} / {reason}")
-            return Out(
-                blocked=blocked,
-                masked_text="",
-                label_list=labels,
-                reason=reason
+    @app.post("/pii/image", response_model=Out, openapi_extra=UPLOAD_OPENAPI)
+    async def analyze_image(request: Request, response: Response):
+        request_id = audit.new_request_id(request.headers.get("x-request-id"))
+        response.headers["X-Request-ID"] = request_id
+        trace = metrics.start_trace()
+        ruleset.pin()
+        deadline = request.headers.get("x-deadline-ms")
+
+        # 스트리밍 수신 (크기/형식 검사), 파일은 디코더에 버퍼로 직접 전달
+        # PDF/TIFF는 페이지 단위로 처리 (OCR은 image 워크로드 큐에서 실행)
+        files = await read_uploads(request)
+        try:
+            blocked, labels, reason, pages_done = await _scheduled(
+                "image", int(deadline) if deadline and deadline.isdigit() else None, _scan_uploads, files
             )
+        except DocumentError as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e))
+        except TimeoutError as e:
+            # OCR 워커 풀 응답 시간 초과 (OCR_TIMEOUT)
+            raise HTTPException(status_code=504, detail=str(e))
+        finally:
+            close_uploads(files)
 
-    return Out(
-        blocked=False,
-        masked_text="",
-        label_list=[],
-        reason=""
+        _finish("/pii/image", request_id, trace, blocked, labels, reason, files=len(files), pages=pages_done)
+        return Out(
+            blocked=blocked,
+            masked_text="",
+            label_list=labels,
+            reason=reason,
+            tier=trace.get("tier", 1),
+            ruleset=trace.get("ruleset", ""),
+        )
+
+# --- 4. /pii/jobs (OCR_ENABLED 일 때만 등록) ---
+
+if startup.OCR_ENABLED:
+    with startup.trace("import app.jobs"):
+        from app.jobs import RUNNER, STORE
+
+    @app.post("/pii/jobs", status_code=202, tags=["Jobs"], openapi_extra=UPLOAD_OPENAPI)
+    async def create_job(request: Request, response: Response):
+        """
+        업로드를 저장하고 작업 ID를 즉시 반환 (/pii/image 와 같은 multipart 요청)
+        - OCR/검사는 워커의 작업 스레드에서 처리, GET /pii/jobs/{job_id} 로 진행 상황과 결과 조회
+        """
+        request_id = audit.new_request_id(request.headers.get("x-request-id"))
+        response.headers["X-Request-ID"] = request_id
+        files = await read_uploads(request)
+        try:
+            job = await run_in_threadpool(STORE.create, files, request_id)
+        except Overloaded as e:
+            raise HTTPException(status_code=e.status_code, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+        finally:
+            close_uploads(files)
+        RUNNER.notify()
+        response.headers["Location"] = f"/pii/jobs/{job['job_id']}"
+        return job
+
+    @app.get("/pii/jobs/{job_id}", tags=["Jobs"])
+    async def get_job(job_id: str, wait: float = 0.0):
+        """작업 상태/진행 상황(pages_done, files_done)/결과, wait 초 동안 완료를 기다린 뒤 반환 (long-poll)"""
+        job = await STORE.wait(job_id, wait)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+    @app.delete("/pii/jobs/{job_id}", tags=["Jobs"])
+    def cancel_job(job_id: str):
+        """대기/처리 중 작업 취소 (처리 중이면 다음 페이지 전에 중단), 종료된 작업은 결과 삭제"""
+        job = STORE.cancel(job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return job
+
+# --- 5. /pii/stream ---
+
+@app.post("/pii/stream", tags=["Stream"])
+async def analyze_stream(request: Request):
+    """
+    텍스트 조각을 chunked 요청 본문으로 받아 안전한 앞부분을 NDJSON으로 즉시 반환
+    - 조각: {"text": "..."} / 종료: {"done": true, "blocked": ..., "label_list": [...], "reason": "..."}
+    """
+    request_id = audit.new_request_id(request.headers.get("x-request-id"))
+
+    async def _events():
+        trace = metrics.start_trace()
+        ruleset.pin()
+        masker = StreamMasker()
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        chars = 0
+        with metrics.timed("request_stream"):
+            async for chunk in request.stream():
+                delta = decoder.decode(chunk)
+                if not delta:
+                    continue
+                chars += len(delta)
+                safe = await run_in_threadpool(masker.feed, delta)
+                if safe:
+                    yield json.dumps({"text": safe}, ensure_ascii=False) + "\n"
+            masker.pending += decoder.decode(b"", final=True)
+            safe = await run_in_threadpool(masker.close)
+        if safe:
+            yield json.dumps({"text": safe}, ensure_ascii=False) + "\n"
+
+        blocked, labels, reason = masker.verdict()
+        _finish("/pii/stream", request_id, trace, blocked, labels, reason, chars=chars, forced=masker.forced)
+        yield json.dumps({"done": True, "blocked": blocked, "label_list": labels, "reason": reason, "ruleset": masker.rules.version}, ensure_ascii=False) + "\n"
+
+    return StreamingResponse(_events(), media_type="application/x-ndjson", headers={"X-Request-ID": request_id})
+
+# --- 6. /pii/session ---
+
+class SessionIn(BaseModel):
+    text: str
+    offset: int   # 클라이언트가 알고 있는 이전 텍스트 길이 (0: 새 세션), 불일치 시 409
+
+class PrefixMask(BaseModel):
+    start: int
+    end: int
+    tag: str
+
+class SessionOut(Out):
+    offset: int
+    prefix_masks: list[PrefixMask]
+
+@app.post("/pii/session/{conversation_id}", response_model=SessionOut, tags=["Session"])
+async def analyze_session(
+    conversation_id: str,
+    inp: SessionIn,
+    response: Response,
+    x_request_id: str | None = Header(default=None),
+    x_deadline_ms: int | None = Header(default=None),
+):
+    """
+    대화의 새 텍스트(suffix)만 전송하여 증분 분석
+    - offset: 클라이언트가 알고 있는 이전 텍스트 길이 (0: 세션 초기화, 불일치 시 409)
+    - masked_text: suffix 마스킹 결과, prefix_masks: 이전 텍스트에서 새로 마스킹이 필요해진 구간
+    """
+    request_id = audit.new_request_id(x_request_id)
+    response.headers["X-Request-ID"] = request_id
+    trace = metrics.start_trace()
+    ruleset.pin()
+
+    with metrics.timed("request_session"):
+        try:
+            result = await _scheduled("text", x_deadline_ms, SESSIONS.append, conversation_id, inp.text, inp.offset)
+        except SessionOffsetError as e:
+            raise HTTPException(status_code=409, detail={"message": str(e), "offset": e.length})
+    _finish("/pii/session", request_id, trace, result["blocked"], result["label_list"], result["reason"], chars=len(inp.text), offset=result["offset"])
+    return {**result, "tier": trace.get("tier", 1), "ruleset": trace.get("ruleset", "")}
+
+@app.delete("/pii/session/{conversation_id}", tags=["Session"])
+def delete_session(conversation_id: str):
+    return JSONResponse({"deleted": SESSIONS.delete(conversation_id)})
+
+# --- 7. /pii/admin ---
+
+@app.post("/pii/admin/profile", tags=["Admin"], dependencies=[Depends(require_admin)])
+def profile_capture(seconds: float = 10.0, requests: int = 0):
+    """Python 샘플링 + ONNX Runtime 프로파일 캡처 (seconds 경과 또는 requests 건 처리 시 종료)"""
+    try:
+        archive = PROFILER.capture(seconds, requests)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return Response(
+        content=archive,
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="pii-profile.zip"'},
     )
+
+@app.post("/pii/admin/ruleset/reload", tags=["Admin"], dependencies=[Depends(require_admin)])
+def ruleset_reload():
+    """app/ruleset.yml 다시 컴파일 후 교체 (요청을 받은 워커만, 다른 워커는 파일 감시로 반영)"""
+    try:
+        changed, version = ruleset.reload()
+    except ruleset.RulesetError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"changed": changed, "version": version}
+
+startup.finish()
@@ -0,0 +1,186 @@
+"""
+Prometheus 텍스트 포맷 메트릭 (/pii/metrics)
+
+- 외부 의존성 없는 최소 구현: Counter, Histogram, 콜백 Gauge
+- 기록 비용: bisect 1회 + 락 1회 (스크레이프가 없어도 상시 기록, 렌더링은 스크레이프 시에만)
+- gunicorn 워커 별 프로세스 메모리에 저장 (스크레이프 시 응답한 워커의 값)
+- start_trace() 이후 같은 컨텍스트의 단계 시간/엔티티 수를 요청 단위로도 수집 (감사 로그용)
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{k}="{str(v)}"' for k, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = ()):
+        self.name, self.help, self.labelnames = name, help, labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labelnames: Tuple[str, ...] = (), buckets: Tuple[float, ...] = BUCKETS):
+        self.name, self.help, self.labelnames, self.buckets = name, help, labelnames, buckets
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][idx] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()]
+        for labels, counts, total, n in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = 'le="%s"' % bound
+                lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}")
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labelnames, labels, le)} {n}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, labels)} {n}")
+        return lines
+
+
+class CallbackGauge:
+    """스크레이프 시점에 콜백으로 값을 읽는 Gauge (큐 길이, 캐시 통계 등)"""
+    def __init__(self, name: str, help: str, fn: Callable[[], Dict[Tuple[str, ...], float]], labelnames: Tuple[str, ...] = ()):
+        self.name, self.help, self.fn, self.labelnames = name, help, fn, labelnames
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self.fn()
+        except Exception:
+            return lines
+        for labels, value in values.items():
+            lines.append(f"{self.name}{_labels(self.labelnames, labels)} {value}")
+        return lines
+
+
+REGISTRY: List = []
+
+
+def register(metric):
+    REGISTRY.append(metric)
+    return metric
+
+
+def register_gauge(name: str, help: str, fn: Callable[[], Dict[Tuple[str, ...], float]], labelnames: Tuple[str, ...] = ()) -> CallbackGauge:
+    return register(CallbackGauge(name, help, fn, labelnames))
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# --- 공통 메트릭 ---
+
+STAGE_SECONDS = register(Histogram("pii_stage_seconds", "Latency of pipeline stages", ("stage",)))
+RECOGNIZER_SECONDS = register(Histogram("pii_recognizer_seconds", "Latency of each Presidio/custom recognizer", ("recognizer",)))
+REQUESTS = register(Counter("pii_requests_total", "Requests by endpoint and verdict", ("endpoint", "blocked")))
+BLOCKED = register(Counter("pii_blocked_total", "Blocked verdicts by reason", ("reason",)))
+ENTITIES = register(Counter("pii_entities_total", "Detected entities by type", ("entity",)))
+
+
+# --- 요청 단위 추적 ---
+
+_TRACE: ContextVar[Optional[Dict]] = ContextVar("pii_trace", default=None)
+
+
+def start_trace() -> Dict:
+    """현재 컨텍스트(요청)의 단계 시간/엔티티 수 수집 시작"""
+    trace = {"stages": {}, "entities": {}}
+    _TRACE.set(trace)
+    return trace
+
+
+def record_entity(entity: str) -> None:
+    ENTITIES.inc(entity)
+    trace = _TRACE.get()
+    if trace is not None:
+        trace["entities"][entity] = trace["entities"].get(entity, 0) + 1
+
+
+def record_verdict(endpoint: str, blocked: bool, reason: str) -> None:
+    """요청 판정 결과 카운트"""
+    REQUESTS.inc(endpoint, "true" if blocked else "false")
+    if blocked:
+        BLOCKED.inc(reason)
+
+
+def annotate(key: str, value) -> None:
+    """현재 요청 추적에 값 기록 (품질 단계 등)"""
+    trace = _TRACE.get()
+    if trace is not None:
+        trace[key] = value
+
+
+def record_stage(stage: str, elapsed: float) -> None:
+    """단계 소요 시간을 pii_stage_seconds 와 현재 요청 추적에 기록"""
+    STAGE_SECONDS.observe(elapsed, stage)
+    trace = _TRACE.get()
+    if trace is not None:
+        trace["stages"][stage] = trace["stages"].get(stage, 0.0) + elapsed
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    """단계 소요 시간을 pii_stage_seconds에 기록"""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - t0)
+
+
+def instrument_recognizer(recognizer) -> None:
+    """Presidio 인식기 analyze 호출 시간을 pii_recognizer_seconds에 기록"""
+    analyze = recognizer.analyze
+    name = getattr(recognizer, "name", type(recognizer).__name__)
+
+    def _analyze(*args, **kwargs):
+        t0 = time.perf_counter()
+        try:
+            return analyze(*args, **kwargs)
+        finally:
+            RECOGNIZER_SECONDS.observe(time.perf_counter() - t0, name)
+
+    recognizer.analyze = _analyze
@@ -0,0 +1,233 @@
+"""
+ONNX Runtime 기반 PP-OCRv5 엔진 (OCR_ENGINE=onnx)
+
+- 검출: PP-OCRv5_mobile_det (DB) + 자체 DB 후처리
+- 인식: korean_PP-OCRv5_mobile_rec (CTC) + korean_dict.txt 디코딩
+- paddlepaddle/paddleocr import 없이 동작 (onnxruntime, opencv, pyclipper, shapely)
+
+모델 변환 (Paddle -> ONNX):
+    paddlex --paddle2onnx --paddle_model_dir <DET_DIR> --onnx_model_dir <DET_DIR>
+    paddlex --paddle2onnx --paddle_model_dir <REC_DIR> --onnx_model_dir <REC_DIR>
+"""
+import logging
+import math
+from pathlib import Path
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+import onnxruntime as ort
+import pyclipper
+from shapely.geometry import Polygon
+from app.metrics import timed
+from app.pii_ocr import sort_boxes
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# 검출 설정 (PP-OCRv5 파이프라인 기본값)
+DET_LIMIT_SIDE_LEN = 64
+DET_MAX_SIDE_LIMIT = 4000
+DET_THRESH = 0.3
+DET_BOX_THRESH = 0.6
+DET_UNCLIP_RATIO = 1.5
+DET_MAX_CANDIDATES = 1000
+DET_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+DET_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# 인식 설정
+REC_IMAGE_SHAPE = (3, 48, 320)
+REC_BATCH_SIZE = 6
+
+
+class OnnxOCR:
+    """
+    PP-OCRv5 검출/인식 ONNX 엔진
+
+    입력: RGB numpy 배열 (H, W, 3)
+    """
+    def __init__(self, det_path: str, rec_path: str, dict_path: str, cpu_threads: int = 2):
+        session_opts = ort.SessionOptions()
+        session_opts.intra_op_num_threads = cpu_threads
+        session_opts.inter_op_num_threads = 1
+        session_opts.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+        self.det_session = ort.InferenceSession(det_path, sess_options=session_opts, providers=["CPUExecutionProvider"])
+        self.rec_session = ort.InferenceSession(rec_path, sess_options=session_opts, providers=["CPUExecutionProvider"])
+        self.det_input = self.det_session.get_inputs()[0].name
+        self.rec_input = self.rec_session.get_inputs()[0].name
+
+        # CTC 문자표: 0번 blank, 마지막 공백
+        with open(dict_path, encoding="utf-8") as f:
+            chars = [line.rstrip("\r\n") for line in f]
+        self.characters = ["blank"] + chars + [" "]
+
+        logger.info("OnnxOCR initialized - det: %s, rec: %s, dict: %d", det_path, rec_path, len(chars))
+
+    # --- 공통 ---
+
+    def predict_texts(self, img_rgb: np.ndarray) -> List[str]:
+        """검출 + 인식 후 텍스트 목록 반환"""
+        boxes = self.detect(img_rgb)
+        if not boxes:
+            return []
+        return [text.strip() for text, _ in self.recognize(img_rgb, boxes) if text and text.strip()]
+
+    # --- 검출 ---
+
+    def detect(self, img_rgb: np.ndarray) -> List[np.ndarray]:
+        """텍스트 박스 검출 (원본 좌표, 4x2 float32, 위->아래/왼->오른 정렬)"""
+        with timed("ocr_detect"):
+            img_bgr = np.ascontiguousarray(img_rgb[:, :, ::-1])
+            src_h, src_w = img_bgr.shape[:2]
+            tensor = self._det_preprocess(img_bgr)
+            pred = self.det_session.run(None, {self.det_input: tensor})[0][0, 0]
+            boxes = self._db_postprocess(pred, src_h, src_w)
+        return sort_boxes(boxes)
+
+    @staticmethod
+    def _det_preprocess(img: np.ndarray) -> np.ndarray:
+        h, w = img.shape[:2]
+        ratio = 1.0
+        if min(h, w) < DET_LIMIT_SIDE_LEN:
+            ratio = DET_LIMIT_SIDE_LEN / min(h, w)
+        if max(h, w) * ratio > DET_MAX_SIDE_LIMIT:
+            ratio = DET_MAX_SIDE_LIMIT / max(h, w)
+        resize_h = max(int(round(h * ratio / 32) * 32), 32)
+        resize_w = max(int(round(w * ratio / 32) * 32), 32)
+
+        resized = cv2.resize(img, (resize_w, resize_h))
+        x = (resized.astype(np.float32) / 255.0 - DET_MEAN) / DET_STD
+        x = x.transpose(2, 0, 1)[np.newaxis, ...]
+        return np.ascontiguousarray(x)
+
+    def _db_postprocess(self, pred: np.ndarray, src_h: int, src_w: int) -> List[np.ndarray]:
+        """DB 확률맵 -> 박스 (임계값, 윤곽선, unclip)"""
+        bitmap = (pred > DET_THRESH).astype(np.uint8)
+        height, width = bitmap.shape
+        contours, _ = cv2.findContours(bitmap * 255, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+
+        boxes: List[np.ndarray] = []
+        for contour in contours[:DET_MAX_CANDIDATES]:
+            points, sside = self._mini_box(contour)
+            if sside < 3:
+                continue
+            if self._box_score(pred, points.reshape(-1, 2)) < DET_BOX_THRESH:
+                continue
+
+            expanded = self._unclip(points)
+            if expanded is None:
+                continue
+            box, sside = self._mini_box(expanded.reshape(-1, 1, 2))
+            if sside < 5:
+                continue
+
+            box[:, 0] = np.clip(np.round(box[:, 0] / width * src_w), 0, src_w)
+            box[:, 1] = np.clip(np.round(box[:, 1] / height * src_h), 0, src_h)
+            boxes.append(box.astype(np.float32))
+        return boxes
+
+    @staticmethod
+    def _mini_box(contour: np.ndarray) -> Tuple[np.ndarray, float]:
+        rect = cv2.minAreaRect(contour)
+        pts = sorted(cv2.boxPoints(rect).tolist(), key=lambda p: p[0])
+        left = sorted(pts[:2], key=lambda p: p[1])
+        right = sorted(pts[2:], key=lambda p: p[1])
+        box = np.array([left[0], right[0], right[1], left[1]], dtype=np.float32)
+        return box, min(rect[1])
+
+    @staticmethod
+    def _box_score(bitmap: np.ndarray, box: np.ndarray) -> float:
+        h, w = bitmap.shape
+        xmin = int(np.clip(np.floor(box[:, 0].min()), 0, w - 1))
+        xmax = int(np.clip(np.ceil(box[:, 0].max()), 0, w - 1))
+        ymin = int(np.clip(np.floor(box[:, 1].min()), 0, h - 1))
+        ymax = int(np.clip(np.ceil(box[:, 1].max()), 0, h - 1))
+        mask = np.zeros((ymax - ymin + 1, xmax - xmin + 1), dtype=np.uint8)
+        shifted = box.copy()
+        shifted[:, 0] -= xmin
+        shifted[:, 1] -= ymin
+        cv2.fillPoly(mask, shifted.reshape(1, -1, 2).astype(np.int32), 1)
+        return cv2.mean(bitmap[ymin:ymax + 1, xmin:xmax + 1], mask)[0]
+
+    @staticmethod
+    def _unclip(box: np.ndarray) -> Optional[np.ndarray]:
+        poly = Polygon(box)
+        if poly.length == 0:
+            return None
+        distance = poly.area * DET_UNCLIP_RATIO / poly.length
+        offset = pyclipper.PyclipperOffset()
+        offset.AddPath(box.astype(np.int64).tolist(), pyclipper.JT_ROUND, pyclipper.ET_CLOSEDPOLYGON)
+        expanded = offset.Execute(distance)
+        if len(expanded) != 1:
+            return None
+        return np.array(expanded[0], dtype=np.float32)
+
+    # --- 인식 ---
+
+    def recognize(self, img_rgb: np.ndarray, boxes: List[np.ndarray]) -> List[Tuple[str, float]]:
+        """박스 별 크롭 이미지 인식 (입력 박스 순서 유지)"""
+        with timed("ocr_recognize"):
+            return self._recognize(img_rgb, boxes)
+
+    def _recognize(self, img_rgb: np.ndarray, boxes: List[np.ndarray]) -> List[Tuple[str, float]]:
+        img_bgr = np.ascontiguousarray(img_rgb[:, :, ::-1])
+        crops = [self._crop(img_bgr, box) for box in boxes]
+        order = np.argsort([c.shape[1] / float(c.shape[0]) for c in crops])
+        results: List[Tuple[str, float]] = [("", 0.0)] * len(crops)
+
+        for i in range(0, len(crops), REC_BATCH_SIZE):
+            idx = order[i : i + REC_BATCH_SIZE]
+            _, img_h, img_w = REC_IMAGE_SHAPE
+            max_ratio = max(img_w / img_h, *(crops[k].shape[1] / float(crops[k].shape[0]) for k in idx))
+            batch = np.concatenate([self._rec_preprocess(crops[k], max_ratio) for k in idx])
+            probs = self.rec_session.run(None, {self.rec_input: batch})[0]
+            for k, decoded in zip(idx, self._ctc_decode(probs)):
+                results[k] = decoded
+        return results
+
+    @staticmethod
+    def _crop(img: np.ndarray, box: np.ndarray) -> np.ndarray:
+        """회전 박스 원근 보정 크롭"""
+        width = int(max(np.linalg.norm(box[0] - box[1]), np.linalg.norm(box[2] - box[3])))
+        height = int(max(np.linalg.norm(box[0] - box[3]), np.linalg.norm(box[1] - box[2])))
+        width, height = max(width, 1), max(height, 1)
+        dst = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+        matrix = cv2.getPerspectiveTransform(box.astype(np.float32), dst)
+        crop = cv2.warpPerspective(img, matrix, (width, height), borderMode=cv2.BORDER_REPLICATE, flags=cv2.INTER_CUBIC)
+        if crop.shape[0] / float(crop.shape[1]) >= 1.5:
+            crop = np.rot90(crop)
+        return crop
+
+    @staticmethod
+    def _rec_preprocess(crop: np.ndarray, max_ratio: float) -> np.ndarray:
+        _, img_h, _ = REC_IMAGE_SHAPE
+        img_w = int(img_h * max_ratio)
+        h, w = crop.shape[:2]
+        resized_w = min(img_w, int(math.ceil(img_h * w / float(h))))
+        resized = cv2.resize(crop, (resized_w, img_h)).astype(np.float32)
+        resized = (resized / 255.0 - 0.5) / 0.5
+        padded = np.zeros((1, 3, img_h, img_w), dtype=np.float32)
+        padded[0, :, :, :resized_w] = resized.transpose(2, 0, 1)
+        return padded
+
+    def _ctc_decode(self, probs: np.ndarray) -> List[Tuple[str, float]]:
+        """CTC greedy 디코딩 (중복/blank 제거)"""
+        ids = probs.argmax(axis=2)
+        scores = probs.max(axis=2)
+        out: List[Tuple[str, float]] = []
+        for seq, conf in zip(ids, scores):
+            keep = np.ones(len(seq), dtype=bool)
+            keep[1:] = seq[1:] != seq[:-1]
+            keep &= seq != 0
+            chars = [self.characters[i] for i in seq[keep] if i < len(self.characters)]
+            out.append(("".join(chars), float(conf[keep].mean()) if keep.any() else 0.0))
+        return out
+
+
+def default_paths(det_dir: str, rec_dir: str) -> Tuple[str, str, str]:
+    """모델 디렉토리 기준 기본 ONNX/사전 경로"""
+    return (
+        str(Path(det_dir) / "inference.onnx"),
+        str(Path(rec_dir) / "inference.onnx"),
+        str(Path(rec_dir) / "korean_dict.txt"),
+    )
@@ -0,0 +1,144 @@
+"""
+OCR 워커 풀
+
+- OCR 모델(OCR_ENGINE)을 별도 프로세스 풀에서만 로드 (gunicorn 워커는 모델 미보유)
+- gunicorn 워커 -> Unix 소켓 -> OCR 워커 (요청 당 1 연결)
+- 이미지 배열은 shared memory로 전달 (pickle 복사 없음)
+
+실행:
+    OCR_SOCKET=/tmp/pii-ocr.sock OCR_WORKERS=2 OCR_CPU_THREADS=2 python -m app.ocr_pool
+    (OCR_WORKERS/OCR_CPU_THREADS 미지정 시 CPU 예산에서 결정, app.resources)
+"""
+import os
+import signal
+import logging
+import multiprocessing as mp
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Client, Listener
+from multiprocessing.shared_memory import SharedMemory
+from typing import List, Tuple
+import numpy as np
+from app.resources import PLAN
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# 워커 풀 설정
+OCR_SOCKET = os.getenv("OCR_SOCKET", "/tmp/pii-ocr.sock")
+OCR_WORKERS = PLAN.ocr_pool_workers
+OCR_CPU_THREADS = PLAN.ocr_threads
+OCR_TIMEOUT = float(os.getenv("OCR_TIMEOUT", "60"))  # 클라이언트 응답 대기 (초)
+
+
+def _attach(name: str) -> SharedMemory:
+    """클라이언트가 만든 shared memory 연결 (해제 책임은 클라이언트)"""
+    shm = SharedMemory(name=name)
+    # Python 3.12: 연결만 해도 resource_tracker에 등록되어 종료 시 unlink 되는 문제 방지
+    resource_tracker.unregister(shm._name, "shared_memory")
+    return shm
+
+
+def _handle(ocr, request: Tuple[str, Tuple[int, ...], str]) -> List[str]:
+    from app.pii_ocr import ocr_texts
+
+    name, shape, dtype = request
+    shm = _attach(name)
+    try:
+        img_array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        texts = ocr_texts(ocr, img_array)
+        del img_array
+        return texts
+    finally:
+        shm.close()
+
+
+def _worker_loop(listener: Listener, cpu_threads: int) -> None:
+    """OCR 워커: 모델 1회 로드 후 공유 소켓에서 연결 수락"""
+    from app.pii_ocr import build_ocr
+
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    ocr = build_ocr(cpu_threads=cpu_threads)
+    logger.info("[OCR POOL] worker ready pid=%d cpu_threads=%d", os.getpid(), cpu_threads)
+
+    while True:
+        try:
+            conn = listener.accept()
+        except OSError as e:
+            logger.warning("[OCR POOL] accept failed: %s", e)
+            continue
+        with conn:
+            try:
+                request = conn.recv()
+                conn.send(("ok", _handle(ocr, request)))
+            except EOFError:
+                continue
+            except Exception as e:
+                logger.exception("[OCR POOL] request failed: %s", e)
+                try:
+                    conn.send(("error", str(e)))
+                except OSError:
+                    pass
+
+
+def ocr_remote(img_array: np.ndarray, address: str = OCR_SOCKET, timeout: float = OCR_TIMEOUT) -> List[str]:
+    """OCR 워커 풀에 이미지 전달 후 인식 텍스트 반환 (timeout 초 내 응답 없으면 TimeoutError)"""
+    img_array = np.ascontiguousarray(img_array)
+    shm = SharedMemory(create=True, size=max(1, img_array.nbytes))
+    try:
+        shared = np.ndarray(img_array.shape, dtype=img_array.dtype, buffer=shm.buf)
+        shared[...] = img_array
+        del shared
+
+        with Client(address, family="AF_UNIX") as conn:
+            conn.send((shm.name, img_array.shape, img_array.dtype.str))
+            # 워커 정지/과부하 시 무한 대기 방지 (연결 종료 후 워커의 응답 전송은 실패하고 무시됨)
+            if not conn.poll(timeout):
+                raise TimeoutError(f"OCR worker did not respond within {timeout:g}s")
+            status, payload = conn.recv()
+        if status != "ok":
+            raise RuntimeError(f"OCR worker error: {payload}")
+        return payload
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def serve(address: str = OCR_SOCKET, workers: int = OCR_WORKERS, cpu_threads: int = OCR_CPU_THREADS) -> None:
+    """소켓 생성 후 워커 프로세스 fork, 죽은 워커는 재시작"""
+    if os.path.exists(address):
+        os.unlink(address)
+    listener = Listener(address, family="AF_UNIX")
+    ctx = mp.get_context("fork")
+
+    def _spawn() -> mp.Process:
+        proc = ctx.Process(target=_worker_loop, args=(listener, cpu_threads), daemon=True)
+        proc.start()
+        return proc
+
+    procs = [_spawn() for _ in range(max(1, workers))]
+    logger.info("[OCR POOL] listening on %s workers=%d cpu_threads=%d", address, len(procs), cpu_threads)
+
+    def _shutdown(signum, frame):
+        for p in procs:
+            p.terminate()
+        listener.close()
+        if os.path.exists(address):
+            os.unlink(address)
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _shutdown)
+    signal.signal(signal.SIGINT, _shutdown)
+
+    while True:
+        for i, p in enumerate(procs):
+            p.join(timeout=1.0)
+            if not p.is_alive():
+                logger.warning("[OCR POOL] worker pid=%s exited (code=%s), restarting", p.pid, p.exitcode)
+                procs[i] = _spawn()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    # OpenMP/MKL 스레드 수는 풀 프로세스에서만 설정 (ocr_remote 를 import 하는 웹 워커 환경은 변경하지 않음)
+    PLAN.apply_env()
+    serve()
@@ -0,0 +1,138 @@
+"""
+다중 페이지 문서(PDF, TIFF) 페이지 단위 텍스트 추출
+
+- 페이지를 1장씩 지연 래스터화 (메모리: 페이지 1장 분량)
+- PDF 텍스트 레이어가 있는 페이지는 OCR 없이 그대로 사용
+- 호출 측은 페이지 텍스트마다 pii_pipeline을 수행하고 차단 시 즉시 중단
+- 검사하지 못한 내용을 통과시키지 않도록 페이지 수 초과(413), 디코딩/렌더링 실패(422)는 DocumentError 로 요청 실패
+"""
+import os
+import logging
+from contextlib import contextmanager
+from typing import BinaryIO, Iterator
+from PIL import Image
+from app.pii_ocr import OCR_TILE_MODE, ocr_max_size, pii_ocr_image
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+# 문서 설정
+DOCUMENT_TYPES = {"application/pdf", "image/tiff"}
+MAX_DOCUMENT_PAGES = int(os.getenv("MAX_DOCUMENT_PAGES", "200"))
+PDF_RENDER_DPI = int(os.getenv("PDF_RENDER_DPI", "200"))
+PDF_TEXT_MIN_CHARS = int(os.getenv("PDF_TEXT_MIN_CHARS", "20"))  # 이 길이 이상이면 텍스트 레이어 사용
+
+
+class DocumentError(Exception):
+    """검사할 수 없는 업로드 파일 (페이지 수 초과: 413, 디코딩/렌더링 실패: 422)"""
+    def __init__(self, message: str, status_code: int = 422):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@contextmanager
+def _decoding(what: str) -> Iterator[None]:
+    """디코딩/렌더링 오류 → DocumentError (OCR 엔진 오류는 그대로 전달)"""
+    try:
+        yield
+    except DocumentError:
+        raise
+    except Exception as e:
+        logger.exception("[DOCUMENT ERROR] %s: %s", what, e)
+        raise DocumentError(f"Cannot decode {what}: {type(e).__name__}") from e
+
+
+def _check_pages(n_pages: int) -> None:
+    if n_pages > MAX_DOCUMENT_PAGES:
+        raise DocumentError(f"Document has {n_pages} pages (max {MAX_DOCUMENT_PAGES})", status_code=413)
+
+
+def _pdf_scale(width_pt: float, height_pt: float) -> float:
+    """OCR 해상도 기준 렌더링 배율 (타일 모드가 아니면 ocr_max_size() 이하로 렌더링)"""
+    scale = PDF_RENDER_DPI / 72
+    if not OCR_TILE_MODE:
+        scale = min(scale, ocr_max_size() / max(width_pt, height_pt, 1.0))
+    return scale
+
+
+def iter_pdf_texts(fp: BinaryIO) -> Iterator[str]:
+    """PDF 페이지 별 텍스트 (텍스트 레이어 우선, 없으면 렌더링 후 OCR)"""
+    import pypdfium2 as pdfium
+
+    with _decoding("PDF"):
+        pdf = pdfium.PdfDocument(fp)
+    try:
+        with _decoding("PDF"):
+            n_pages = len(pdf)
+        _check_pages(n_pages)
+        for idx in range(n_pages):
+            with _decoding(f"PDF page {idx + 1}"):
+                page = pdf[idx]
+            try:
+                with _decoding(f"PDF page {idx + 1}"):
+                    textpage = page.get_textpage()
+                    try:
+                        text = textpage.get_text_bounded().strip()
+                    finally:
+                        textpage.close()
+
+                if len(text) >= PDF_TEXT_MIN_CHARS:
+                    logger.info("[DOCUMENT] page %d: text layer (length=%d)", idx + 1, len(text))
+                    yield text
+                    continue
+
+                with _decoding(f"PDF page {idx + 1}"):
+                    bitmap = page.render(scale=_pdf_scale(*page.get_size()))
+                    try:
+                        image = bitmap.to_pil()
+                    finally:
+                        bitmap.close()
+                logger.info("[DOCUMENT] page %d: OCR", idx + 1)
+                yield pii_ocr_image(image)
+                del image
+            finally:
+                page.close()
+    finally:
+        pdf.close()
+
+
+def iter_tiff_texts(fp: BinaryIO) -> Iterator[str]:
+    """TIFF 프레임 별 OCR 텍스트 (seek 시 해당 프레임만 디코딩)"""
+    with _decoding("TIFF"):
+        image = Image.open(fp)
+    with image:
+        n_frames = getattr(image, "n_frames", 1)
+        _check_pages(n_frames)
+        for idx in range(n_frames):
+            with _decoding(f"TIFF frame {idx + 1}"):
+                image.seek(idx)
+                image.load()
+            logger.info("[DOCUMENT] frame %d: OCR", idx + 1)
+            yield pii_ocr_image(image)
+
+
+def iter_document_texts(fp: BinaryIO, content_type: str) -> Iterator[str]:
+    """문서 형식에 따라 페이지 텍스트 생성 (검사할 수 없으면 DocumentError)"""
+    if content_type == "application/pdf":
+        yield from iter_pdf_texts(fp)
+    else:
+        yield from iter_tiff_texts(fp)
+
+
+def iter_upload_texts(upload) -> Iterator[str]:
+    """업로드 파일(SpooledUpload) 1개의 페이지 텍스트 (단일 이미지는 1페이지)"""
+    if upload.content_type == "application/pdf":
+        # pdfium은 readinto 가능한 파일 객체 필요 (임시 파일 직접 전달)
+        upload.file.seek(0)
+        yield from iter_document_texts(upload.file, upload.content_type)
+        return
+
+    with upload.buffer() as buf:
+        if upload.content_type in DOCUMENT_TYPES:
+            yield from iter_document_texts(buf, upload.content_type)
+        else:
+            with _decoding(upload.filename):
+                image = Image.open(buf)
+                image.load()
+            with image:
+                yield pii_ocr_image(image)
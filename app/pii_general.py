@@ -1,21 +1,23 @@
-import yaml
-import spacy
-from pathlib import Path
+import os
 from typing import List, Tuple, Dict
-from app.recognizer.per_recognizer import KRPersonRecognizer
+from app import startup
+from app.degrade import current_tier
+from app.metrics import instrument_recognizer, record_entity, timed
+from app.ruleset import current
+with startup.trace("import spacy"):
+    import spacy
+with startup.trace("import transformers/onnxruntime"):
+    from app.recognizer.per_recognizer import KRPersonRecognizer
+from app.recognizer.name_recognizer import KRNameGazetteerRecognizer
 from app.recognizer.phone_recognizer import KRPhoneRecognizer
 from app.recognizer.brn_recognizer import KRBusinessRegistrationRecognizer
-from app.recognizer.ban_recognizer import KRBankAccountRecognizer, BANK_SPECS
-from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
-from presidio_analyzer.nlp_engine import SpacyNlpEngine
-from presidio_anonymizer import AnonymizerEngine
-from presidio_anonymizer.entities import OperatorConfig
-from presidio_anonymizer.entities.engine.recognizer_result import RecognizerResult
-
-# Load YAML
-ROOT = Path(__file__).resolve().parent
-with open(ROOT/"combination.yml") as f:
-    COMBOS = yaml.safe_load(f)
+from app.recognizer.ban_recognizer import KRBankAccountRecognizer
+with startup.trace("import presidio"):
+    from presidio_analyzer import AnalyzerEngine, EntityRecognizer, RecognizerRegistry
+    from presidio_analyzer.nlp_engine import SpacyNlpEngine
+    from presidio_anonymizer import AnonymizerEngine
+    from presidio_anonymizer.entities import OperatorConfig
+    from presidio_anonymizer.entities.engine.recognizer_result import RecognizerResult
 
 # NLP 엔진 설정 (SpaCy)
 NLP = SpacyNlpEngine(models=[])
@@ -23,28 +25,112 @@ NLP.nlp = {"en": spacy.blank("en")}
 
 # EMAIL_ADDRESS, CREDIT_CARD 내장 인식기 (Presidio)
 REG = RecognizerRegistry()
-REG.load_predefined_recognizers()
-
-# PERSON 커스텀 인식기 (Leo97/KoELECTRA-small-v3-modu-ner)
-REG.add_recognizer(KRPersonRecognizer())
+with startup.trace("presidio predefined recognizers"):
+    REG.load_predefined_recognizers()
+
+# PERSON 커스텀 인식기 (Leo97/KoELECTRA-small-v3-modu-ner, 이름 사전 NAME_GAZETTEER_PATH)
+# KR_PERSON_BACKEND: ner | gazetteer(사전만, 모델 미로드) | cascade(사전 일치 구간은 모델 입력에서 제외) | union(사전 + 모델)
+KR_PERSON_BACKEND = os.getenv("KR_PERSON_BACKEND", "ner").lower()
+if KR_PERSON_BACKEND not in ("ner", "gazetteer", "cascade", "union"):
+    raise ValueError(f"KR_PERSON_BACKEND must be ner, gazetteer, cascade or union: {KR_PERSON_BACKEND!r}")
+with startup.trace("KRPersonRecognizer"):
+    if KR_PERSON_BACKEND == "gazetteer":
+        PERSON = KRNameGazetteerRecognizer()
+    else:
+        PERSON = KRPersonRecognizer(
+            first_pass=KRNameGazetteerRecognizer() if KR_PERSON_BACKEND != "ner" else None,
+            skip_on_hit=KR_PERSON_BACKEND == "cascade",
+        )
+    REG.add_recognizer(PERSON)
+# tier 3 에서도 쓰는 이름 사전 (NAME_GAZETTEER_PATH 설정 + 사전 백엔드일 때)
+GAZETTEER = PERSON if isinstance(PERSON, KRNameGazetteerRecognizer) else PERSON.first_pass
 
 # KR_PHONE_NUMBER 커스텀 인식기
 REG.add_recognizer(KRPhoneRecognizer())
 
-# KR_BANK_ACCOUNT 커스텀 인식기
-REG.add_recognizer(KRBankAccountRecognizer(BANK_SPECS))
+# KR_BANK_ACCOUNT 커스텀 인식기 (은행 설정은 app/ruleset.yml, 요청 별 고정된 규칙 사용)
+REG.add_recognizer(KRBankAccountRecognizer())
 
 # KR_BUSINESS_NO 커스텀 인식기
 REG.add_recognizer(KRBusinessRegistrationRecognizer())
 
+# 인식기 별 소요 시간 메트릭
+for _rec in REG.recognizers:
+    instrument_recognizer(_rec)
+
 # Anonymizer 설정
 ANALYZER = AnalyzerEngine(nlp_engine=NLP, registry=REG)
 ANON = AnonymizerEngine()
 
+# 대용량 텍스트 병렬 분석 (app.pii_parallel)
+PARALLEL_ENABLED = os.getenv("PARALLEL_ENABLED", "1").lower() in ("1", "true", "on")
+PARALLEL_MIN_CHARS = int(os.getenv("PARALLEL_MIN_CHARS", "100000"))
+
+GENERAL_ENTITIES = ["EMAIL_ADDRESS", "CREDIT_CARD", "KR_PERSON", "KR_PHONE_NUMBER", "KR_BANK_ACCOUNT", "KR_BUSINESS_NO"]
+PATTERN_ENTITIES = [e for e in GENERAL_ENTITIES if e != "KR_PERSON"]
+
+def _person_regions(text: str, results: list) -> List[Tuple[int, int]]:
+    """KR_PERSON 과 조합 규칙으로 묶인 짝 엔티티 앞뒤 window 구간 (겹치면 병합, 경계는 공백까지 확장)"""
+    rules = current()
+    partners = rules.partners.get("KR_PERSON", frozenset())
+    window = rules.window or len(text)
+    spans = sorted(
+        (max(0, r.start - window), min(len(text), r.end + window))
+        for r in results if r.entity_type in partners
+    )
+    regions: List[Tuple[int, int]] = []
+    for lo, hi in spans:
+        lo = text.rfind(" ", 0, lo) + 1 if lo > 0 else 0
+        end = text.find(" ", hi)
+        hi = len(text) if end < 0 else end
+        if regions and lo <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], hi))
+        else:
+            regions.append((lo, hi))
+    return regions
+
+def analyze_degraded(text: str, tier: int) -> list:
+    """저하 단계 탐지: 패턴 인식기 + (tier 2) 짝 엔티티 주변 KR_PERSON, (tier 3) 이름 사전만"""
+    with timed("analyze"):
+        results = ANALYZER.analyze(text=text, language="en", entities=PATTERN_ENTITIES)
+    if tier >= 3:
+        if GAZETTEER is not None:
+            with timed("ner_first_pass"):
+                results.extend(GAZETTEER.analyze(text, ["KR_PERSON"]))
+        return results
+    with timed("ner_near_partners"):
+        for lo, hi in _person_regions(text, results):
+            for r in PERSON.analyze(text[lo:hi], ["KR_PERSON"]):
+                r.start, r.end = r.start + lo, r.end + lo
+                results.append(r)
+    return EntityRecognizer.remove_duplicates(results)
+
+def analyze_general(text: str) -> list:
+    """일반개인정보 후보 탐지 (Presidio RecognizerResult 목록)"""
+    tier = current_tier()
+    if tier >= 2:
+        return analyze_degraded(text, tier)
+    if PARALLEL_ENABLED and len(text) >= PARALLEL_MIN_CHARS:
+        from app.pii_parallel import analyze_parallel
+        return analyze_parallel(text)
+    with timed("analyze"):
+        return ANALYZER.analyze(text=text, language="en", entities=GENERAL_ENTITIES)
+
+def involved_types(by_type: Dict[str, List[tuple]]) -> set:
+    """
+    and_rules 중 window 안에서 함께 나타난 유형 집합 (by_type: 유형 -> [(start, end)])
+    - tier 3 은 window 무시, NER 을 생략하므로 KR_PERSON 의 짝 엔티티는 단독으로도 포함 (fail-closed)
+    """
+    rules = current()
+    if current_tier() < 3:
+        return rules.involved(by_type)
+    involved = rules.involved(by_type, 0)
+    involved.update(t for t in rules.partners.get("KR_PERSON", ()) if t in by_type)
+    return involved
+
 def pii_general(text: str) -> Tuple[bool, str, List[str]]:
 
-    ents_en = ["EMAIL_ADDRESS", "CREDIT_CARD", "KR_PERSON", "KR_PHONE_NUMBER", "KR_BANK_ACCOUNT", "KR_BUSINESS_NO"]
-    res = ANALYZER.analyze(text=text, language="en", entities=ents_en)
+    res = analyze_general(text)
     anon_ready = [
         RecognizerResult(
             entity_type=r.entity_type,
@@ -55,32 +141,25 @@ def pii_general(text: str) -> Tuple[bool, str, List[str]]:
         for r in res
     ]
 
-    print(res)
     if not res:
         return False, text, []
 
     by_type: Dict[str, List[tuple]] = {}
     for r in res:
         by_type.setdefault(r.entity_type, []).append((r.start, r.end))
+        record_entity(r.entity_type)
 
-    window = int(COMBOS["window"])
-    involved = set()
-
-    for a,b in COMBOS["and_rules"]:
-        if a not in by_type or b not in by_type:
-            continue
-        if window==0:
-            involved.update([a,b])
-            continue
-        if any(abs(sa-sb)<=window for sa,_ in by_type[a] for sb,_ in by_type[b]):
-            involved.update([a,b])
+    with timed("combination"):
+        involved = involved_types(by_type)
 
     if not involved: 
         return False, text, []
     
-    ops = {t: OperatorConfig("replace", {"new_value": COMBOS["tag_map"][t]}) for t in involved}
-    masked_text = ANON.anonymize(text=text, analyzer_results=anon_ready, operators=ops).text
-    labels = [COMBOS["label_map"][t] for t in COMBOS["label_map"] if t in involved]
+    rules = current()
+    ops = {t: OperatorConfig("replace", {"new_value": rules.tag_map[t]}) for t in involved}
+    with timed("anonymize"):
+        masked_text = ANON.anonymize(text=text, analyzer_results=anon_ready, operators=ops).text
+    labels = [label for t, label in rules.label_map.items() if t in involved]
 
     return True, masked_text, labels
 
@@ -1,31 +1,58 @@
 from typing import List, Tuple
-from app.recognizer.rrn_recognizer import ResidentRegistrationRecognizer
-from app.recognizer.arn_recognizer import AlienRegistrationRecognizer
-from app.recognizer.dln_recognizer import DriverLicenseRecognizer
-from app.recognizer.pn_recognizer import PassportRecognizer
+from app.recognizer.rrn_recognizer import ResidentRegistrationRecognizer, find_rrn
+from app.recognizer.arn_recognizer import AlienRegistrationRecognizer, find_arn
+from app.recognizer.dln_recognizer import DriverLicenseRecognizer, find_dln
+from app.recognizer.pn_recognizer import PassportRecognizer, find_pn
 from app.pii_general import pii_general
+from app.metrics import timed
 
-def pii_pipeline(text: str) -> Tuple[bool, str, List[str], str]:
-    
-    # 고유식별정보
+UNIQUE_ID_RECOGNIZERS = (
+    ResidentRegistrationRecognizer,
+    AlienRegistrationRecognizer,
+    DriverLicenseRecognizer,
+    PassportRecognizer,
+)
+
+# (라벨, 위치 탐색 함수), 치환 태그는 "[라벨]"
+UNIQUE_ID_FINDERS = (
+    ("주민등록번호", find_rrn),
+    ("외국인등록번호", find_arn),
+    ("운전면허번호", find_dln),
+    ("여권번호", find_pn),
+)
+
+def find_unique_spans(text: str) -> List[Tuple[str, int, int]]:
+    """고유식별번호 위치 목록 (라벨, start, end), 겹치면 앞선 인식기 우선"""
+    spans: List[Tuple[str, int, int]] = []
+    with timed("unique_ids"):
+        for label, find in UNIQUE_ID_FINDERS:
+            for s, e in find(text):
+                if all(e <= ps or s >= pe for _, ps, pe in spans):
+                    spans.append((label, s, e))
+    return sorted(spans, key=lambda x: x[1])
+
+def mask_unique_ids(text: str) -> Tuple[bool, str, List[str]]:
+    """고유식별번호 탐지 및 치환"""
     labels=[]
     blocked=False
+    with timed("unique_ids"):
+        for fn in UNIQUE_ID_RECOGNIZERS:
+            hit, text, label = fn(text)
+            if hit:
+                labels += label
+                blocked = True
+    return blocked, text, labels
 
-    for fn in (
-        ResidentRegistrationRecognizer,
-        AlienRegistrationRecognizer,
-        DriverLicenseRecognizer,
-        PassportRecognizer
-    ):
-        hit, text, label = fn(text)
-        if hit:
-            labels += label
-            blocked = True
+def pii_pipeline(text: str) -> Tuple[bool, str, List[str], str]:
+    
+    # 고유식별정보
+    blocked, text, labels = mask_unique_ids(text)
     if blocked:
         return True, text, labels, "고유식별번호"
 
     # 일반개인정보
-    blocked, text, label = pii_general(text)
+    with timed("general"):
+        blocked, text, label = pii_general(text)
     if blocked:
         return True, text, label, "일반개인정보"
     return False, text, [], ""
\ No newline at end of file
@@ -1,10 +1,15 @@
 import io, os, re
 import logging
+import threading
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from paddleocr import PaddleOCR
-from typing import Tuple
+from typing import BinaryIO, List, Optional, Tuple, Union
 from PIL import Image
 import numpy as np
+from app.degrade import DEGRADE_MAX_IMAGE_SIZE, current_tier
+from app.metrics import timed
+from app.resources import PLAN
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -14,40 +19,257 @@ ROOT = Path(__file__).resolve().parents[1]
 DET_DIR = os.getenv("PADDLE_DET_DIR", str(ROOT / "models" / "paddleocr" / "det" / "PP-OCRv5_mobile_det"))
 REC_DIR = os.getenv("PADDLE_REC_DIR", str(ROOT / "models" / "paddleocr" / "rec" / "korean_PP-OCRv5_mobile_rec"))
 
+# OCR 실행 설정
+OCR_ENGINE = os.getenv("OCR_ENGINE", "paddle").lower()  # paddle | onnx
+OCR_CPU_THREADS = PLAN.ocr_threads  # OCR_CPU_THREADS (미지정 시 app.resources 계획)
+OCR_SOCKET = os.getenv("OCR_SOCKET", "")  # 설정 시 외부 OCR 워커 풀(app.ocr_pool) 사용
+
+# ONNX 엔진 모델 경로 (OCR_ENGINE=onnx)
+ONNX_DET_PATH = os.getenv("ONNX_DET_PATH", str(Path(DET_DIR) / "inference.onnx"))
+ONNX_REC_PATH = os.getenv("ONNX_REC_PATH", str(Path(REC_DIR) / "inference.onnx"))
+OCR_DICT_PATH = os.getenv("OCR_DICT_PATH", str(Path(REC_DIR) / "korean_dict.txt"))
+
 # Image Resize
 MAX_IMAGE_SIZE = 1536
 MAX_IMAGE_PIXELS = int(str(5 * 1024 * 1024))
 
-# PaddleOCR
-try:
-    ocr = PaddleOCR(
-        # CPU 설정
-        device='cpu',
-        enable_mkldnn=True,
-        cpu_threads=2,
-        # 모델 설정
-        text_detection_model_name="PP-OCRv5_mobile_det",
-        text_detection_model_dir=DET_DIR,
-        text_recognition_model_name="korean_PP-OCRv5_mobile_rec",
-        text_recognition_model_dir=REC_DIR,
-        # 기타 설정
-        use_doc_orientation_classify=False,
-        use_doc_unwarping=False,
-        use_textline_orientation=False,
-    )
-    
-except Exception as e:
-    logger.exception("Failed to initialise PaddleOCR: %s", e)
-    print(f"[OCR ERROR] PaddleOCR initialization failed: {e}")
-    raise
+# Tiling (대형 스캔: 전체 축소 대신 겹치는 타일 단위 검출, 원본 해상도 인식)
+OCR_TILE_MODE = os.getenv("OCR_TILE_MODE", "0").lower() in ("1", "true", "on")
+OCR_TILE_SIZE = int(os.getenv("OCR_TILE_SIZE", str(MAX_IMAGE_SIZE)))
+OCR_TILE_OVERLAP = int(os.getenv("OCR_TILE_OVERLAP", "128"))
+OCR_TILE_WORKERS = PLAN.ocr_tile_workers  # OCR_TILE_WORKERS
+OCR_TILE_MAX_PIXELS = int(os.getenv("OCR_TILE_MAX_PIXELS", str(64 * 1024 * 1024)))  # 디코딩 이미지 상한
+
+# OCR 엔진 (프로세스 당 1회, 최초 사용 시 생성)
+_ocr = None
+_ocr_lock = threading.Lock()
+
+def build_ocr(cpu_threads: int = OCR_CPU_THREADS):
+    """OCR 엔진 생성 (OCR_ENGINE: paddle | onnx)"""
+    if OCR_ENGINE == "onnx":
+        from app.ocr_onnx import OnnxOCR
+        return OnnxOCR(ONNX_DET_PATH, ONNX_REC_PATH, OCR_DICT_PATH, cpu_threads=cpu_threads)
+
+    from paddleocr import PaddleOCR
+
+    try:
+        return PaddleOCR(
+            # CPU 설정
+            device='cpu',
+            enable_mkldnn=True,
+            cpu_threads=cpu_threads,
+            # 모델 설정
+            text_detection_model_name="PP-OCRv5_mobile_det",
+            text_detection_model_dir=DET_DIR,
+            text_recognition_model_name="korean_PP-OCRv5_mobile_rec",
+            text_recognition_model_dir=REC_DIR,
+            # 기타 설정
+            use_doc_orientation_classify=False,
+            use_doc_unwarping=False,
+            use_textline_orientation=False,
+        )
+    except Exception as e:
+        logger.exception("Failed to initialise PaddleOCR: %s", e)
+        print(f"[OCR ERROR] PaddleOCR initialization failed: {e}")
+        raise
+
+def get_ocr():
+    """현재 프로세스의 OCR 엔진 반환"""
+    global _ocr
+    if _ocr is None:
+        with _ocr_lock:
+            if _ocr is None:
+                _ocr = build_ocr()
+    return _ocr
+
+def extract_texts(result) -> List[str]:
+    """PaddleOCR predict 결과에서 인식 텍스트 추출"""
+    texts = []
+    if result and isinstance(result, list):
+        for res in result:
+            js = getattr(res, "json", None)
+            if isinstance(js, dict):
+                core = js.get("res", js)
+                for t in core.get("rec_texts", []) or []:
+                    if t and t.strip():
+                        texts.append(t.strip())
+    return texts
+
+def extract_boxed_texts(result) -> List[Tuple[np.ndarray, str]]:
+    """PaddleOCR predict 결과에서 (박스 4x2, 텍스트) 추출"""
+    items = []
+    if result and isinstance(result, list):
+        for res in result:
+            js = getattr(res, "json", None)
+            if isinstance(js, dict):
+                core = js.get("res", js)
+                texts = core.get("rec_texts", []) or []
+                boxes = core.get("rec_boxes", []) or []
+                for t, b in zip(texts, boxes):
+                    if t and t.strip():
+                        x0, y0, x1, y1 = [float(v) for v in b]
+                        box = np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float32)
+                        items.append((box, t.strip()))
+    return items
+
+def split_tiles(width: int, height: int, tile: int = OCR_TILE_SIZE, overlap: int = OCR_TILE_OVERLAP) -> List[Tuple[int, int, int, int]]:
+    """겹치는 타일 좌표 (x0, y0, x1, y1), 마지막 타일은 이미지 끝에 정렬"""
+    step = max(1, tile - overlap)
+
+    def _starts(length: int) -> List[int]:
+        if length <= tile:
+            return [0]
+        starts = list(range(0, length - tile, step))
+        starts.append(length - tile)
+        return starts
+
+    return [
+        (x, y, min(x + tile, width), min(y + tile, height))
+        for y in _starts(height)
+        for x in _starts(width)
+    ]
+
+def merge_boxes(boxes: List[np.ndarray], min_overlap: float = 0.5) -> List[List[int]]:
+    """
+    타일 경계 중복 박스 군집화
+
+    - 같은 줄(세로 겹침 >= min_overlap)이면서 가로로 겹치는 박스를 한 군집으로 묶음
+    - 반환: 군집 별 박스 인덱스 목록
+    """
+    rects = [(b[:, 0].min(), b[:, 1].min(), b[:, 0].max(), b[:, 1].max()) for b in boxes]
+    parent = list(range(len(rects)))
+
+    def _find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(rects)):
+        ax0, ay0, ax1, ay1 = rects[i]
+        for j in range(i + 1, len(rects)):
+            bx0, by0, bx1, by1 = rects[j]
+            if min(ax1, bx1) <= max(ax0, bx0):
+                continue
+            v_overlap = min(ay1, by1) - max(ay0, by0)
+            if v_overlap <= 0 or v_overlap < min_overlap * min(ay1 - ay0, by1 - by0):
+                continue
+            parent[_find(j)] = _find(i)
+
+    clusters: dict = {}
+    for i in range(len(rects)):
+        clusters.setdefault(_find(i), []).append(i)
+    return list(clusters.values())
 
-def resize_image_for_ocr(image: Image.Image, max_size: int = MAX_IMAGE_SIZE) -> Tuple[Image.Image, float]:
+def sort_boxes(boxes: List[np.ndarray]) -> List[np.ndarray]:
+    """읽기 순서 정렬 (같은 줄: y 차이 10px 미만)"""
+    boxes = sorted(boxes, key=lambda b: (b[0][1], b[0][0]))
+    for i in range(len(boxes) - 1):
+        for j in range(i, -1, -1):
+            if abs(boxes[j + 1][0][1] - boxes[j][0][1]) < 10 and boxes[j + 1][0][0] < boxes[j][0][0]:
+                boxes[j], boxes[j + 1] = boxes[j + 1], boxes[j]
+            else:
+                break
+    return boxes
+
+def _union_box(boxes: List[np.ndarray]) -> np.ndarray:
+    pts = np.concatenate(boxes)
+    x0, y0 = pts.min(axis=0)
+    x1, y1 = pts.max(axis=0)
+    return np.array([[x0, y0], [x1, y0], [x1, y1], [x0, y1]], dtype=np.float32)
+
+def _join_fragments(fragments: List[Tuple[np.ndarray, str]]) -> str:
+    """타일 경계에서 잘린 조각을 x 순서로 이어 붙임 (겹침 구간에서 중복 인식된 글자 제거)"""
+    joined = ""
+    for box, text in sorted(fragments, key=lambda it: float(it[0][:, 0].min())):
+        if text in joined:
+            continue
+        k = min(len(joined), len(text))
+        while k and not joined.endswith(text[:k]):
+            k -= 1
+        joined += text[k:]
+    return joined
+
+def _recognize_cluster(ocr, img_array: np.ndarray, fragments: List[Tuple[np.ndarray, str]], pad: int = 4) -> Tuple[np.ndarray, str]:
+    """여러 타일에 걸친 군집: 합친 박스를 원본 이미지에서 다시 인식 (결과 없으면 조각 이어 붙이기)"""
+    box = _union_box([b for b, _ in fragments])
+    if len(fragments) == 1:
+        return box, fragments[0][1]
+    height, width = img_array.shape[:2]
+    x0, y0 = [max(0, int(v) - pad) for v in box[0]]
+    x1, y1 = min(width, int(np.ceil(box[2][0])) + pad), min(height, int(np.ceil(box[2][1])) + pad)
+    found = extract_boxed_texts(ocr.predict(np.ascontiguousarray(img_array[y0:y1, x0:x1])))
+    text = " ".join(t for _, t in sorted(found, key=lambda it: float(it[0][:, 0].min())))
+    return box, text or _join_fragments(fragments)
+
+def tiled_ocr_texts(ocr, img_array: np.ndarray) -> List[str]:
+    """
+    타일 단위 OCR
+
+    - onnx: 타일 검출 병렬 수행 -> 박스 병합 -> 원본 이미지에서 크롭 인식
+    - paddle: 파이프라인 인스턴스가 스레드 안전하지 않아 타일 순차 수행 -> 타일 경계에 걸친 군집만 원본 이미지에서 다시 인식
+    """
+    height, width = img_array.shape[:2]
+    tiles = split_tiles(width, height)
+    logger.info("[OCR TILE] %dx%d -> %d tiles", width, height, len(tiles))
+
+    if OCR_ENGINE == "onnx":
+        def _detect(tile: Tuple[int, int, int, int]) -> List[np.ndarray]:
+            x0, y0, x1, y1 = tile
+            return [b + np.array([x0, y0], dtype=np.float32) for b in ocr.detect(img_array[y0:y1, x0:x1])]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(OCR_TILE_WORKERS, len(tiles)))) as pool:
+            boxes = [b for found in pool.map(_detect, tiles) for b in found]
+        if not boxes:
+            return []
+        merged = sort_boxes([_union_box([boxes[i] for i in c]) for c in merge_boxes(boxes)])
+        return [t.strip() for t, _ in ocr.recognize(img_array, merged) if t and t.strip()]
+
+    items: List[Tuple[np.ndarray, str]] = []
+    for x0, y0, x1, y1 in tiles:
+        for box, text in extract_boxed_texts(ocr.predict(np.ascontiguousarray(img_array[y0:y1, x0:x1]))):
+            items.append((box + np.array([x0, y0], dtype=np.float32), text))
+    if not items:
+        return []
+    chosen = [_recognize_cluster(ocr, img_array, [items[i] for i in c]) for c in merge_boxes([b for b, _ in items])]
+    chosen = [(b, t) for b, t in chosen if t]
+    order = sort_boxes([b for b, _ in chosen])
+    by_id = {id(b): t for b, t in chosen}
+    return [by_id[id(b)] for b in order]
+
+def ocr_texts(ocr, img_array: np.ndarray) -> List[str]:
+    """엔진 종류에 맞게 OCR 수행 후 텍스트 목록 반환"""
+    if OCR_TILE_MODE and max(img_array.shape[:2]) > OCR_TILE_SIZE:
+        return tiled_ocr_texts(ocr, img_array)
+    if OCR_ENGINE == "onnx":
+        return ocr.predict_texts(img_array)
+    with timed("ocr_predict"):
+        return extract_texts(ocr.predict(img_array))
+
+def run_ocr(img_array: np.ndarray) -> List[str]:
+    """OCR 수행 (OCR_SOCKET 설정 시 워커 풀, 아니면 현재 프로세스)"""
+    if OCR_SOCKET:
+        from app.ocr_pool import ocr_remote
+        with timed("ocr_remote"):
+            return ocr_remote(img_array)
+    return ocr_texts(get_ocr(), img_array)
+
+def ocr_max_size() -> int:
+    """현재 품질 단계의 OCR 최대 변 길이 (tier 2 이상: DEGRADE_MAX_IMAGE_SIZE)"""
+    return min(MAX_IMAGE_SIZE, DEGRADE_MAX_IMAGE_SIZE) if current_tier() >= 2 else MAX_IMAGE_SIZE
+
+def resize_image_for_ocr(
+    image: Image.Image,
+    max_size: Optional[int] = MAX_IMAGE_SIZE,
+    max_pixels: int = MAX_IMAGE_PIXELS,
+) -> Tuple[Image.Image, float]:
     """
     OCR 처리를 위해 이미지 크기 조정
     
     Args:
         image: PIL Image 객체
-        max_size: 최대 허용 크기 (가로 또는 세로의 최대값)
+        max_size: 최대 허용 크기 (가로 또는 세로의 최대값, None이면 미적용)
+        max_pixels: 최대 허용 픽셀 수
     
     Returns:
         (리사이즈된 이미지, 스케일 비율)
@@ -57,8 +279,8 @@ def resize_image_for_ocr(image: Image.Image, max_size: int = MAX_IMAGE_SIZE) ->
     scale_ratio = 1.0
     
     # 전체 픽셀 수 체크
-    if total_pixels > MAX_IMAGE_PIXELS:
-        scale_ratio = np.sqrt(MAX_IMAGE_PIXELS / total_pixels)
+    if total_pixels > max_pixels:
+        scale_ratio = np.sqrt(max_pixels / total_pixels)
         new_width = int(width * scale_ratio)
         new_height = int(height * scale_ratio)
         logger.info(f"Resizing due to pixel count: {width}x{height} -> {new_width}x{new_height}")
@@ -66,7 +288,7 @@ def resize_image_for_ocr(image: Image.Image, max_size: int = MAX_IMAGE_SIZE) ->
         width, height = new_width, new_height
     
     # 최대 크기 체크
-    if width > max_size or height > max_size:
+    if max_size is not None and (width > max_size or height > max_size):
         dimension_scale = max_size / max(width, height)
         new_width = int(width * dimension_scale)
         new_height = int(height * dimension_scale)
@@ -92,53 +314,51 @@ def normalize_ocr_text(text: str) -> str:
     normalized = re.sub(pattern, remove_spaces, text)
     return normalized
 
-def pii_ocr_single(image_bytes: bytes) -> str:
-    """단일 이미지에서 텍스트 추출"""
+def pii_ocr_image(image: Image.Image) -> str:
+    """디코딩된 이미지(페이지 1장)에서 텍스트 추출"""
+    logger.info("[OCR INFORMATION] Original size=%s mode=%s", image.size, image.mode)
+
+    # 디코딩 및 RGB 변환
+    with timed("image_decode"):
+        image.load()
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+    
+    # OOM 방지를 위한 이미지 리사이즈 (타일 모드: 타일 당 메모리가 제한되므로 픽셀 상한만 적용)
+    with timed("image_resize"):
+        if OCR_TILE_MODE:
+            image, scale_ratio = resize_image_for_ocr(image, max_size=None, max_pixels=OCR_TILE_MAX_PIXELS)
+        else:
+            image, scale_ratio = resize_image_for_ocr(image, max_size=ocr_max_size())
+    if scale_ratio != 1.0:
+        logger.info("[OCR RESIZE] Scaled by %.2f, New size=%s", scale_ratio, image.size)
+    
+    # numpy array 변환
+    img_array = np.array(image)
+    
+    # OCR 수행 및 텍스트 추출
     try:
-        with io.BytesIO(image_bytes) as bio:
-            with Image.open(bio) as image:
-                original_size = image.size
-                logger.info("[OCR INFORMATION] Original size=%s mode=%s", original_size, image.mode)
-
-                # RGB 변환
-                if image.mode != 'RGB':
-                    image = image.convert('RGB')
-                
-                # OOM 방지를 위한 이미지 리사이즈
-                image, scale_ratio = resize_image_for_ocr(image)
-                if scale_ratio != 1.0:
-                    logger.info("[OCR RESIZE] Scaled by %.2f, New size=%s", scale_ratio, image.size)
-                
-                # numpy array 변환
-                img_array = np.array(image)
-                
-                # OCR 수행
-                try:
-                    result = ocr.predict(img_array)
-                except Exception as ocr_error:
-                    logger.warning("[OCR WARNING] OCR failed, retrying with smaller size: %s", ocr_error)
-                    smaller_image, _ = resize_image_for_ocr(image, max_size=MAX_IMAGE_SIZE // 2)
-                    result = ocr.predict(np.array(smaller_image))
-
-                # 텍스트 추출
-                texts = []
-                if result and isinstance(result, list):
-                    for res in result:
-                        js = getattr(res, "json", None)
-                        if isinstance(js, dict):
-                            core = js.get("res", js)
-                            for t in core.get("rec_texts", []) or []:
-                                if t and t.strip():
-                                    texts.append(t.strip())
-                    
-                if texts:
-                    full_text = ' '.join(texts)
-                    normalized_text = normalize_ocr_text(full_text)
-                    logger.info("[OCR RESPONSE] Text detected (length=%d)", len(normalized_text))
-                    return normalized_text
-                
-                logger.info("[OCR RESPONSE] No text detected")
-                return ""
-    except Exception as e:
-        logger.exception("[OCR ERROR] %s", e)
-        return ""
+        texts = run_ocr(img_array)
+    except Exception as ocr_error:
+        # 현재 프로세스 엔진 실패만 축소 재시도 (OCR 워커 풀의 시간 초과/연결 실패/워커 오류는 바로 전달)
+        if OCR_TILE_MODE or OCR_SOCKET:
+            raise
+        logger.warning("[OCR WARNING] OCR failed, retrying with smaller size: %s", ocr_error)
+        smaller_image, _ = resize_image_for_ocr(image, max_size=ocr_max_size() // 2)
+        texts = run_ocr(np.array(smaller_image))
+
+    if texts:
+        full_text = ' '.join(texts)
+        normalized_text = normalize_ocr_text(full_text)
+        logger.info("[OCR RESPONSE] Text detected (length=%d)", len(normalized_text))
+        return normalized_text
+    
+    logger.info("[OCR RESPONSE] No text detected")
+    return ""
+
+def pii_ocr_single(image_bytes: Union[bytes, BinaryIO]) -> str:
+    """단일 이미지에서 텍스트 추출 (bytes 또는 파일 객체/mmap, 디코딩/OCR 오류는 호출 측으로 전달)"""
+    source = io.BytesIO(image_bytes) if isinstance(image_bytes, bytes) else nullcontext(image_bytes)
+    with source as bio:
+        with Image.open(bio) as image:
+            return pii_ocr_image(image)
@@ -0,0 +1,155 @@
+"""
+대용량 텍스트 병렬 분석 (PARALLEL_MIN_CHARS 이상, pii_general.analyze_general 에서 호출)
+
+- 패턴 인식기(이메일, 카드, 전화, 계좌, 사업자번호): 텍스트를 구간으로 나눠 스레드/프로세스 풀에서 분석
+  - 기본 process: 패턴 인식기는 순수 Python re 로 GIL 을 잡으므로 스레드로는 코어 수만큼 빨라지지 않음
+    워커 시작 시 PARALLEL_WORKERS 개 fork (copy-on-write), 하위 프로세스가 죽으면 스레드 풀로 전환
+  - thread: 워커 당 하위 프로세스 없음 (메모리 우선, 패턴 인식기 구간은 사실상 순차 실행)
+  - 구간은 window + 최장 패턴 길이(PARALLEL_MAX_PATTERN_CHARS) 만큼 겹치며, 경계는 공백에 정렬
+  - 요청에 고정된 규칙 버전을 함께 전달, 하위 프로세스의 규칙이 다르면 파일에서 다시 로드
+  - 각 구간은 자기 소유 범위에서 시작하는 스팬만 반환 (겹침 구간 중복 제거)
+- KR_PERSON: 전체 텍스트 기준 동일한 청크/배치를 스레드 풀에서 병렬 추론 (이름 사전 단독 백엔드는 전체 텍스트 1회 탐색)
+- 병합 후 AnalyzerEngine 과 같은 중복 제거 → 조합 규칙은 pii_general 에서 전체 스팬으로 평가
+- 결과는 단일 스레드 analyze_general 과 동일 (benchmarks/parallel_parity.py 로 확인)
+"""
+import contextvars
+import logging
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional, Tuple
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from app import ruleset
+from app.pii_general import ANALYZER, PATTERN_ENTITIES, REG
+from app.recognizer.name_recognizer import KRNameGazetteerRecognizer
+from app.recognizer.per_recognizer import KRPersonRecognizer
+from app.metrics import timed
+from app.resources import PLAN
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+PARALLEL_SEGMENT_CHARS = int(os.getenv("PARALLEL_SEGMENT_CHARS", "50000"))
+PARALLEL_WORKERS = PLAN.parallel_workers  # PARALLEL_WORKERS (미지정 시 app.resources 계획)
+PARALLEL_EXECUTOR = os.getenv("PARALLEL_EXECUTOR", "process").lower()  # process | thread
+PARALLEL_MAX_PATTERN_CHARS = int(os.getenv("PARALLEL_MAX_PATTERN_CHARS", "128"))
+
+_SPACE = re.compile(r"\s")
+
+_segment_pool: Optional[Executor] = None
+_ner_pool: Optional[ThreadPoolExecutor] = None
+_pool_pid: Optional[int] = None
+_pool_lock = threading.Lock()
+
+
+def _pid(_) -> int:
+    return os.getpid()
+
+
+def start_pools() -> None:
+    """워커 프로세스에서 풀 생성 (스레드는 첫 작업 시 생성, process 모드는 요청 처리 스레드가 생기기 전에 fork)"""
+    global _segment_pool, _ner_pool, _pool_pid
+    if _pool_pid == os.getpid():
+        return
+    _ner_pool = ThreadPoolExecutor(PARALLEL_WORKERS, thread_name_prefix="pii-ner")
+    if PARALLEL_EXECUTOR == "process" and PARALLEL_WORKERS > 1:
+        _segment_pool = ProcessPoolExecutor(PARALLEL_WORKERS, mp_context=multiprocessing.get_context("fork"))
+        # 하위 프로세스를 지금 생성 (이후 fork 시 다른 스레드의 락 상속 방지)
+        list(_segment_pool.map(_pid, range(PARALLEL_WORKERS)))
+    else:
+        _segment_pool = ThreadPoolExecutor(PARALLEL_WORKERS, thread_name_prefix="pii-segment")
+    _pool_pid = os.getpid()
+    logger.info("[PARALLEL] pid=%d executor=%s workers=%d", _pool_pid, PARALLEL_EXECUTOR, PARALLEL_WORKERS)
+
+
+def stop_pools() -> None:
+    """풀 종료 (워커 종료 시, 벤치마크에서 설정을 바꿔 다시 생성할 때)"""
+    global _segment_pool, _ner_pool, _pool_pid
+    if _pool_pid != os.getpid():
+        return
+    for pool in (_segment_pool, _ner_pool):
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+    _segment_pool, _ner_pool, _pool_pid = None, None, None
+
+
+def split_segments(text: str) -> List[Tuple[int, int, int, int]]:
+    """(분석 시작, 분석 끝, 소유 시작, 소유 끝) 목록, 소유 경계는 공백 위치에 정렬"""
+    n = len(text)
+    overlap = ruleset.current().window + PARALLEL_MAX_PATTERN_CHARS
+    bounds = [0]
+    while bounds[-1] + PARALLEL_SEGMENT_CHARS < n:
+        pos = bounds[-1] + PARALLEL_SEGMENT_CHARS
+        m = _SPACE.search(text, pos, min(n, pos + PARALLEL_MAX_PATTERN_CHARS))
+        bounds.append(m.start() if m else pos)
+    bounds.append(n)
+    return [
+        (max(0, lo - overlap), min(n, hi + overlap), lo, hi)
+        for lo, hi in zip(bounds, bounds[1:])
+    ]
+
+
+def _analyze_segment(args: Tuple[str, int, int, int, str]) -> List[Tuple[str, int, int, float]]:
+    """구간 분석 (풀 프로세스/스레드에서 실행), 소유 범위에서 시작하는 스팬만 반환"""
+    segment, base, own_lo, own_hi, version = args
+    if ruleset.current().version != version:
+        ruleset.reload()
+    results = ANALYZER.analyze(text=segment, language="en", entities=PATTERN_ENTITIES)
+    return [
+        (r.entity_type, base + r.start, base + r.end, r.score)
+        for r in results
+        if own_lo <= base + r.start < own_hi
+    ]
+
+
+def _replace_broken_pool(broken: Executor) -> None:
+    """하위 프로세스 비정상 종료(OOM 등)로 깨진 프로세스 풀을 스레드 풀로 교체 (이후 요청도 계속 처리)"""
+    global _segment_pool
+    with _pool_lock:
+        if _segment_pool is not broken:
+            return
+        logger.error("[PARALLEL] process pool broken, switching to thread pool (workers=%d)", PARALLEL_WORKERS)
+        _segment_pool = ThreadPoolExecutor(PARALLEL_WORKERS, thread_name_prefix="pii-segment")
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _submit_segments(tasks: List[tuple]) -> Tuple[Executor, List[Future]]:
+    pool = _segment_pool
+    if isinstance(pool, ThreadPoolExecutor):
+        # 스레드 모드는 요청 컨텍스트(고정된 규칙)를 복사해서 실행
+        return pool, [pool.submit(contextvars.copy_context().run, _analyze_segment, task) for task in tasks]
+    try:
+        return pool, [pool.submit(_analyze_segment, task) for task in tasks]
+    except BrokenProcessPool:
+        _replace_broken_pool(pool)
+        return _submit_segments(tasks)
+
+
+def _segment_spans(tasks: List[tuple], pool: Executor, futures: List[Future]) -> List[Tuple[str, int, int, float]]:
+    """구간 결과 수집 (풀이 깨졌으면 교체한 풀에서 다시 실행)"""
+    try:
+        return [span for future in futures for span in future.result()]
+    except BrokenProcessPool:
+        _replace_broken_pool(pool)
+        return _segment_spans(tasks, *_submit_segments(tasks))
+
+
+def analyze_parallel(text: str) -> List[RecognizerResult]:
+    """analyze_general 의 병렬 버전 (같은 결과)"""
+    start_pools()
+    version = ruleset.current().version
+    tasks = [(text[lo:hi], lo, own_lo, own_hi, version) for lo, hi, own_lo, own_hi in split_segments(text)]
+
+    with timed("analyze_parallel"):
+        pool, futures = _submit_segments(tasks)
+        results: List[RecognizerResult] = []
+        for rec in REG.recognizers:
+            if isinstance(rec, KRPersonRecognizer):
+                results.extend(rec.analyze_parallel(text, _ner_pool))
+            elif isinstance(rec, KRNameGazetteerRecognizer):
+                results.extend(rec.analyze(text, ["KR_PERSON"]))
+        results.extend(RecognizerResult(t, s, e, score) for t, s, e, score in _segment_spans(tasks, pool, futures))
+        return EntityRecognizer.remove_duplicates(results)
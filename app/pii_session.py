@@ -0,0 +1,194 @@
+"""
+대화 세션 증분 분석 (/pii/session/{conversation_id})
+
+- 대화 이력 전체 대신 새로 추가된 suffix만 전송
+- 세션에 이전 텍스트의 스팬(일반개인정보/고유식별번호)과 마지막 꼬리 텍스트만 저장
+- 재검사 범위: 새 텍스트 + SESSION_OVERLAP(기본 window) 글자 겹침 (토큰 런 시작으로 정렬)
+- 조합 규칙은 새 스팬과 window 안의 저장된 이전 스팬에 대해 평가 (판정은 세션 단위로 유지)
+  - 규칙(app.ruleset)은 append 마다 요청에 고정된 버전 사용
+- 메모리 상한: 세션 수 SESSION_MAX (LRU), 세션 당 스팬 SESSION_MAX_SPANS, 유휴 SESSION_TTL 초 후 만료
+- 세션은 워커 프로세스 메모리에 저장, offset 불일치 시 409 (전체 텍스트 재전송으로 복구)
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+from app.pii_general import analyze_general, involved_types
+from app.pii_main import find_unique_spans
+from app.pii_stream import RUN
+from app.metrics import record_entity, register_gauge, timed
+from app.ruleset import current
+
+SESSION_TTL = float(os.getenv("SESSION_TTL", "1800"))
+SESSION_MAX = int(os.getenv("SESSION_MAX", "10000"))
+SESSION_MAX_SPANS = int(os.getenv("SESSION_MAX_SPANS", "1000"))
+SESSION_OVERLAP = int(os.getenv("SESSION_OVERLAP", str(current().window or 400)))
+
+Span = Tuple[str, int, int]
+
+
+class SessionOffsetError(Exception):
+    """클라이언트가 보낸 offset 과 세션 길이 불일치"""
+    def __init__(self, length: int):
+        super().__init__(f"session offset mismatch (current length {length})")
+        self.length = length
+
+
+def _mask(text: str, base: int, masks: List[Tuple[int, int, str]]) -> str:
+    """text(절대 위치 base 부터)에 마스크 적용, base 이전에서 시작한 마스크의 나머지는 제거"""
+    out, pos = [], 0
+    for s, e, tag in masks:
+        s, e = s - base, e - base
+        if e <= pos:
+            continue
+        if s < pos:
+            pos = e
+            continue
+        out.append(text[pos:s])
+        out.append(tag)
+        pos = e
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def _without_overlaps(spans: List[Span]) -> List[Span]:
+    spans = sorted(spans, key=lambda x: (x[1], -x[2]))
+    out: List[Span] = []
+    for span in spans:
+        if out and span[1] < out[-1][2]:
+            continue
+        out.append(span)
+    return out
+
+
+class Session:
+    def __init__(self):
+        self.length = 0
+        self.tail = ""                      # 마지막 2 * SESSION_OVERLAP 글자
+        self.general: List[Span] = []       # (유형, start, end) 절대 위치
+        self.unique: List[Span] = []        # (라벨, start, end) 절대 위치
+        self.involved: set = set()
+        self.reported: set = set()          # 이미 반환한 마스크 (start, end, tag)
+        self.touched = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _rescan_start(self) -> int:
+        """겹침 재검사 시작 위치 (토큰 런 중간이면 런 시작으로)"""
+        tail_start = self.length - len(self.tail)
+        lo = max(tail_start, self.length - SESSION_OVERLAP)
+        for m in RUN.finditer(self.tail):
+            if m.start() + tail_start >= lo:
+                break
+            if m.end() + tail_start > lo:
+                return m.start() + tail_start
+        return lo
+
+    def _required(self) -> Tuple[List[Tuple[int, int, str]], List[str], str]:
+        """현재 세션 판정 기준 마스크 목록, 라벨, 사유 (/pii/text 와 동일 정책)"""
+        if self.unique:
+            masks = [(s, e, f"[{label}]") for label, s, e in self.unique]
+            labels = list(dict.fromkeys(label for label, _, _ in self.unique))
+            return masks, labels, "고유식별번호"
+        if self.involved:
+            rules = current()
+            masks = [(s, e, rules.tag_map[t] if t in self.involved else f"<{t}>") for t, s, e in self.general]
+            labels = [label for t, label in rules.label_map.items() if t in self.involved]
+            return masks, labels, "일반개인정보"
+        return [], [], ""
+
+    def append(self, suffix: str) -> Dict:
+        old_len = self.length
+        lo = self._rescan_start()
+        region = self.tail[len(self.tail) - (old_len - lo):] + suffix
+
+        # 겹침 구간 이후 스팬은 재검사 결과로 교체, 경계에 걸친 이전 스팬은 유지
+        new_general = [(r.entity_type, lo + r.start, lo + r.end) for r in analyze_general(region)]
+        new_unique = [(label, lo + s, lo + e) for label, s, e in find_unique_spans(region)]
+        for t, s, _ in new_general:
+            if s >= old_len:
+                record_entity(t)
+        kept = [x for x in self.general if x[1] < lo]
+        self.general = _without_overlaps(kept + [x for x in new_general if all(x[1] >= k[2] for k in kept)])
+        kept = [x for x in self.unique if x[1] < lo]
+        self.unique = _without_overlaps(kept + [x for x in new_unique if all(x[1] >= k[2] for k in kept)])
+
+        with timed("combination"):
+            window = current().window
+            by_type: Dict[str, List[tuple]] = {}
+            for t, s, e in self.general:
+                if window == 0 or s >= lo - window:
+                    by_type.setdefault(t, []).append((s, e))
+            self.involved |= involved_types(by_type)
+
+        self.length += len(suffix)
+        self.tail = (self.tail + suffix)[-2 * SESSION_OVERLAP:]
+        if len(self.general) > SESSION_MAX_SPANS:
+            self.general = self.general[-SESSION_MAX_SPANS:]
+        if len(self.unique) > SESSION_MAX_SPANS:
+            self.unique = self.unique[-SESSION_MAX_SPANS:]
+
+        masks, labels, reason = self._required()
+        prefix_masks = [
+            {"start": s, "end": e, "tag": tag}
+            for s, e, tag in masks
+            if s < old_len and (s, e, tag) not in self.reported
+        ]
+        self.reported = set(masks)
+        return {
+            "blocked": bool(reason),
+            "masked_text": _mask(suffix, old_len, [m for m in masks if m[1] > old_len]),
+            "label_list": labels,
+            "reason": reason,
+            "offset": self.length,
+            "prefix_masks": prefix_masks,
+        }
+
+
+class SessionStore:
+    """TTL + LRU 세션 저장소 (워커 프로세스 단위)"""
+    def __init__(self):
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _evict(self, now: float) -> None:
+        while self._sessions:
+            key, sess = next(iter(self._sessions.items()))
+            if len(self._sessions) <= SESSION_MAX and now - sess.touched <= SESSION_TTL:
+                break
+            del self._sessions[key]
+
+    def get(self, conversation_id: str) -> Session:
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            sess = self._sessions.get(conversation_id)
+            if sess is None:
+                sess = self._sessions[conversation_id] = Session()
+            self._sessions.move_to_end(conversation_id)
+            sess.touched = now
+            return sess
+
+    def delete(self, conversation_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(conversation_id, None) is not None
+
+    def append(self, conversation_id: str, suffix: str, offset: int) -> Dict:
+        """
+        suffix 추가 후 분석 (offset=0 이면 세션 초기화, 그 외 불일치 시 SessionOffsetError)
+        - offset 필수: 세션은 워커 메모리에만 있으므로 다른 워커/만료된 세션에 이어 붙이지 않도록 항상 확인
+        """
+        if offset == 0:
+            self.delete(conversation_id)
+        sess = self.get(conversation_id)
+        with sess.lock:
+            if offset != sess.length:
+                raise SessionOffsetError(sess.length)
+            return sess.append(suffix)
+
+
+SESSIONS = SessionStore()
+register_gauge("pii_sessions", "Active conversation sessions in this worker", lambda: {(): len(SESSIONS)})
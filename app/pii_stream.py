@@ -0,0 +1,194 @@
+"""
+스트리밍 마스킹 (LLM 토큰 스트림, /pii/stream)
+
+- 텍스트 조각(delta)을 받아 더 이상 PII 매치에 포함될 수 없는 앞부분을 즉시 마스킹 후 방출
+- 보류(holdback) 구간
+  - 꼬리: 마지막 STREAM_TAIL_CHARS 글자 + 걸쳐 있는 토큰 런(숫자/공백/하이픈 연속, 이메일 등)
+  - 조합: 짝이 없는 일반개인정보는 규칙(app/ruleset.yml) window 안에 짝이 올 수 있는 동안 보류,
+    짝이 오면 보류 구간 안에서 소급 마스킹
+  - 상한: STREAM_MAX_HOLDBACK 초과 시 강제 방출 (보류 중이던 단독 엔티티는 안전하게 마스킹, 판정/라벨에는 미포함)
+- 규칙은 스트림 시작 시 고정 (스트림 도중 규칙이 교체되어도 같은 규칙으로 판정)
+- 고유식별번호는 방출 구간에서 기존 인식기로 치환 (강제 방출도 걸친 런 앞에서 잘라 번호를 나누지 않음)
+- 일반개인정보 분석은 새 텍스트 + 겹침(STREAM_OVERLAP_CHARS) 구간만 (이전 결과 재사용, 스트림 길이에 선형)
+- /pii/text 와 차이: 차단 여부와 무관하게 window 안의 조합 엔티티만 마스킹 (이미 방출한 텍스트는 되돌릴 수 없음)
+"""
+import os
+import re
+from typing import List, Tuple
+from app.pii_general import analyze_general
+from app.pii_main import mask_unique_ids
+from app.metrics import record_entity
+from app.ruleset import current
+
+STREAM_TAIL_CHARS = int(os.getenv("STREAM_TAIL_CHARS", "32"))
+STREAM_MAX_HOLDBACK = max(int(os.getenv("STREAM_MAX_HOLDBACK", "1024")), STREAM_TAIL_CHARS)
+STREAM_FLUSH_CHARS = int(os.getenv("STREAM_FLUSH_CHARS", "16"))
+STREAM_OVERLAP_CHARS = int(os.getenv("STREAM_OVERLAP_CHARS", "64"))  # 재분석 겹침 (이전 분석 끝 기준)
+
+# 매치가 이어질 수 있는 토큰 런: 공백 없는 문자열, 숫자/+/- 로 시작하는 다음 토큰은 같은 런으로 취급
+# (010 1234 5678, 900101 1234567, 11 - 22 - 123456 - 78 등)
+RUN = re.compile(r"\S+(?:\s+(?=[\d+\-])\S+)*")
+# 공백 없는 긴 런(JSON/CSV/로그) 안의 영숫자/하이픈 연속 구간 (고유식별번호가 걸칠 수 있는 단위)
+WORD = re.compile(r"[\w\-]+")
+
+
+def _run_start(text: str, pos: int, pattern: re.Pattern = RUN) -> int:
+    """pos 가 걸쳐 있는 런의 시작 위치 (걸친 런이 없으면 pos)"""
+    for m in pattern.finditer(text):
+        if m.start() >= pos:
+            break
+        if m.end() > pos:
+            return m.start()
+    return pos
+
+
+def _tail_cut(text: str) -> int:
+    """꼬리 보류 후 방출 가능한 위치 (진행 중인 런 중간은 자르지 않음, 런이 보류 구간 전체면 영숫자/하이픈 연속 구간 앞)"""
+    cut = max(0, len(text) - STREAM_TAIL_CHARS)
+    return _run_start(text, cut) or _run_start(text, cut, WORD)
+
+
+class StreamMasker:
+    """요청 1건의 스트리밍 마스킹 상태 (스레드 간 공유 금지)"""
+    def __init__(self):
+        self.rules = current()
+        self.pending = ""
+        self.offset = 0                               # pending[0] 의 절대 위치
+        self.history: List[Tuple[str, int]] = []      # 방출된 조합 엔티티 (유형, 절대 시작 위치)
+        self.labels: List[str] = []
+        self.unique = False
+        self.general = False
+        self.forced = 0
+        self._since = 0
+        self._spans: List[Tuple[str, int, int]] = []  # 분석 결과 (유형, 절대 시작, 절대 끝)
+        self._analyzed = 0                            # 분석한 텍스트 끝 (절대 위치)
+
+    def feed(self, delta: str) -> str:
+        """조각 추가 후 안전한 앞부분 반환 (없으면 빈 문자열)"""
+        self.pending += delta
+        self._since += len(delta)
+        if self._since < STREAM_FLUSH_CHARS and len(self.pending) <= STREAM_MAX_HOLDBACK:
+            return ""
+        self._since = 0
+        return self._flush(final=False)
+
+    def close(self) -> str:
+        """스트림 종료: 남은 보류 구간 전체 방출"""
+        return self._flush(final=True)
+
+    def verdict(self) -> Tuple[bool, List[str], str]:
+        if self.unique:
+            return True, self.labels, "고유식별번호"
+        if self.general:
+            return True, self.labels, "일반개인정보"
+        return False, self.labels, ""
+
+    def _add_label(self, label: str) -> None:
+        if label not in self.labels:
+            self.labels.append(label)
+
+    def _paired(self, idx: int, spans: List[Tuple[str, int, int]]) -> bool:
+        etype, start, _ = spans[idx]
+        partners = self.rules.partners[etype]
+        window = self.rules.window
+        pos = self.offset + start
+        for j, (t, s, _) in enumerate(spans):
+            if j != idx and t in partners and (window == 0 or abs(self.offset + s - pos) <= window):
+                return True
+        return any(t in partners and (window == 0 or abs(s - pos) <= window) for t, s in self.history)
+
+    def _analyze(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        pending 의 조합 엔티티 스팬 (pending 기준 위치)
+        - 이전 분석 끝에서 STREAM_OVERLAP_CHARS 앞(걸친 런은 런 시작)부터만 다시 분석, 그 앞은 이전 결과 재사용
+        """
+        start = max(0, self._analyzed - self.offset - STREAM_OVERLAP_CHARS)
+        start = _run_start(text, start)
+        for _, s, e in self._spans:
+            if s - self.offset < start < e - self.offset:
+                start = max(0, s - self.offset)
+        kept = [(t, s - self.offset, e - self.offset) for t, s, e in self._spans
+                if s >= self.offset and e - self.offset <= start]
+        fresh = [(r.entity_type, r.start + start, r.end + start) for r in analyze_general(text[start:])
+                 if r.entity_type in self.rules.partners]
+        spans = sorted(kept + fresh, key=lambda x: (x[1], -x[2]))
+        self._spans = [(t, s + self.offset, e + self.offset) for t, s, e in spans]
+        self._analyzed = self.offset + len(text)
+        return spans
+
+    def _flush(self, final: bool) -> str:
+        text = self.pending
+        if not text:
+            return ""
+        n = len(text)
+        rules = self.rules
+        window = rules.window
+
+        spans = self._analyze(text)
+        cut = n if final else _tail_cut(text)
+
+        # 조합 판정: 짝이 있으면 마스킹, 아직 짝이 올 수 있으면 보류
+        masked, held = set(), []
+        for i, (_, s, _) in enumerate(spans):
+            if self._paired(i, spans):
+                masked.add(i)
+            elif not final and (window == 0 or n - s <= window):
+                held.append(i)
+                cut = min(cut, s)
+
+        # 엔티티 중간에서 자르지 않음
+        for _, s, e in spans:
+            if s < cut < e:
+                cut = s
+
+        # 보류 상한: 강제 방출, 방출되는 보류 엔티티는 마스킹
+        if not final and n - cut > STREAM_MAX_HOLDBACK:
+            # 걸친 토큰 런 앞에서 자름 (런이 보류 구간 전체면 영숫자/하이픈 연속 구간 앞), 고유식별번호를 나누지 않음
+            cut = n - STREAM_MAX_HOLDBACK
+            cut = _run_start(text, cut) or _run_start(text, cut, WORD) or cut
+            for _, s, e in spans:
+                if s < cut < e:
+                    cut = s if s > 0 else e
+            for i in held:
+                if spans[i][1] < cut:
+                    masked.add(i)
+                    self.forced += 1
+
+        if cut <= 0:
+            return ""
+
+        # 방출 구간 치환 (겹치는 스팬은 앞선 것 우선)
+        out, pos = [], 0
+        for i, (etype, s, e) in enumerate(spans):
+            if e > cut:
+                continue
+            if window == 0:
+                if all(t != etype for t, _ in self.history):
+                    self.history.append((etype, self.offset + s))
+            else:
+                self.history.append((etype, self.offset + s))
+            record_entity(etype)
+            if i not in masked or s < pos:
+                continue
+            out.append(text[pos:s])
+            out.append(rules.tag_map[etype])
+            pos = e
+            # 강제 방출로 마스킹된 단독 엔티티는 판정(라벨)에 넣지 않음 (라벨이 있으면 항상 차단)
+            if i not in held:
+                self.general = True
+                self._add_label(rules.label_map[etype])
+        out.append(text[pos:cut])
+        segment = "".join(out)
+
+        hit, segment, labels = mask_unique_ids(segment)
+        if hit:
+            self.unique = True
+            for label in labels:
+                self._add_label(label)
+
+        self.pending = text[cut:]
+        self.offset += cut
+        if window:
+            # 이후 엔티티와 window 안에 들 수 없는 기록 제거
+            self.history = [(t, s) for t, s in self.history if s >= self.offset - window]
+        return segment
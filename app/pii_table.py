@@ -0,0 +1,329 @@
+"""
+표(CSV) 열 단위 검사
+
+- 샘플 행으로 열 유형 추정
+  - id: 비어 있지 않은 값의 대부분이 번호 형태 (숫자/공백/하이픈/+/괄호, 선택적 영문 1자)
+  - text: 그 외 (자유 텍스트)
+- id 열: 셀 형태(fullmatch)로 후보를 고른 뒤 체크섬/날짜/반복열 검증을 NumPy 로 열 전체에 대해 한 번에 수행
+  - 주민/외국인등록번호(날짜 + 가중치 체크섬), 운전면허번호, 여권번호, 휴대폰번호(_looks_bad), 사업자등록번호(_checksum_ok),
+    카드번호(Luhn), 계좌번호(은행 패턴 전체를 하나의 정규식으로 결합)
+  - 어떤 형태에도 맞지 않는 번호형 셀은 text 셀과 같이 처리
+- text 열: 셀 별로 고유식별번호 + 일반개인정보 분석 (pii_pipeline 과 같은 인식기)
+- 조합 규칙/판정은 행 단위 (셀을 공백으로 이어 붙인 텍스트 기준 위치로 window 적용)
+"""
+import re
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+ID_CELL = re.compile(r"[A-Za-z]?[\d\s\-+().]*\d[\d\s\-+().]*")
+ID_COLUMN_RATIO = 0.9
+MIN_ID_DIGITS = 7  # 이보다 짧은 번호형 셀은 어떤 인식기에도 해당하지 않음
+
+# 셀 형태 (기존 인식기 패턴의 셀 전체 일치 버전)
+RRN_SHAPE = re.compile(r"(\d{6})[-\s]?(\d{7})")
+BRN_SHAPE = re.compile(r"(\d{3})-?(\d{2})-?(\d{5})")
+PHONE_SHAPE = re.compile(
+    r"010-\d{4}-\d{4}|010\ \d{4}\ \d{4}|010\d{8}"
+    r"|\+82\ 10-\d{4}-\d{4}|\+82\ 10\d{8}|\+82\ 10\ \d{4}\ \d{4}"
+)
+DLN_SHAPE = re.compile(r"(\d{2})(?:\s*-\s*|\s+)(\d{2})(?:\s*-\s*|\s+)(\d{6})(?:\s*-\s*|\s+)(\d)(\d)")
+PN_SHAPE = re.compile(r"([MSRGDT])(\d{8})", re.IGNORECASE)
+# Presidio CreditCardRecognizer 패턴
+CARD_SHAPE = re.compile(r"(?!1\d{12}(?!\d))((4\d{3})|(5[0-5]\d{2})|(6\d{3})|(1\d{3})|(3\d{3}))[- ]?(\d{3,4})[- ]?(\d{3,4})[- ]?(\d{3,5})")
+
+RRN_WEIGHTS = np.array([2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5])
+BRN_WEIGHTS = np.array([1, 3, 7, 1, 3, 7, 1, 3, 5])
+DAYS = np.array([0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+
+Span = Tuple[str, int, int]  # (유형 또는 라벨, start, end), 셀 기준
+
+
+# --- 열 유형 추정 ---
+
+def infer_column_types(columns: Sequence[str], sample: Sequence[Sequence[str]]) -> Dict[str, str]:
+    """샘플 행으로 열 유형 추정 (id | text | empty, empty 는 text 와 같이 처리)"""
+    types = {}
+    for i, col in enumerate(columns):
+        values = [row[i].strip() for row in sample if i < len(row) and row[i].strip()]
+        if not values:
+            types[col] = "empty"
+        elif sum(1 for v in values if ID_CELL.fullmatch(v)) >= ID_COLUMN_RATIO * len(values):
+            types[col] = "id"
+        else:
+            types[col] = "text"
+    return types
+
+
+# --- NumPy 검증 ---
+
+def _digit_matrix(digits: Sequence[str], width: int) -> np.ndarray:
+    """같은 길이 숫자 문자열 목록 -> (n, width) 정수 행렬"""
+    buf = "".join(digits).encode("ascii")
+    return (np.frombuffer(buf, dtype=np.uint8).reshape(-1, width) - 48).astype(np.int64)
+
+
+def _date_ok(year: np.ndarray, month: np.ndarray, day: np.ndarray) -> np.ndarray:
+    leap = (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+    month_ok = (month >= 1) & (month <= 12)
+    limit = DAYS[np.clip(month, 0, 12)] - ((month == 2) & ~leap)
+    return month_ok & (day >= 1) & (day <= limit)
+
+
+def valid_registration(d: np.ndarray, alien: bool) -> np.ndarray:
+    """주민(alien=False)/외국인(alien=True) 등록번호 (n, 13): 7번째 자리, 날짜, 2020-10 이전 체크섬"""
+    seventh = d[:, 6]
+    kind_ok = (seventh >= 5) & (seventh <= 8) if alien else (seventh >= 1) & (seventh <= 4)
+    year = np.where((seventh == 1) | (seventh == 2), 1900, 2000) + d[:, 0] * 10 + d[:, 1]
+    month = d[:, 2] * 10 + d[:, 3]
+    day = d[:, 4] * 10 + d[:, 5]
+    before_cutoff = (year * 10000 + month * 100 + day) < 20201001
+    checksum_ok = (11 - (d[:, :12] @ RRN_WEIGHTS) % 11) % 10 == d[:, 12]
+    return kind_ok & _date_ok(year, month, day) & (~before_cutoff | checksum_ok)
+
+
+def valid_business_no(d: np.ndarray) -> np.ndarray:
+    """사업자등록번호 (n, 10): 반복열 배제 + 국세청 체크섬"""
+    same = (d == d[:, :1]).all(axis=1)
+    s = d[:, :9] @ BRN_WEIGHTS + (d[:, 8] * 5) // 10
+    return ~same & ((10 - s % 10) % 10 == d[:, 9])
+
+
+def valid_phone(d: np.ndarray) -> np.ndarray:
+    """휴대폰번호 (n, 11, 010 시작): KRPhoneRecognizer._looks_bad 배제"""
+    tail = d[:, 3:]
+    ends_0000 = (tail[:, 4:] == 0).all(axis=1)
+    same = (tail == tail[:, :1]).all(axis=1)
+    repeat = (tail[:, :4] == tail[:, 4:]).all(axis=1)
+    return (d[:, :3] == [0, 1, 0]).all(axis=1) & ~ends_0000 & ~same & ~repeat
+
+
+def valid_driver_license(d: np.ndarray, now: datetime) -> np.ndarray:
+    """운전면허번호 (n, 12): 지역코드 11~26, 발급연도 1980~현재, 일련번호 000000 금지"""
+    region = d[:, 0] * 10 + d[:, 1]
+    yy = d[:, 2] * 10 + d[:, 3]
+    year = np.where(yy <= now.year % 100, 2000, 1900) + yy
+    serial_zero = (d[:, 4:10] == 0).all(axis=1)
+    return (region >= 11) & (region <= 26) & (year >= 1980) & (year <= now.year) & ~serial_zero
+
+
+def valid_luhn(d: np.ndarray) -> np.ndarray:
+    """Luhn 체크섬 (n, width)"""
+    rev = d[:, ::-1]
+    doubled = rev[:, 1::2] * 2
+    total = rev[:, ::2].sum(axis=1) + (doubled - 9 * (doubled > 9)).sum(axis=1)
+    return total % 10 == 0
+
+
+# --- 열 검사 ---
+
+class _Candidates:
+    """형태가 맞는 셀 (행 인덱스, 숫자 문자열, 셀 내 위치)"""
+    def __init__(self):
+        self.rows: List[int] = []
+        self.digits: List[str] = []
+        self.spans: List[Tuple[int, int]] = []
+
+    def add(self, row: int, digits: str, span: Tuple[int, int]) -> None:
+        self.rows.append(row)
+        self.digits.append(digits)
+        self.spans.append(span)
+
+    def accepted(self, valid_fn, width: int) -> List[Tuple[int, Tuple[int, int]]]:
+        if not self.rows:
+            return []
+        mask = valid_fn(_digit_matrix(self.digits, width))
+        return [(r, s) for r, s, ok in zip(self.rows, self.spans, mask) if ok]
+
+
+def _bank_any() -> re.Pattern:
+    """규칙(app.ruleset) 버전 별로 캐시한 계좌번호 통합 정규식"""
+    global _BANK_ANY
+    from app.ruleset import current
+
+    rules = current()
+    if _BANK_ANY is None or _BANK_ANY[0] != rules.version:
+        _BANK_ANY = (rules.version, re.compile("|".join(f"(?:{rx})" for rx in rules.bank_patterns)))
+    return _BANK_ANY[1]
+
+
+_BANK_ANY: Optional[Tuple[str, re.Pattern]] = None
+
+
+def scan_id_column(values: Sequence[str]) -> Tuple[Dict[int, List[Span]], Dict[int, List[Span]], List[int]]:
+    """
+    id 열 검사
+    반환: (고유식별번호 {행: [(라벨, s, e)]}, 일반개인정보 {행: [(유형, s, e)]}, text 처리로 넘길 행 목록)
+    """
+    bank_any = _bank_any()
+
+    rrn, brn, phone, dln, card = _Candidates(), _Candidates(), _Candidates(), _Candidates(), {}
+    unique: Dict[int, List[Span]] = {}
+    general: Dict[int, List[Span]] = {}
+    fallback: List[int] = []
+
+    for i, raw in enumerate(values):
+        value = raw.strip()
+        if not value:
+            continue
+        if not ID_CELL.fullmatch(value):
+            fallback.append(i)
+            continue
+        if sum(c.isdigit() for c in value) < MIN_ID_DIGITS:
+            continue
+        lead = len(raw) - len(raw.lstrip())
+        span = (lead, lead + len(value))
+        shaped = False
+
+        m = RRN_SHAPE.fullmatch(value)
+        if m:
+            rrn.add(i, m.group(1) + m.group(2), span)
+            shaped = True
+        m = BRN_SHAPE.fullmatch(value)
+        if m:
+            brn.add(i, "".join(m.groups()), span)
+            shaped = True
+        if PHONE_SHAPE.fullmatch(value):
+            d = re.sub(r"\D", "", value)
+            phone.add(i, "0" + d[2:] if d.startswith("82") else d, span)
+            shaped = True
+        m = DLN_SHAPE.fullmatch(value)
+        if m:
+            dln.add(i, "".join(m.groups()), span)
+            shaped = True
+        m = PN_SHAPE.fullmatch(value)
+        if m:
+            shaped = True
+            if m.group(2) != "00000000":
+                unique.setdefault(i, []).append(("여권번호", *span))
+        m = CARD_SHAPE.fullmatch(value)
+        if m:
+            d = re.sub(r"[- ]", "", value)
+            card.setdefault(len(d), _Candidates()).add(i, d, span)
+            shaped = True
+        if bank_any.fullmatch(value):
+            general.setdefault(i, []).append(("KR_BANK_ACCOUNT", *span))
+            shaped = True
+
+        # 셀 전체가 한 가지 형태일 때만 여기서 처리, 부분 일치(번호 여러 개 등)는 text 처리로
+        if not shaped:
+            fallback.append(i)
+
+    for r, s in rrn.accepted(lambda d: valid_registration(d, alien=False), 13):
+        unique.setdefault(r, []).append(("주민등록번호", *s))
+    for r, s in rrn.accepted(lambda d: valid_registration(d, alien=True), 13):
+        unique.setdefault(r, []).append(("외국인등록번호", *s))
+    now = datetime.now()
+    for r, s in dln.accepted(lambda d: valid_driver_license(d, now), 12):
+        unique.setdefault(r, []).append(("운전면허번호", *s))
+    for r, s in brn.accepted(valid_business_no, 10):
+        general.setdefault(r, []).append(("KR_BUSINESS_NO", *s))
+    for r, s in phone.accepted(valid_phone, 11):
+        general.setdefault(r, []).append(("KR_PHONE_NUMBER", *s))
+    for width, cands in card.items():
+        for r, s in cands.accepted(valid_luhn, width):
+            general.setdefault(r, []).append(("CREDIT_CARD", *s))
+    return unique, general, fallback
+
+
+def scan_text_cell(text: str) -> Tuple[List[Span], List[Span]]:
+    """text 셀 검사 (고유식별번호 스팬, 일반개인정보 스팬)"""
+    from app.pii_general import analyze_general
+    from app.pii_main import find_unique_spans
+
+    if not text or not text.strip():
+        return [], []
+    unique = find_unique_spans(text)
+    general = [(r.entity_type, r.start, r.end) for r in analyze_general(text)]
+    return unique, general
+
+
+# --- 행 판정 ---
+
+UNIQUE_ORDER = ("주민등록번호", "외국인등록번호", "운전면허번호", "여권번호")
+
+
+def _mask_cell(text: str, spans: List[Tuple[int, int, str]]) -> str:
+    out, pos = [], 0
+    for s, e, tag in sorted(spans):
+        if s < pos:
+            continue
+        out.append(text[pos:s])
+        out.append(tag)
+        pos = e
+    out.append(text[pos:])
+    return "".join(out)
+
+
+def judge_row(
+    columns: Sequence[str],
+    values: Sequence[str],
+    unique: Dict[int, List[Span]],
+    general: Dict[int, List[Span]],
+) -> Tuple[bool, List[str], str, Dict[str, str]]:
+    """
+    행 판정 (pii_pipeline 과 같은 정책)
+    unique/general: {열 인덱스: [스팬]}, 반환: (차단, 라벨, 사유, 마스킹된 셀 {열: 값})
+    """
+    from app.pii_general import involved_types
+    from app.ruleset import current
+
+    if unique:
+        found = {label for spans in unique.values() for label, _, _ in spans}
+        masked = {
+            columns[c]: _mask_cell(values[c], [(s, e, f"[{label}]") for label, s, e in spans])
+            for c, spans in unique.items()
+        }
+        return True, [label for label in UNIQUE_ORDER if label in found], "고유식별번호", masked
+
+    # 셀을 공백 1칸으로 이어 붙인 행 텍스트 기준 위치로 window 적용
+    offsets, pos = [], 0
+    for v in values:
+        offsets.append(pos)
+        pos += len(v) + 1
+    by_type: Dict[str, List[tuple]] = {}
+    for c, spans in general.items():
+        for t, s, e in spans:
+            by_type.setdefault(t, []).append((offsets[c] + s, offsets[c] + e))
+    involved = involved_types(by_type)
+    if not involved:
+        return False, [], "", {}
+
+    rules = current()
+    masked = {
+        columns[c]: _mask_cell(values[c], [(s, e, rules.tag_map[t] if t in involved else f"<{t}>") for t, s, e in spans])
+        for c, spans in general.items()
+    }
+    labels = [label for t, label in rules.label_map.items() if t in involved]
+    return True, labels, "일반개인정보", masked
+
+
+def scan_rows(columns: Sequence[str], col_types: Dict[str, str], rows: Sequence[Sequence[str]]) -> List[Tuple[bool, List[str], str, Dict[str, str]]]:
+    """행 묶음 검사: id 열은 열 단위 일괄 검증, text 열(및 형태 불일치 셀)은 셀 단위 분석 후 행 단위 판정"""
+    n = len(rows)
+    width = len(columns)
+    rows = [list(r) + [""] * (width - len(r)) if len(r) < width else list(r[:width]) for r in rows]
+    unique: List[Dict[int, List[Span]]] = [{} for _ in range(n)]
+    general: List[Dict[int, List[Span]]] = [{} for _ in range(n)]
+
+    def _cell(r: int, c: int) -> None:
+        u, g = scan_text_cell(rows[r][c])
+        if u:
+            unique[r][c] = u
+        if g:
+            general[r][c] = g
+
+    for c, col in enumerate(columns):
+        if col_types.get(col) == "id":
+            col_unique, col_general, fallback = scan_id_column([row[c] for row in rows])
+            for r, spans in col_unique.items():
+                unique[r][c] = spans
+            for r, spans in col_general.items():
+                general[r][c] = spans
+            for r in fallback:
+                _cell(r, c)
+        else:
+            for r in range(n):
+                _cell(r, c)
+
+    return [judge_row(columns, rows[r], unique[r], general[r]) for r in range(n)]
@@ -0,0 +1,117 @@
+"""
+온디맨드 프로파일링 캡처 (/pii/admin/profile)
+
+- N초 또는 N건의 요청 동안 Python 스택 샘플링 (sys._current_frames, collapsed stack 포맷)
+- 같은 구간에 KRPersonRecognizer ONNX 세션을 enable_profiling 세션으로 교체
+- 결과를 zip(python.collapsed, onnx_*.json, summary.json)으로 반환
+- 캡처 중이 아닐 때는 tick()의 플래그 확인 외 비용 없음
+"""
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zipfile
+from collections import Counter
+from typing import List, Optional
+
+PROFILE_MAX_SECONDS = int(os.getenv("PROFILE_MAX_SECONDS", "300"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000.0
+
+
+class Profiler:
+    def __init__(self):
+        self.active = False
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._remaining = 0
+        self._stacks: Counter = Counter()
+        self._samples = 0
+
+    def tick(self) -> None:
+        """요청 1건 처리 완료 (요청 수 기준 캡처)"""
+        if not self.active or self._remaining <= 0:
+            return
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self._done.set()
+
+    def _sample_loop(self) -> None:
+        own = threading.get_ident()
+        while self.active:
+            for ident, frame in sys._current_frames().items():
+                if ident == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}")
+                    frame = frame.f_back
+                if stack:
+                    self._stacks[";".join(reversed(stack))] += 1
+            self._samples += 1
+            time.sleep(PROFILE_INTERVAL)
+
+    def capture(self, seconds: float, requests: int = 0) -> bytes:
+        """캡처 실행 후 zip 바이트 반환 (동시에 1개만 허용)"""
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError("profile capture already running")
+        try:
+            seconds = max(0.1, min(float(seconds), PROFILE_MAX_SECONDS))
+            self._stacks = Counter()
+            self._samples = 0
+            self._remaining = requests
+            self._done.clear()
+
+            recognizers = _ner_recognizers()
+            tmpdir = tempfile.mkdtemp(prefix="pii-profile-")
+            for rec in recognizers:
+                rec.start_profiling(os.path.join(tmpdir, "onnx"))
+
+            self.active = True
+            sampler = threading.Thread(target=self._sample_loop, name="pii-profiler", daemon=True)
+            started = time.perf_counter()
+            sampler.start()
+            try:
+                self._done.wait(timeout=seconds)
+            finally:
+                self.active = False
+                sampler.join()
+                onnx_files = [p for p in (rec.end_profiling() for rec in recognizers) if p]
+            elapsed = time.perf_counter() - started
+
+            try:
+                return self._archive(onnx_files, elapsed, requests - max(self._remaining, 0) if requests else None)
+            finally:
+                shutil.rmtree(tmpdir, ignore_errors=True)
+        finally:
+            self._lock.release()
+
+    def _archive(self, onnx_files: List[str], elapsed: float, requests: Optional[int]) -> bytes:
+        buf = io.BytesIO()
+        with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("python.collapsed", "\n".join(f"{stack} {n}" for stack, n in self._stacks.most_common()))
+            for path in onnx_files:
+                zf.write(path, os.path.basename(path))
+            zf.writestr("summary.json", json.dumps({
+                "pid": os.getpid(),
+                "seconds": round(elapsed, 3),
+                "requests": requests,
+                "samples": self._samples,
+                "interval_ms": PROFILE_INTERVAL * 1000,
+                "onnx_profiles": [os.path.basename(p) for p in onnx_files],
+            }, indent=2))
+        return buf.getvalue()
+
+
+def _ner_recognizers() -> list:
+    from app.pii_general import REG
+    from app.recognizer.per_recognizer import KRPersonRecognizer
+
+    return [rec for rec in REG.recognizers if isinstance(rec, KRPersonRecognizer)]
+
+
+PROFILER = Profiler()
@@ -3,9 +3,10 @@ from .arn_recognizer import AlienRegistrationRecognizer
 from .dln_recognizer import DriverLicenseRecognizer
 from .pn_recognizer import PassportRecognizer
 from .per_recognizer import KRPersonRecognizer
+from .name_recognizer import KRNameGazetteerRecognizer
 from .phone_recognizer import KRPhoneRecognizer
 from .brn_recognizer import KRBusinessRegistrationRecognizer
-from .ban_recognizer import KRBankAccountRecognizer, BANK_SPECS
+from .ban_recognizer import KRBankAccountRecognizer
 
 __all__ = [
     "ResidentRegistrationRecognizer",
@@ -13,8 +14,8 @@ __all__ = [
     "DriverLicenseRecognizer",
     "PassportRecognizer",
     "KRPersonRecognizer",
+    "KRNameGazetteerRecognizer",
     "KRPhoneRecognizer",
     "KRBusinessRegistrationRecognizer",
-    "KRBankAccountRecognizer", 
-    "BANK_SPECS"
+    "KRBankAccountRecognizer"
 ]
\ No newline at end of file
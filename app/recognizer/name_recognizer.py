@@ -0,0 +1,35 @@
+import os
+import logging
+from typing import List, Optional
+from presidio_analyzer import EntityRecognizer, RecognizerResult
+from app.gazetteer import Gazetteer, load
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+NAME_GAZETTEER_PATH = os.getenv("NAME_GAZETTEER_PATH", "")
+NAME_GAZETTEER_SCORE = float(os.getenv("NAME_GAZETTEER_SCORE", "0.85"))
+
+class KRNameGazetteerRecognizer(EntityRecognizer):
+    """
+    이름 사전 기반 KR_PERSON 인식기
+    - 직원 명부 등 로컬 이름 목록을 컴파일한 trie (app.gazetteer, mmap 로드)
+    - 단독 사용(KR_PERSON_BACKEND=gazetteer) 또는 NER 앞 단계(cascade, union)
+    """
+    def __init__(self, path: Optional[str] = None, gazetteer: Optional[Gazetteer] = None, score: float = NAME_GAZETTEER_SCORE):
+        super().__init__(supported_entities=["KR_PERSON"], supported_language="en")
+        self.gazetteer = gazetteer or load(path or NAME_GAZETTEER_PATH)
+        self.score = score
+        logger.info(
+            "KRNameGazetteerRecognizer initialized - source: %s, names: %d, nodes: %d",
+            self.gazetteer.source, self.gazetteer.names, self.gazetteer.nodes
+        )
+
+    def load(self) -> None:
+        """Presidio 호환성을 위한 빈 메서드"""
+        pass
+
+    def analyze(self, text: str, entities: List[str], nlp_artifacts=None) -> List[RecognizerResult]:
+        if not text or "KR_PERSON" not in entities:
+            return []
+        return [RecognizerResult("KR_PERSON", s, e, self.score) for s, e in self.gazetteer.find(text)]
@@ -1,27 +1,105 @@
 import os
 import logging
+import threading
+import weakref
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import List, Optional, Tuple, Union
 import numpy as np
 import onnxruntime as ort
 from presidio_analyzer import EntityRecognizer, RecognizerResult
+from app.degrade import current_tier
+from app.gazetteer import outside
+from app.metrics import timed
+from app.resources import PLAN
+
+# 토크나이저/설정만 사용하므로 transformers의 torch/tf import 생략
+os.environ.setdefault("USE_TORCH", "0")
+os.environ.setdefault("USE_TF", "0")
+os.environ.setdefault("USE_FLAX", "0")
 from transformers import AutoConfig, AutoTokenizer
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# 추론 배치 크기 (1: 배칭 끔), 세션 당 연산 스레드 수 (NER_INTRA_OP_THREADS / NER_INTER_OP_THREADS, 미지정 시 app.resources 계획)
+NER_BATCH_SIZE = max(1, int(os.getenv("NER_BATCH_SIZE", "4")))
+NER_INTRA_OP_THREADS = PLAN.ner_intra_threads
+NER_INTER_OP_THREADS = PLAN.ner_inter_threads
+
+# IO binding: 스레드/세션/모양(행 수, 시퀀스 버킷) 별 입출력 버퍼 재사용 (0: session.run)
+NER_IO_BINDING = os.getenv("NER_IO_BINDING", "1").lower() in ("1", "true", "on")
+NER_SEQ_BUCKETS = sorted({int(x) for x in os.getenv("NER_SEQ_BUCKETS", "32,64,128,256,512").split(",") if x.strip()})
+
+_ORT_INT_TYPES = {"tensor(int64)": np.int64, "tensor(int32)": np.int32}
+
+
+class _BoundBuffers:
+    """모양 1개의 입력/로짓/디코딩 버퍼와 IO binding (입출력 OrtValue 가 numpy 메모리를 그대로 참조)"""
+    def __init__(self, session: "ort.InferenceSession", rows: int, seq: int, num_labels: int):
+        self.inputs = {
+            inp.name: np.zeros((rows, seq), dtype=_ORT_INT_TYPES.get(inp.type, np.int64))
+            for inp in session.get_inputs()
+        }
+        self.logits = np.empty((rows, seq, num_labels), dtype=np.float32)
+        self.ids = np.empty((rows, seq), dtype=np.int64)
+        self.scores = np.empty((rows, seq), dtype=np.float32)
+        self.binding = session.io_binding()
+        self._values = [ort.OrtValue.ortvalue_from_numpy(arr) for arr in (*self.inputs.values(), self.logits)]
+        for name, value in zip(self.inputs, self._values):
+            self.binding.bind_ortvalue_input(name, value)
+        self.binding.bind_ortvalue_output(session.get_outputs()[0].name, self._values[-1])
+
+    def run(self, session: "ort.InferenceSession", encoded) -> Tuple[np.ndarray, np.ndarray]:
+        """토크나이저 출력을 버퍼에 복사 후 추론, (예측 라벨, 예측 확률) 반환 (다음 호출 전까지 유효)"""
+        for name, buf in self.inputs.items():
+            src = encoded[name]
+            buf[:, :src.shape[1]] = src
+            buf[:, src.shape[1]:] = 0
+        session.run_with_iobinding(self.binding)
+
+        # softmax 없이 로짓 버퍼에서 직접: argmax 는 로짓과 같음, 최대 확률 = 1 / sum(exp(x - max))
+        logits = self.logits
+        np.argmax(logits, axis=-1, out=self.ids)
+        np.max(logits, axis=-1, out=self.scores)
+        logits -= self.scores[..., None]
+        np.exp(logits, out=logits)
+        np.sum(logits, axis=-1, out=self.scores)
+        np.reciprocal(self.scores, out=self.scores)
+        return self.ids, self.scores
+
+
+def _model_source(path: Path) -> Union[str, bytes]:
+    """
+    InferenceSession 입력 (Python API 는 경로 또는 bytes 만 받음)
+    - .onnx: 파일 경로 (ORT 가 직접 읽어 가중치를 세션에 적재, 별도 Python 복사본 없음)
+    - .ort: 모델 바이트 (use_ort_model_bytes_directly 로 세션이 참조하므로 세션 수명 동안 유지)
+    """
+    if path.suffix == ".ort":
+        return path.read_bytes()
+    return str(path)
+
+
+def _seq_bucket(length: int) -> int:
+    for bucket in NER_SEQ_BUCKETS:
+        if bucket >= length:
+            return bucket
+    return length
+
 class KRPersonRecognizer(EntityRecognizer):
     """
     PER 엔티티 감지
     - Leo97/KoELECTRA-small-v3-modu-ner ONNX 모델 사용
     - Presidio ENTITY "KR_PERSON" 매핑
+    - first_pass: 모델 앞 단계 인식기 (이름 사전), skip_on_hit 이면 앞 단계에서 찾은 이름 구간만 모델 입력에서 제외
     """
-    def __init__(self, model_dir: Optional[str] = None):
+    def __init__(self, model_dir: Optional[str] = None, first_pass: Optional[EntityRecognizer] = None, skip_on_hit: bool = False):
         super().__init__(supported_entities=["KR_PERSON"], supported_language="en")
+        self.first_pass = first_pass
+        self.skip_on_hit = skip_on_hit
 
-        # 디렉토리와 ONNX 파일
+        # 디렉토리와 ONNX 파일 (KOELECTRA_ONNX_FILE: model.onnx 또는 ORT 포맷 model.ort)
         model_path = Path(os.getenv("KOELECTRA_ONNX_DIR", "/Users/skan/Desktop/Github/meritzfire-employee-pii/models/koelectra-onnx"))
-        onnx_file = model_path / "model.onnx"
+        onnx_file = model_path / os.getenv("KOELECTRA_ONNX_FILE", "model.onnx")
         
         # 토크나이저 로드
         self.tokenizer = AutoTokenizer.from_pretrained(
@@ -34,18 +112,27 @@ class KRPersonRecognizer(EntityRecognizer):
         config = AutoConfig.from_pretrained(str(model_path), local_files_only=True)
         self.id2label = {int(i): label for i, label in config.id2label.items()}
 
-        # ONNX 세션 초기화
-        session_opts = ort.SessionOptions()
-        session_opts.intra_op_num_threads = 1
-        session_opts.inter_op_num_threads = 1
-        session_opts.execution_mode = ort.ExecutionMode.ORT_PARALLEL
-        
-        self.session = ort.InferenceSession(
-            str(onnx_file),
-            sess_options=session_opts,
-            providers=["CPUExecutionProvider"],
-        )
-        self.session_input_names = [inp.name for inp in self.session.get_inputs()]
+        # 세션 생성 시 사용할 모델 (.onnx: 파일 경로, .ort: 모델 바이트)
+        self.model_source = _model_source(onnx_file)
+
+        # 저하 단계(tier 2 이상)용 양자화 모델 (KOELECTRA_ONNX_QUANT_FILE 미설정/없음: 기본 모델 사용)
+        self.quant_source: Optional[Union[str, bytes]] = None
+        quant_name = os.getenv("KOELECTRA_ONNX_QUANT_FILE", "")
+        if quant_name and (model_path / quant_name).is_file():
+            self.quant_source = _model_source(model_path / quant_name)
+
+        # ONNX 세션은 fork 이후 안전하지 않으므로 프로세스 별로 최초 사용 시 생성
+        self._session: Optional[ort.InferenceSession] = None
+        self._session_pid: Optional[int] = None
+        self._quant_session: Optional[ort.InferenceSession] = None
+        self._quant_pid: Optional[int] = None
+        self._session_lock = threading.Lock()
+
+        # fast 토크나이저는 padding/truncation 설정 변경이 스레드 안전하지 않음
+        self._tokenizer_lock = threading.Lock()
+
+        # IO binding 버퍼 (스레드 별, 세션이 교체되면 함께 해제)
+        self._buffers = threading.local()
 
         # Chunk & Window 설정
         max_length = getattr(self.tokenizer, "model_max_length", 512)
@@ -53,18 +140,77 @@ class KRPersonRecognizer(EntityRecognizer):
             max_length = 512
         self.chunk_tokens = min(max_length, 512)
         self.overlap_tokens = min(64, self.chunk_tokens // 8)
-        self.batch_size = 4
+        self.batch_size = NER_BATCH_SIZE
         
         logger.info(
             "KRPersonRecognizer initialized - chunk_tokens: %d, overlap_tokens: %d, batch_size: %d",
             self.chunk_tokens, self.overlap_tokens, self.batch_size
         )
 
+    @property
+    def session(self) -> ort.InferenceSession:
+        """현재 프로세스의 ONNX 세션 (fork 후 첫 접근 시 생성)"""
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    self._session = self._create_session()
+                    self._session_pid = os.getpid()
+        return self._session
+
+    @property
+    def quant_session(self) -> ort.InferenceSession:
+        """현재 프로세스의 양자화 모델 세션 (없으면 기본 세션)"""
+        if self.quant_source is None:
+            return self.session
+        if self._quant_session is None or self._quant_pid != os.getpid():
+            with self._session_lock:
+                if self._quant_session is None or self._quant_pid != os.getpid():
+                    self._quant_session = self._create_session(model=self.quant_source)
+                    self._quant_pid = os.getpid()
+        return self._quant_session
+
+    def start_profiling(self, prefix: str) -> None:
+        """ORT 프로파일링 세션으로 교체 (end_profiling 호출 전까지)"""
+        self._profiling_prev = self.session
+        self._session = self._create_session(profile_prefix=prefix)
+
+    def end_profiling(self) -> Optional[str]:
+        """프로파일링 종료 후 기존 세션 복원, 프로파일 JSON 경로 반환"""
+        prev = getattr(self, "_profiling_prev", None)
+        if prev is None:
+            return None
+        path = self._session.end_profiling()
+        self._session, self._profiling_prev = prev, None
+        return path
+
+    def _create_session(self, profile_prefix: Optional[str] = None, model: Optional[Union[str, bytes]] = None) -> ort.InferenceSession:
+        model = self.model_source if model is None else model
+        session_opts = ort.SessionOptions()
+        if profile_prefix:
+            session_opts.enable_profiling = True
+            session_opts.profile_file_prefix = profile_prefix
+        session_opts.intra_op_num_threads = NER_INTRA_OP_THREADS
+        session_opts.inter_op_num_threads = NER_INTER_OP_THREADS
+        session_opts.execution_mode = ort.ExecutionMode.ORT_PARALLEL
+        if isinstance(model, bytes):
+            # ORT 포맷: 이니셜라이저가 모델 바이트를 그대로 참조 (세션 안에 가중치를 다시 복사하지 않음)
+            session_opts.add_session_config_entry("session.use_ort_model_bytes_directly", "1")
+            session_opts.add_session_config_entry("session.use_ort_model_bytes_for_initializers", "1")
+
+        session = ort.InferenceSession(
+            model,
+            sess_options=session_opts,
+            providers=["CPUExecutionProvider"],
+        )
+        self.session_input_names = [inp.name for inp in session.get_inputs()]
+        logger.info("KRPersonRecognizer session created - pid: %d", os.getpid())
+        return session
+
     def __del__(self):
         """ONNX 세션 정리"""
-        if hasattr(self, 'session'):
+        if getattr(self, '_session', None) is not None:
             try:
-                del self.session
+                self._session = None
             except Exception:
                 pass
 
@@ -75,35 +221,61 @@ class KRPersonRecognizer(EntityRecognizer):
     def analyze(self, text: str, entities: List[str], nlp_artifacts=None) -> List[RecognizerResult]:
         if not text or "KR_PERSON" not in entities:
             return []
-
-        chunks = self._chunk_by_tokens(text)
-        if not chunks:
-            return []
+        found = self._analyze_first_pass(text)
 
         # 배치 처리
-        results: List[RecognizerResult] = []
-        for i in range(0, len(chunks), self.batch_size):
-            batch_slice = chunks[i : i + self.batch_size]
-            batch_texts = [c[0] for c in batch_slice]
-            batch_offsets = [c[1] for c in batch_slice]
+        results: List[RecognizerResult] = list(found)
+        for batch_texts, batch_offsets in self._batches(text, found):
             results.extend(self._run_batch(batch_texts, batch_offsets))
 
         # 결과 병합
         return self._merge_results(results)
 
+    def analyze_parallel(self, text: str, executor) -> List[RecognizerResult]:
+        """analyze 와 동일한 청크/배치를 executor(스레드 풀)에서 병렬 추론 (ONNX Runtime 은 GIL 해제)"""
+        if not text:
+            return []
+        found = self._analyze_first_pass(text)
+        results: List[RecognizerResult] = list(found)
+        for batch_results in executor.map(lambda b: self._run_batch(*b), self._batches(text, found)):
+            results.extend(batch_results)
+        return self._merge_results(results)
+
+    def _analyze_first_pass(self, text: str) -> List[RecognizerResult]:
+        if self.first_pass is None:
+            return []
+        with timed("ner_first_pass"):
+            return self.first_pass.analyze(text, ["KR_PERSON"])
+
+    def _batches(self, text: str, found: List[RecognizerResult] = ()) -> List[Tuple[List[str], List[int]]]:
+        if self.skip_on_hit and found:
+            # cascade: 사전 일치 구간만 빼고 나머지 구간을 모델로 검사 (같은 문장의 명부 밖 이름도 탐지)
+            chunks = [
+                (chunk, start + base)
+                for start, end in outside(text, [(r.start, r.end) for r in found])
+                for chunk, base in self._chunk_by_tokens(text[start:end])
+            ]
+        else:
+            chunks = self._chunk_by_tokens(text)
+        return [
+            ([c[0] for c in chunks[i : i + self.batch_size]], [c[1] for c in chunks[i : i + self.batch_size]])
+            for i in range(0, len(chunks), self.batch_size)
+        ]
+
     def _run_batch(self, texts: List[str], base_offsets: List[int]) -> List[RecognizerResult]:
         if not texts:
             return []
 
         # 토크나이징
-        encoded = self.tokenizer(
-            texts,
-            padding=True,
-            truncation=True,
-            max_length=self.chunk_tokens,
-            return_tensors="np",
-            return_offsets_mapping=True,
-        )
+        with timed("ner_tokenize"), self._tokenizer_lock:
+            encoded = self.tokenizer(
+                texts,
+                padding=True,
+                truncation=True,
+                max_length=self.chunk_tokens,
+                return_tensors="np",
+                return_offsets_mapping=True,
+            )
 
         offset_mapping = encoded.pop("offset_mapping")
         if isinstance(offset_mapping, np.ndarray):
@@ -112,16 +284,22 @@ class KRPersonRecognizer(EntityRecognizer):
             offset_batches = offset_mapping
 
         # ONNX 추론
-        ort_inputs = {
-            name: encoded[name]
-            for name in self.session_input_names
-            if name in encoded
-        }
-        
-        logits = self.session.run(None, ort_inputs)[0]
-        probs = self._softmax(logits)
-        pred_ids = probs.argmax(axis=-1)
-        pred_scores = probs.max(axis=-1)
+        session = self.quant_session if current_tier() >= 2 else self.session
+        if NER_IO_BINDING:
+            with timed("ner_session_run"):
+                pred_ids, pred_scores = self._bound_buffers(session, len(texts), encoded["input_ids"].shape[1]).run(session, encoded)
+        else:
+            ort_inputs = {
+                name: encoded[name]
+                for name in self.session_input_names
+                if name in encoded
+            }
+
+            with timed("ner_session_run"):
+                logits = session.run(None, ort_inputs)[0]
+            probs = self._softmax(logits)
+            pred_ids = probs.argmax(axis=-1)
+            pred_scores = probs.max(axis=-1)
 
         # 엔티티 추출
         results: List[RecognizerResult] = []
@@ -136,17 +314,30 @@ class KRPersonRecognizer(EntityRecognizer):
             results.extend(entities)
         return results
 
+    def _bound_buffers(self, session: ort.InferenceSession, rows: int, length: int) -> _BoundBuffers:
+        """현재 스레드의 (세션, 행 수, 시퀀스 버킷) 버퍼, 없으면 생성"""
+        per_session = getattr(self._buffers, "sessions", None)
+        if per_session is None:
+            per_session = self._buffers.sessions = weakref.WeakKeyDictionary()
+        shapes = per_session.setdefault(session, {})
+        key = (rows, _seq_bucket(length))
+        buffers = shapes.get(key)
+        if buffers is None:
+            buffers = shapes[key] = _BoundBuffers(session, *key, len(self.id2label))
+        return buffers
+
     def _chunk_by_tokens(self, text: str) -> List[Tuple[str, int]]:
         if not text:
             return []
 
         # 전체 텍스트 토크나이징 (truncation 없이)
-        encoding = self.tokenizer(
-            text,
-            add_special_tokens=False,
-            return_offsets_mapping=True,
-            truncation=False,
-        )
+        with self._tokenizer_lock:
+            encoding = self.tokenizer(
+                text,
+                add_special_tokens=False,
+                return_offsets_mapping=True,
+                truncation=False,
+            )
         
         offsets = encoding.get("offset_mapping", [])
         if not offsets:
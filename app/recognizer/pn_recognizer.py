@@ -1,7 +1,15 @@
 import re
-from datetime import datetime
 from typing import Tuple, List
 
+PN_PATTERN = re.compile(r"(?<![A-Z0-9])([MSRGDT])(\d{8})(?![A-Z0-9])", re.IGNORECASE)
+
+def _valid_pn(m: re.Match) -> bool:
+    return m.group(2) != "00000000"
+
+def find_pn(text: str) -> List[Tuple[int, int]]:
+    """여권번호 위치 목록 (start, end)"""
+    return [m.span() for m in PN_PATTERN.finditer(text) if _valid_pn(m)]
+
 # 여권번호
 def PassportRecognizer(text: str) -> Tuple[bool, str, List[str]]:
     """
@@ -15,16 +23,14 @@ def PassportRecognizer(text: str) -> Tuple[bool, str, List[str]]:
     - 여권종류: M,S,R,G,D,T
     - 일련번호: 8자리 숫자
     """
-    pattern = re.compile(r"(?<![A-Z0-9])([MSRGDT])(\d{8})(?![A-Z0-9])", re.IGNORECASE)
     detected = False
 
     def _repl(m: re.Match) -> str:
         nonlocal detected
-        if m.group(2) == "00000000":
+        if not _valid_pn(m):
             return m.group(0)
         detected = True
         return "[여권번호]"
 
-    text = pattern.sub(_repl, text)
+    text = PN_PATTERN.sub(_repl, text)
     return detected, text, (["여권번호"] if detected else [])
-
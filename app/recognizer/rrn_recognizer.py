@@ -2,6 +2,34 @@ import re
 from datetime import datetime
 from typing import Tuple, List
 
+RRN_PATTERN = re.compile(r"(?<!\d)(\d{6})[-\s]?([1-4]\d{6})(?!\d)")
+RRN_CUTOFF = datetime(2020, 10, 1)
+
+def _valid_rrn(m: re.Match) -> bool:
+    front, back = m.group(1), m.group(2)
+    seventh = back[0]
+
+    # 날짜 유효성
+    try:
+        yy, mm, dd = int(front[:2]), int(front[2:4]), int(front[4:6])
+        year = (1900 if seventh in "12" else 2000) + yy
+        birth = datetime(year, mm, dd)
+    except Exception:
+        return False
+    
+    # 체크섬 (2020-10 이전만 적용)
+    if birth < RRN_CUTOFF:
+        digits = [int(c) for c in (front + back)]
+        weights = [2,3,4,5,6,7,8,9,2,3,4,5]
+        s = sum(d * w for d, w in zip(digits[:12], weights))
+        if (11 - (s % 11)) % 10 != digits[12]:
+            return False
+    return True
+
+def find_rrn(text: str) -> List[Tuple[int, int]]:
+    """주민등록번호 위치 목록 (start, end)"""
+    return [m.span() for m in RRN_PATTERN.finditer(text) if _valid_rrn(m)]
+
 # 주민등록번호
 def ResidentRegistrationRecognizer(text: str) -> Tuple[bool, str, List[str]]:
     """
@@ -16,33 +44,14 @@ def ResidentRegistrationRecognizer(text: str) -> Tuple[bool, str, List[str]]:
     - 출생일 < 2020-10-01 : 체크섬 적용
     - 출생일 >= 2020-10-01 : 체크섬 미적용
     """
-    pattern = re.compile(r"(?<!\d)(\d{6})[-\s]?([1-4]\d{6})(?!\d)")
-    cutoff = datetime(2020, 10, 1)
     detected = False
 
     def _repl(m: re.Match) -> str:
         nonlocal detected
-        front, back = m.group(1), m.group(2)
-        seventh = back[0]
-
-        # 날짜 유효성
-        try:
-            yy, mm, dd = int(front[:2]), int(front[2:4]), int(front[4:6])
-            year = (1900 if seventh in "12" else 2000) + yy
-            birth = datetime(year, mm, dd)
-        except Exception:
+        if not _valid_rrn(m):
             return m.group(0)
-        
-        # 체크섬 (2020-10 이전만 적용)
-        if birth < cutoff:
-            digits = [int(c) for c in (front + back)]
-            weights = [2,3,4,5,6,7,8,9,2,3,4,5]
-            s = sum(d * w for d, w in zip(digits[:12], weights))
-            if (11 - (s % 11)) % 10 != digits[12]:
-                return m.group(0)
-        
         detected = True
         return "[주민등록번호]"
 
-    text = pattern.sub(_repl, text)
-    return detected, text, (["주민등록번호"] if detected else [])
\ No newline at end of file
+    text = RRN_PATTERN.sub(_repl, text)
+    return detected, text, (["주민등록번호"] if detected else [])
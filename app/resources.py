@@ -0,0 +1,111 @@
+"""
+CPU 자원 계획 (gunicorn 워커 수, ONNX/Paddle 스레드, 스케줄러/병렬 풀 크기)
+
+- CPU 예산: cgroup CPU 할당량(v2 cpu.max, v1 cpu.cfs_quota_us)과 CPU affinity 중 작은 값 (PII_CPU_BUDGET 으로 고정 가능)
+- 워커 당 스레드 수 CPU_THREADS_PER_WORKER (기본 2) → 워커 수 = 예산 / 워커 당 스레드 (CPU_MAX_WORKERS 상한)
+- 워커 안의 스레드는 나머지 설정이 같은 예산을 나눠 씀
+  - 스케줄러 워커 = max(2, 워커 당 스레드) (OCR 사용 시 최소 3, text 전용 1개 예약), KR_PERSON 세션 intra-op = 워커 당 스레드 / 스케줄러 워커
+  - OCR cpu_threads(Paddle/ONNX, OMP) = 워커 당 스레드 / 동시 이미지 작업 수, 타일/병렬 분석 풀 = 워커 당 스레드
+  - 외부 OCR 워커 풀(OCR_SOCKET)은 예산의 절반을 OCR cpu_threads 단위로 나눔
+- 각 항목은 기존 환경변수(WEB_CONCURRENCY, NER_INTRA_OP_THREADS, OCR_CPU_THREADS 등)가 있으면 그 값 사용
+- 결정된 값은 시작 시 로그([CPU])와 /pii/startup 으로 확인, 분할 비교는 benchmarks/calibrate.py
+
+실행 (현재 환경의 계획 출력):
+    python -m app.resources
+"""
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+CGROUP_ROOT = Path(os.getenv("CGROUP_ROOT", "/sys/fs/cgroup"))
+CPU_THREADS_PER_WORKER = int(os.getenv("CPU_THREADS_PER_WORKER", "2"))
+CPU_MAX_WORKERS = int(os.getenv("CPU_MAX_WORKERS", "8"))
+
+# 프로파일: full(텍스트+이미지) | text(텍스트 전용, OCR 미로드)
+PII_PROFILE = os.getenv("PII_PROFILE", "full").lower()
+OCR_ENABLED = os.getenv("OCR_ENABLED", "0" if PII_PROFILE == "text" else "1").lower() in ("1", "true", "on")
+
+
+def _cgroup_quota(root: Path = CGROUP_ROOT) -> Optional[float]:
+    """cgroup CPU 할당량 (CPU 개수 단위, 제한 없으면 None)"""
+    try:
+        quota, period = (root / "cpu.max").read_text().split()[:2]  # cgroup v2: "<quota|max> <period>"
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    for base in (root / "cpu", root / "cpu,cpuacct", root):
+        try:
+            quota = int((base / "cpu.cfs_quota_us").read_text())
+            period = int((base / "cpu.cfs_period_us").read_text())
+        except (OSError, ValueError):
+            continue
+        return None if quota <= 0 or period <= 0 else quota / period
+    return None
+
+
+def _affinity() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def cpu_budget() -> Tuple[int, str]:
+    """(사용 가능한 CPU 수, 근거)"""
+    forced = os.getenv("PII_CPU_BUDGET", "")
+    if forced:
+        return max(1, int(forced)), "PII_CPU_BUDGET"
+    cpus, source = _affinity(), "affinity"
+    quota = _cgroup_quota()
+    if quota is not None and quota < cpus:
+        # 소수 할당량(예: 1.5)은 내림, 최소 1
+        cpus, source = max(1, int(quota)), f"cgroup quota {quota:g}"
+    return cpus, source
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name, "")
+    return int(value) if value else default
+
+
+class CpuPlan:
+    """CPU 예산에서 도출한 스레드/프로세스 수 (환경변수 지정 값 우선)"""
+    def __init__(self, cpus: int, source: str, threads_per_worker: int = CPU_THREADS_PER_WORKER):
+        self.cpus = cpus
+        self.source = source
+        per = max(1, min(threads_per_worker, cpus))
+        self.workers = _env_int("WEB_CONCURRENCY", max(1, min(CPU_MAX_WORKERS, cpus // per)))
+        self.threads_per_worker = max(1, cpus // self.workers)
+        per = self.threads_per_worker
+        # text 전용 1개 + (OCR 사용 시) image/job 공유 2개 이상
+        self.sched_workers = _env_int("SCHED_WORKERS", max(3 if OCR_ENABLED else 2, per))
+        self.ner_intra_threads = _env_int("NER_INTRA_OP_THREADS", max(1, per // self.sched_workers))
+        self.ner_inter_threads = _env_int("NER_INTER_OP_THREADS", 1)
+        image_running = max(1, self.sched_workers // 2)
+        self.ocr_threads = _env_int("OCR_CPU_THREADS", max(1, per // image_running))
+        self.ocr_tile_workers = _env_int("OCR_TILE_WORKERS", per)
+        self.parallel_workers = _env_int("PARALLEL_WORKERS", per)
+        self.ocr_pool_workers = _env_int("OCR_WORKERS", max(1, cpus // (2 * self.ocr_threads)))
+
+    def as_dict(self) -> Dict:
+        return dict(vars(self))
+
+    def apply_env(self) -> None:
+        """네이티브 라이브러리(OpenMP/MKL) 스레드 수 설정 (라이브러리 import 전, 지정 값 우선)"""
+        for name in ("OMP_NUM_THREADS", "MKL_NUM_THREADS"):
+            os.environ.setdefault(name, str(self.ocr_threads))
+
+    def __repr__(self) -> str:
+        return " ".join(f"{k}={v}" for k, v in self.as_dict().items())
+
+
+PLAN = CpuPlan(*cpu_budget())
+
+
+if __name__ == "__main__":
+    print(json.dumps(PLAN.as_dict(), ensure_ascii=False, indent=2))
@@ -0,0 +1,256 @@
+"""
+탐지 규칙 (app/ruleset.yml) 컴파일 및 무중단 교체
+
+- Ruleset: 규칙 파일 1개를 컴파일한 불변 객체
+  - 조합 규칙: 유형 별 비트 → 규칙 비트마스크 (탐지된 유형 마스크로 후보 규칙만 거리 검사)
+  - 은행 계좌: BankMatcher (숫자 런 단위 정규식 검사 + 문맥 키워드 단일 정규식)
+  - version: 파일 version + 내용 해시 (응답 ruleset 필드, 캐시 키)
+- 교체: 새 Ruleset 을 모두 컴파일한 뒤 참조를 한 번에 바꿈 (컴파일 실패 시 기존 규칙 유지)
+  - 요청은 시작 시 pin() 으로 규칙을 고정하여 교체 중에도 한 가지 규칙으로 끝까지 처리
+  - 워커 프로세스 별 파일 변경 감시 (RULESET_WATCH_INTERVAL 초) 또는 /pii/admin/ruleset/reload
+"""
+import bisect
+import hashlib
+import logging
+import os
+import re
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
+import yaml
+from app.metrics import Counter, annotate, register, register_gauge
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+RULESET_PATH = Path(os.getenv("RULESET_PATH", str(Path(__file__).resolve().parent / "ruleset.yml")))
+RULESET_WATCH_INTERVAL = float(os.getenv("RULESET_WATCH_INTERVAL", "2"))
+
+RELOADS = register(Counter("pii_ruleset_reloads_total", "Ruleset reload attempts", ("outcome",)))
+
+# 계좌번호 패턴이 걸칠 수 있는 숫자 런 (패턴은 숫자/공백/하이픈으로만 구성)
+DIGIT_RUN = re.compile(r"\d(?:[\d \-]*\d)?")
+CONTEXT_CHARS = 32
+
+
+class RulesetError(Exception):
+    """규칙 파일 형식/정규식 오류"""
+
+
+class BankMatcher:
+    """
+    은행 계좌 정규식 + 문맥 키워드 컴파일 결과
+    - 정규식은 텍스트 전체 대신 최소 길이 이상의 숫자 런 안에서만 검사 (결과는 전체 검사와 동일)
+    - 문맥 키워드는 전체 은행 단어를 긴 단어 우선 단일 정규식으로 1회 탐색, 은행 비트마스크로 판정
+    """
+    def __init__(self, bank_specs: List[Dict]):
+        patterns = []
+        words: Dict[str, int] = {}
+        for i, spec in enumerate(bank_specs):
+            for word in spec.get("context", []):
+                words[word.lower()] = words.get(word.lower(), 0) | (1 << i)
+            for key in ("modern", "legacy"):
+                for rx in spec.get(key, []):
+                    try:
+                        pat = re.compile(rx)
+                    except re.error as e:
+                        raise RulesetError(f"bank {spec.get('bank')}: invalid pattern {rx!r}: {e}") from e
+                    patterns.append((pat, sre_parse.parse(rx).getwidth()[0], 1 << i))
+        self.patterns: Tuple = tuple(patterns)
+        self.min_width = min((w for _, w, _ in patterns), default=0)
+
+        # 같은 위치에서 일치하는 단어는 최장 단어와 그 접두어 단어들
+        ordered = sorted(words, key=len, reverse=True)
+        self.ctx_re = re.compile("(?=(" + "|".join(map(re.escape, ordered)) + "))", re.IGNORECASE) if ordered else None
+        self.words = MappingProxyType(words)
+        self.prefixes = MappingProxyType({w: self._prefixes(w) for w in ordered})
+
+    def _prefixes(self, word: str) -> Tuple[Tuple[int, int], ...]:
+        return tuple((len(p), mask) for p, mask in self.words.items() if word.startswith(p))
+
+    def _contexts(self, text: str) -> Tuple[List[int], List[Tuple[int, int]]]:
+        """문맥 키워드 위치: (시작 위치 목록, [(끝 위치, 은행 마스크)])"""
+        starts, ends = [], []
+        if self.ctx_re is None:
+            return starts, ends
+        for m in self.ctx_re.finditer(text):
+            word = m.group(1).lower()
+            for length, mask in self.prefixes.get(word) or self._prefixes(word):
+                starts.append(m.start())
+                ends.append((m.start() + length, mask))
+        return starts, ends
+
+    @staticmethod
+    def _has_ctx(contexts, s: int, e: int, bank: int, n: int) -> bool:
+        """[s-32, e+32) 안에 해당 은행 키워드가 온전히 있는지"""
+        starts, ends = contexts
+        lo, hi = max(0, s - CONTEXT_CHARS), min(n, e + CONTEXT_CHARS)
+        for i in range(bisect.bisect_left(starts, lo), len(starts)):
+            if starts[i] >= hi:
+                break
+            end, mask = ends[i]
+            if end <= hi and mask & bank:
+                return True
+        return False
+
+    def find(self, text: str) -> List[Tuple[int, int, float]]:
+        """(start, end, score) 목록, 같은 위치는 앞선 패턴 우선"""
+        runs = [m.span() for m in DIGIT_RUN.finditer(text) if m.end() - m.start() >= self.min_width]
+        if not runs:
+            return []
+        contexts = None
+        out: List[Tuple[int, int, float]] = []
+        seen = set()
+        for pat, width, bank in self.patterns:
+            for lo, hi in runs:
+                if hi - lo < width:
+                    continue
+                for m in pat.finditer(text, lo, hi):
+                    span = m.span()
+                    if span in seen:
+                        continue
+                    seen.add(span)
+                    if contexts is None:
+                        contexts = self._contexts(text)
+                    ctx = self._has_ctx(contexts, span[0], span[1], bank, len(text))
+                    out.append((span[0], span[1], min(0.90, 0.75 + (0.15 if ctx else 0.0))))
+        return out
+
+
+class Ruleset:
+    """컴파일된 규칙 (불변, 교체 시 새 객체 생성)"""
+    def __init__(self, data: Dict, digest: str):
+        try:
+            window = int(data["window"])
+            and_rules = tuple((str(a), str(b)) for a, b in data["and_rules"])
+            label_map = dict(data["label_map"])
+            tag_map = dict(data["tag_map"])
+        except (KeyError, TypeError, ValueError) as e:
+            raise RulesetError(f"invalid ruleset: {e!r}") from e
+        missing = {t for rule in and_rules for t in rule} - (label_map.keys() & tag_map.keys())
+        if missing:
+            raise RulesetError(f"label_map/tag_map missing for {sorted(missing)}")
+        banks = tuple(b for b in data.get("banks", []) if b.get("enabled", True))
+
+        types = sorted({t for rule in and_rules for t in rule})
+        bits = {t: 1 << i for i, t in enumerate(types)}
+        partners: Dict[str, set] = {}
+        for a, b in and_rules:
+            partners.setdefault(a, set()).add(b)
+            partners.setdefault(b, set()).add(a)
+
+        values = {
+            "version": f"{data.get('version', 0)}-{digest[:8]}",
+            "window": window,
+            "and_rules": and_rules,
+            "label_map": MappingProxyType(label_map),
+            "tag_map": MappingProxyType(tag_map),
+            "partners": MappingProxyType({t: frozenset(p) for t, p in partners.items()}),
+            "bits": MappingProxyType(bits),
+            "rule_masks": tuple(bits[a] | bits[b] for a, b in and_rules),
+            "banks": banks,
+            "bank_patterns": tuple(rx for b in banks for key in ("modern", "legacy") for rx in b.get(key, [])),
+            "bank_matcher": BankMatcher(list(banks)),
+        }
+        for key, value in values.items():
+            object.__setattr__(self, key, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError("Ruleset is immutable")
+
+    def involved(self, by_type: Mapping[str, List[tuple]], window: Optional[int] = None) -> set:
+        """and_rules 중 window 안에서 함께 나타난 유형 집합 (by_type: 유형 -> [(start, end)], window 0: 거리 무관)"""
+        window = self.window if window is None else window
+        present = 0
+        for t in by_type:
+            present |= self.bits.get(t, 0)
+        involved = set()
+        for (a, b), mask in zip(self.and_rules, self.rule_masks):
+            if present & mask != mask:
+                continue
+            if window == 0 or any(abs(sa - sb) <= window for sa, _ in by_type[a] for sb, _ in by_type[b]):
+                involved.update((a, b))
+        return involved
+
+
+def load(path: Path = RULESET_PATH) -> Ruleset:
+    raw = Path(path).read_bytes()
+    try:
+        data = yaml.safe_load(raw)
+    except yaml.YAMLError as e:
+        raise RulesetError(f"invalid YAML: {e}") from e
+    if not isinstance(data, dict):
+        raise RulesetError("ruleset must be a mapping")
+    return Ruleset(data, hashlib.sha256(raw).hexdigest())
+
+
+_current: Ruleset = load()
+_pinned: ContextVar[Optional[Ruleset]] = ContextVar("pii_ruleset", default=None)
+_reload_lock = threading.Lock()
+_watch_pid: Optional[int] = None
+
+
+def current() -> Ruleset:
+    """현재 요청에 고정된 규칙 (없으면 최신 규칙)"""
+    return _pinned.get() or _current
+
+
+def pin() -> Ruleset:
+    """현재 컨텍스트(요청)에 최신 규칙 고정, 요청 추적에 버전 기록"""
+    rules = _current
+    _pinned.set(rules)
+    annotate("ruleset", rules.version)
+    return rules
+
+
+def reload(path: Path = RULESET_PATH) -> Tuple[bool, str]:
+    """규칙 파일 다시 컴파일 후 교체, (변경 여부, 버전) 반환 (실패 시 RulesetError, 기존 규칙 유지)"""
+    global _current
+    with _reload_lock:
+        try:
+            rules = load(path)
+        except (OSError, RulesetError) as e:
+            RELOADS.inc("error")
+            logger.error("[RULESET] reload failed, keeping %s: %s", _current.version, e)
+            raise RulesetError(str(e)) from e
+        if rules.version == _current.version:
+            return False, rules.version
+        previous, _current = _current.version, rules
+    RELOADS.inc("ok")
+    logger.info("[RULESET] pid=%d %s -> %s", os.getpid(), previous, rules.version)
+    return True, rules.version
+
+
+def _watch(path: Path) -> None:
+    last = None
+    while True:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if last is not None and mtime is not None and mtime != last:
+            try:
+                reload(path)
+            except RulesetError:
+                pass
+        last = mtime if mtime is not None else last
+        threading.Event().wait(RULESET_WATCH_INTERVAL)
+
+
+def start_watcher() -> None:
+    """워커 프로세스에서 파일 변경 감시 스레드 시작 (RULESET_WATCH_INTERVAL <= 0 이면 사용 안 함)"""
+    global _watch_pid
+    if RULESET_WATCH_INTERVAL <= 0 or _watch_pid == os.getpid():
+        return
+    _watch_pid = os.getpid()
+    threading.Thread(target=_watch, args=(RULESET_PATH,), name="pii-ruleset-watch", daemon=True).start()
+
+
+register_gauge("pii_ruleset_info", "Active ruleset version", lambda: {(current().version,): 1}, ("version",))
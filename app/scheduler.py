@@ -0,0 +1,230 @@
+"""
+워크로드 클래스 별 우선순위 스케줄링 / 수용 제어 (text, image, job)
+
+- 클래스 별 유한 큐 (SCHED_<CLASS>_QUEUE), 가득 차면 즉시 거절 → 429 + Retry-After
+- 워커 스레드 SCHED_WORKERS 개가 가중치(SCHED_<CLASS>_WEIGHT) 기반 smooth weighted round-robin 으로 다음 작업 선택
+- 클래스 별 동시 실행 상한 (SCHED_<CLASS>_MAX_RUNNING)
+- text 전용 워커 예약 (SCHED_TEXT_RESERVED): image/job 은 합쳐서 SCHED_WORKERS - 예약 수까지만 실행 → 이미지/작업 폭주 시에도 text 작업용 워커 확보
+- 요청 별 마감 시간 (X-Deadline-Ms 헤더 또는 SCHED_<CLASS>_DEADLINE_MS): 실행 전 마감이 지난 작업은 버림 → 503 + Retry-After
+- 큐 대기 시간은 pii_stage_seconds{stage="queue_<class>"} 와 요청 추적(감사 로그)에 기록
+- 실행 직전 큐 점유율/대기 시간 EWMA 로 품질 단계(app.degrade) 결정
+- 워커 프로세스 별 스케줄러 (gunicorn fork 이후 첫 사용 시 스레드 생성)
+"""
+import asyncio
+import contextvars
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+from app.degrade import TIERS, enter_tier
+from app.metrics import Counter, record_stage, register, register_gauge
+from app.resources import PLAN
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+SCHED_WORKERS = PLAN.sched_workers  # SCHED_WORKERS (미지정 시 app.resources 계획)
+SCHED_TEXT_RESERVED = int(os.getenv("SCHED_TEXT_RESERVED", "1"))  # text 만 사용할 수 있는 워커 수
+
+SHED = register(Counter("pii_shed_total", "Requests rejected by admission control", ("class", "reason")))
+
+
+def _class_env(name: str, key: str, default: int) -> int:
+    return int(os.getenv(f"SCHED_{name.upper()}_{key}", str(default)))
+
+
+class Overloaded(Exception):
+    """큐 가득 참(429) 또는 실행 전 마감 초과(503)"""
+    def __init__(self, cls: str, reason: str, retry_after: int):
+        super().__init__(f"{cls} workload overloaded ({reason})")
+        self.cls = cls
+        self.reason = reason
+        self.retry_after = retry_after
+        self.status_code = 429 if reason == "queue_full" else 503
+
+
+class WorkloadClass:
+    def __init__(self, name: str, queue_size: int, weight: int, max_running: int, deadline_ms: int):
+        self.name = name
+        self.queue_size = queue_size
+        self.weight = max(1, weight)
+        self.max_running = max(1, max_running)
+        self.deadline_ms = deadline_ms
+        self.queue: Deque["_Job"] = deque()
+        self.running = 0
+        self.current = 0                # smooth weighted round-robin 상태
+        self.service = 0.0              # 작업 처리 시간 EWMA (초)
+        self.wait = 0.0                 # 큐 대기 시간 EWMA (초)
+
+
+class _Job:
+    __slots__ = ("fn", "args", "ctx", "loop", "future", "enqueued", "deadline", "cancelled")
+
+    def __init__(self, fn: Callable, args: tuple, loop: asyncio.AbstractEventLoop, deadline: float):
+        self.fn = fn
+        self.args = args
+        self.ctx = contextvars.copy_context()   # 요청 추적(start_trace) 전달
+        self.loop = loop
+        self.future = loop.create_future()
+        self.enqueued = time.monotonic()
+        self.deadline = deadline
+        self.cancelled = False
+
+
+def _resolve(future: asyncio.Future, result: Any, error: Optional[BaseException]) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class Scheduler:
+    def __init__(self, classes: Dict[str, WorkloadClass], workers: int, reserved_for: str = "text", reserved: int = 0):
+        self.classes = classes
+        self.workers = max(1, workers)
+        self.reserved_for = reserved_for
+        self.reserved = max(0, min(reserved, self.workers - 1))  # 다른 클래스용 워커 최소 1개 유지
+        self._cond = threading.Condition()
+        self._pid: Optional[int] = None
+
+    def start(self) -> None:
+        """현재 프로세스에 워커 스레드 생성 (fork 후 재호출 시 새로 생성)"""
+        if self._pid == os.getpid():
+            return
+        with self._cond:
+            if self._pid == os.getpid():
+                return
+            for cls in self.classes.values():
+                cls.queue.clear()
+                cls.running = 0
+            for i in range(self.workers):
+                threading.Thread(target=self._worker, name=f"pii-sched-{i}", daemon=True).start()
+            self._pid = os.getpid()
+        logger.info("[SCHED] pid=%d workers=%d classes=%s", os.getpid(), self.workers,
+                    {c.name: (c.weight, c.max_running, c.queue_size) for c in self.classes.values()})
+
+    def retry_after(self, cls: WorkloadClass) -> int:
+        """큐가 비는 데 걸릴 예상 시간 (초, 최소 1)"""
+        slots = min(cls.max_running, self.workers if cls.name == self.reserved_for else self.workers - self.reserved)
+        return max(1, math.ceil(cls.service * (len(cls.queue) + cls.running) / slots))
+
+    async def run(self, name: str, fn: Callable, *args, deadline_ms: Optional[int] = None) -> Any:
+        """name 클래스 큐에 fn(*args) 등록 후 결과 대기"""
+        self.start()
+        cls = self.classes[name]
+        budget = (deadline_ms if deadline_ms and deadline_ms > 0 else cls.deadline_ms) / 1000.0
+        job = _Job(fn, args, asyncio.get_running_loop(), time.monotonic() + budget)
+        with self._cond:
+            if len(cls.queue) >= cls.queue_size:
+                SHED.inc(name, "queue_full")
+                raise Overloaded(name, "queue_full", self.retry_after(cls))
+            cls.queue.append(job)
+            self._cond.notify()
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            job.cancelled = True
+            raise
+
+    def _next(self) -> Optional[tuple]:
+        """실행 가능한 클래스 중 가중치 순서로 다음 작업 선택 (락 보유 상태에서 호출)"""
+        shared = sum(c.running for c in self.classes.values() if c.name != self.reserved_for)
+        open_shared = shared < self.workers - self.reserved
+        eligible = [
+            c for c in self.classes.values()
+            if c.queue and c.running < c.max_running and (open_shared or c.name == self.reserved_for)
+        ]
+        if not eligible:
+            return None
+        total = 0
+        for c in eligible:
+            c.current += c.weight
+            total += c.weight
+        best = max(eligible, key=lambda c: c.current)
+        best.current -= total
+        best.running += 1
+        return best, best.queue.popleft()
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                picked = self._next()
+                while picked is None:
+                    self._cond.wait()
+                    picked = self._next()
+            cls, job = picked
+            try:
+                self._execute(cls, job)
+            finally:
+                with self._cond:
+                    cls.running -= 1
+                    self._cond.notify_all()
+
+    def _execute(self, cls: WorkloadClass, job: _Job) -> None:
+        now = time.monotonic()
+        if job.cancelled:
+            return
+        if now > job.deadline:
+            SHED.inc(cls.name, "deadline")
+            error = Overloaded(cls.name, "deadline", self.retry_after(cls))
+            job.loop.call_soon_threadsafe(_resolve, job.future, None, error)
+            return
+        wait = now - job.enqueued
+        cls.wait = 0.8 * cls.wait + 0.2 * wait
+        job.ctx.run(record_stage, f"queue_{cls.name}", wait)
+        tier = TIERS.observe(cls.name, len(cls.queue) / max(1, cls.queue_size), cls.wait)
+        job.ctx.run(enter_tier, cls.name, tier)
+
+        result, error = None, None
+        try:
+            result = job.ctx.run(job.fn, *job.args)
+        except BaseException as e:
+            error = e
+        elapsed = time.monotonic() - now
+        cls.service = elapsed if cls.service == 0.0 else 0.8 * cls.service + 0.2 * elapsed
+        job.loop.call_soon_threadsafe(_resolve, job.future, result, error)
+
+    def depth(self) -> Dict[tuple, float]:
+        return {(c.name,): len(c.queue) for c in self.classes.values()}
+
+    def running(self) -> Dict[tuple, float]:
+        return {(c.name,): c.running for c in self.classes.values()}
+
+
+SCHEDULER = Scheduler(
+    {
+        "text": WorkloadClass(
+            "text",
+            queue_size=_class_env("text", "QUEUE", 256),
+            weight=_class_env("text", "WEIGHT", 8),
+            max_running=_class_env("text", "MAX_RUNNING", SCHED_WORKERS),
+            deadline_ms=_class_env("text", "DEADLINE_MS", 5000),
+        ),
+        "image": WorkloadClass(
+            "image",
+            queue_size=_class_env("image", "QUEUE", 16),
+            weight=_class_env("image", "WEIGHT", 1),
+            max_running=_class_env("image", "MAX_RUNNING", max(1, SCHED_WORKERS // 2)),
+            deadline_ms=_class_env("image", "DEADLINE_MS", 60000),
+        ),
+        # 비동기 작업(app.jobs) 페이지 단위 실행, 대기 중인 작업은 큐가 아니라 작업 저장소에 보관
+        "job": WorkloadClass(
+            "job",
+            queue_size=_class_env("job", "QUEUE", 16),
+            weight=_class_env("job", "WEIGHT", 1),
+            max_running=_class_env("job", "MAX_RUNNING", 1),
+            deadline_ms=_class_env("job", "DEADLINE_MS", 600000),
+        ),
+    },
+    SCHED_WORKERS,
+    reserved_for="text",
+    reserved=SCHED_TEXT_RESERVED,
+)
+
+register_gauge("pii_queue_depth", "Queued requests per workload class", SCHEDULER.depth, ("class",))
+register_gauge("pii_queue_running", "Running requests per workload class", SCHEDULER.running, ("class",))
@@ -0,0 +1,74 @@
+"""
+시작 시간 추적 (startup trace)
+
+- 무거운 import/초기화 단계를 trace()로 감싸 소요 시간 기록
+- 앱 import 완료 시 finish()가 전체 소요 시간과 RSS를 로그로 출력
+- /pii/startup 에서 같은 내용을 조회 (콜드 스타트 회귀 확인용), CPU 자원 계획(app.resources) 포함
+"""
+import logging
+import os
+import resource
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+from app.resources import OCR_ENABLED, PII_PROFILE, PLAN  # noqa: F401 (프로파일: CPU 계획과 공유)
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+STARTED = time.perf_counter()
+STAGES: List[Dict] = []
+_depth = 0
+_total = None
+
+
+@contextmanager
+def trace(stage: str) -> Iterator[None]:
+    """단계 소요 시간 기록 (중첩 시 depth로 구분)"""
+    global _depth
+    t0 = time.perf_counter()
+    _depth += 1
+    try:
+        yield
+    finally:
+        _depth -= 1
+        STAGES.append({"stage": stage, "depth": _depth, "seconds": round(time.perf_counter() - t0, 4)})
+
+
+def finish() -> Dict:
+    """앱 초기화 완료 시점 기록 후 보고서 로그 출력"""
+    global _total
+    _total = time.perf_counter() - STARTED
+    rep = report()
+    for item in STAGES:
+        logger.info("[STARTUP] %s%s: %.3fs", "  " * item["depth"], item["stage"], item["seconds"])
+    logger.info("[STARTUP] profile=%s ocr=%s total=%.3fs max_rss=%.1fMB",
+                rep["profile"], rep["ocr_enabled"], rep["total_seconds"], rep["max_rss_mb"])
+    logger.info("[CPU] %s", PLAN)
+    return rep
+
+
+def memory_kb(pid: int) -> Dict:
+    """/proc/<pid>/smaps_rollup 기준 Rss/Pss/Private(USS) (kB)"""
+    out: Dict = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                if key in ("Rss", "Pss", "Private_Clean", "Private_Dirty"):
+                    out[key] = int(rest.split()[0])
+    except OSError:
+        return out
+    out["Uss"] = out.pop("Private_Clean", 0) + out.pop("Private_Dirty", 0)
+    return out
+
+
+def report() -> Dict:
+    return {
+        "profile": PII_PROFILE,
+        "ocr_enabled": OCR_ENABLED,
+        "total_seconds": round(_total if _total is not None else time.perf_counter() - STARTED, 4),
+        "max_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "cpu": PLAN.as_dict(),
+        "stages": STAGES,
+    }
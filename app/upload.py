@@ -0,0 +1,213 @@
+"""
+multipart 업로드 스트리밍 수신
+
+- 요청 본문을 청크 단위로 파싱하여 파일 별 SpooledTemporaryFile에 기록 (bytes 전체 복사 없음)
+- 스트리밍 중 요청/파일 크기, 파일 개수, 매직 넘버(파일 형식) 검사
+- 디스크로 넘어간 파일은 mmap으로 디코더에 전달
+"""
+import io
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import BinaryIO, Dict, Iterator, List, Optional
+from fastapi import HTTPException, Request
+
+try:
+    from python_multipart.multipart import MultipartParser, parse_options_header
+except ImportError:  # python-multipart < 0.0.13
+    from multipart.multipart import MultipartParser, parse_options_header
+
+# 업로드 제한
+MAX_UPLOAD_FILE_BYTES = int(os.getenv("MAX_UPLOAD_FILE_BYTES", str(20 * 1024 * 1024)))
+MAX_UPLOAD_REQUEST_BYTES = int(os.getenv("MAX_UPLOAD_REQUEST_BYTES", str(50 * 1024 * 1024)))
+MAX_UPLOAD_FILES = int(os.getenv("MAX_UPLOAD_FILES", "16"))
+UPLOAD_SPOOL_BYTES = int(os.getenv("UPLOAD_SPOOL_BYTES", str(1024 * 1024)))  # 초과 시 디스크로 이동
+
+# 매직 넘버 -> MIME
+SNIFF_BYTES = 16
+SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"%PDF-", "application/pdf"),
+]
+ALLOWED_TYPES = {"image/png", "image/jpeg", "image/gif", "image/bmp", "image/tiff", "image/webp", "application/pdf"}
+
+
+def sniff_type(head: bytes) -> Optional[str]:
+    """파일 앞부분으로 형식 판별"""
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    for magic, mime in SIGNATURES:
+        if head.startswith(magic):
+            return mime
+    return None
+
+
+class SpooledUpload:
+    """스트리밍 수신된 업로드 파일 1개"""
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.content_type: Optional[str] = None
+        self.size = 0
+        self.file = tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES)
+        self._head = b""
+
+    def write(self, data: bytes) -> None:
+        if self.size + len(data) > MAX_UPLOAD_FILE_BYTES:
+            raise HTTPException(status_code=413, detail=f"File too large: {self.filename} (max {MAX_UPLOAD_FILE_BYTES} bytes)")
+        if self.content_type is None:
+            self._head += data[: SNIFF_BYTES - len(self._head)]
+            if len(self._head) >= SNIFF_BYTES:
+                self._check_type()
+        self.file.write(data)
+        self.size += len(data)
+
+    def finish(self) -> None:
+        if self.content_type is None:
+            self._check_type()
+        self.file.seek(0)
+
+    def _check_type(self) -> None:
+        mime = sniff_type(self._head)
+        if mime not in ALLOWED_TYPES:
+            raise HTTPException(status_code=415, detail=f"Unsupported file type: {self.filename}")
+        self.content_type = mime
+
+    @contextmanager
+    def buffer(self) -> Iterator[BinaryIO]:
+        """디코더 입력 (메모리: 내부 BytesIO, 디스크: 읽기 전용 mmap)"""
+        if not getattr(self.file, "_rolled", False):
+            bio: io.BytesIO = self.file._file
+            bio.seek(0)
+            yield bio
+            return
+        self.file.flush()
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+    def close(self) -> None:
+        self.file.close()
+
+
+async def read_uploads(request: Request, field: str = "files") -> List[SpooledUpload]:
+    """multipart 요청 본문을 스트리밍 파싱하여 field 이름의 파일 목록 반환"""
+    content_type, params = parse_options_header(request.headers.get("content-type", ""))
+    boundary = params.get(b"boundary")
+    if content_type != b"multipart/form-data" or not boundary:
+        raise HTTPException(status_code=415, detail="Expected multipart/form-data")
+
+    length = request.headers.get("content-length")
+    if length and length.isdigit() and int(length) > MAX_UPLOAD_REQUEST_BYTES:
+        raise HTTPException(status_code=413, detail=f"Request too large (max {MAX_UPLOAD_REQUEST_BYTES} bytes)")
+
+    uploads: List[SpooledUpload] = []
+    state: Dict = {"field": b"", "value": b"", "headers": {}, "current": None}
+
+    def on_part_begin() -> None:
+        state["headers"] = {}
+        state["current"] = None
+
+    def on_header_field(data: bytes, start: int, end: int) -> None:
+        state["field"] += data[start:end]
+
+    def on_header_value(data: bytes, start: int, end: int) -> None:
+        state["value"] += data[start:end]
+
+    def on_header_end() -> None:
+        state["headers"][state["field"].lower()] = state["value"]
+        state["field"], state["value"] = b"", b""
+
+    def on_headers_finished() -> None:
+        _, disposition = parse_options_header(state["headers"].get(b"content-disposition", b""))
+        name = disposition.get(b"name", b"").decode("utf-8", "replace")
+        filename = disposition.get(b"filename")
+        if name != field or filename is None:
+            return
+        if len(uploads) >= MAX_UPLOAD_FILES:
+            raise HTTPException(status_code=413, detail=f"Too many files (max {MAX_UPLOAD_FILES})")
+        state["current"] = SpooledUpload(filename.decode("utf-8", "replace"))
+        uploads.append(state["current"])
+
+    def on_part_data(data: bytes, start: int, end: int) -> None:
+        if state["current"] is not None:
+            state["current"].write(data[start:end])
+
+    def on_part_end() -> None:
+        if state["current"] is not None:
+            state["current"].finish()
+
+    parser = MultipartParser(boundary, callbacks={
+        "on_part_begin": on_part_begin,
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end,
+    })
+
+    received = 0
+    try:
+        async for chunk in request.stream():
+            received += len(chunk)
+            if received > MAX_UPLOAD_REQUEST_BYTES:
+                raise HTTPException(status_code=413, detail=f"Request too large (max {MAX_UPLOAD_REQUEST_BYTES} bytes)")
+            if chunk:
+                parser.write(chunk)
+        parser.finalize()
+    except Exception:
+        close_uploads(uploads)
+        raise
+
+    if not uploads:
+        raise HTTPException(status_code=422, detail=f"No files in field '{field}'")
+    return uploads
+
+
+class StoredUpload:
+    """디스크에 저장된 업로드 파일 1개 (비동기 작업 입력, SpooledUpload 와 같은 인터페이스)"""
+
+    def __init__(self, path: str, filename: str, content_type: str):
+        self.filename = filename
+        self.content_type = content_type
+        self.size = os.path.getsize(path)
+        self.file = open(path, "rb")
+
+    @contextmanager
+    def buffer(self) -> Iterator[BinaryIO]:
+        with mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+    def close(self) -> None:
+        self.file.close()
+
+
+def close_uploads(uploads: List[SpooledUpload]) -> None:
+    for upload in uploads:
+        upload.close()
+
+
+# Swagger 문서용 요청 본문 스키마 (본문을 직접 파싱하므로 명시 필요)
+UPLOAD_OPENAPI = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["files"],
+                    "properties": {
+                        "files": {"type": "array", "items": {"type": "string", "format": "binary"}},
+                    },
+                }
+            }
+        },
+    }
+}
@@ -0,0 +1,103 @@
+"""
+워커 워밍업
+
+- 워커 시작 후 백그라운드 스레드에서 합성 입력으로 1회씩 실행
+  - pii_pipeline (고유식별정보/일반개인정보 전체 경로)
+  - KRPersonRecognizer (시퀀스 길이 별 ONNX 커널 선택)
+  - OCR (OCR_ENABLED 일 때, Paddle/MKLDNN JIT 또는 ONNX 세션 생성)
+- 완료 전까지 /pii/ready 는 503, 완료 후 200 + 단계 별 소요 시간
+- 실패 시 준비 상태로 전환하지 않고 (/pii/ready 는 error 와 함께 503) 지수 백오프로 재시도
+  (WARMUP_RETRY_S 부터 2배씩, 최대 WARMUP_RETRY_MAX_S 간격, OCR 워커 풀 기동 지연 등 일시적 실패 대비)
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict
+from app import startup
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1").lower() in ("1", "true", "on")
+WARMUP_NER_LENGTHS = [int(n) for n in os.getenv("WARMUP_NER_LENGTHS", "16,128,512").split(",") if n.strip()]
+WARMUP_RETRY_S = float(os.getenv("WARMUP_RETRY_S", "1"))
+WARMUP_RETRY_MAX_S = float(os.getenv("WARMUP_RETRY_MAX_S", "60"))
+
+STATE: Dict = {"ready": False, "running": False, "error": None, "attempts": 0, "timings": {}}
+_lock = threading.Lock()
+
+SAMPLE_TEXT = "홍길동 고객님 연락처는 010-2871-0779, 이메일은 gildong@example.com 입니다."
+
+
+def _timed(name: str, fn, *args) -> None:
+    t0 = time.perf_counter()
+    fn(*args)
+    STATE["timings"][name] = round(time.perf_counter() - t0, 4)
+
+
+def _sample_image():
+    from PIL import Image, ImageDraw
+
+    image = Image.new("RGB", (640, 160), "white")
+    draw = ImageDraw.Draw(image)
+    draw.text((20, 40), "PII 010-2871-0779", fill="black")
+    draw.text((20, 90), "900101-1234567", fill="black")
+    return image
+
+
+def run_warmup() -> None:
+    """성공할 때까지 워밍업 재시도 (간격: 지수 백오프, 상한 WARMUP_RETRY_MAX_S)"""
+    STATE["running"] = True
+    delay = WARMUP_RETRY_S
+    while not _warmup_once():
+        logger.warning("[WARMUP] pid=%d attempt %d failed, retrying in %.1fs", os.getpid(), STATE["attempts"], delay)
+        time.sleep(delay)
+        delay = min(WARMUP_RETRY_MAX_S, delay * 2)
+    STATE["running"] = False
+
+
+def _warmup_once() -> bool:
+    """워밍업 1회 실행 (성공 시에만 준비 상태로 전환, 오류는 STATE에 기록)"""
+    STATE["attempts"] += 1
+    t0 = time.perf_counter()
+    try:
+        from app.pii_main import pii_pipeline
+        from app.pii_general import REG
+        from app.recognizer.per_recognizer import KRPersonRecognizer
+
+        _timed("pii_pipeline", pii_pipeline, SAMPLE_TEXT)
+
+        for rec in REG.recognizers:
+            if isinstance(rec, KRPersonRecognizer):
+                for n in WARMUP_NER_LENGTHS:
+                    # 한글 1음절 ~ 토큰 1개 기준 합성 텍스트
+                    text = ("김철수 " * (n // 2 + 1))[: max(1, n * 2)]
+                    _timed(f"ner_{n}", rec.analyze, text, ["KR_PERSON"])
+
+        if startup.OCR_ENABLED:
+            from app.pii_ocr import pii_ocr_image
+            _timed("ocr", pii_ocr_image, _sample_image())
+    except Exception as e:
+        logger.exception("[WARMUP] failed: %s", e)
+        STATE["error"] = str(e)
+        return False
+    finally:
+        STATE["timings"]["total"] = round(time.perf_counter() - t0, 4)
+    STATE["error"] = None
+    STATE["ready"] = True
+    # 세션/OCR 엔진 생성 후 메모리 (모델 포맷 별 워커 당 메모리 비교)
+    logger.info("[WARMUP] pid=%d done %s memory=%s", os.getpid(), STATE["timings"], startup.memory_kb(os.getpid()))
+    return True
+
+
+def start_warmup() -> None:
+    """백그라운드 워밍업 시작 (비활성 시 즉시 준비 상태)"""
+    with _lock:
+        if STATE["ready"] or STATE["running"]:
+            return
+        if not WARMUP_ENABLED:
+            STATE["ready"] = True
+            return
+        STATE["running"] = True
+    threading.Thread(target=run_warmup, name="pii-warmup", daemon=True).start()
@@ -0,0 +1,188 @@
+"""
+인식기 / 파이프라인 단계 / 전체 파이프라인 벤치마크 (benchmarks/corpus.py 합성 말뭉치)
+
+- 인식기 별: REG 의 일반 인식기(analyze) + 고유식별번호 탐색 함수(find_*)
+- 단계 별: metrics.start_trace() 로 수집한 pii_pipeline 내부 단계(unique_ids, analyze, anonymize 등)
+- 전체: pii_pipeline
+- 지표: p50/p99 지연(ms), 처리량(글자/초), 호출 당 최대 메모리 할당(tracemalloc, 별도 패스)
+- 기준선 비교: --save-baseline 으로 저장한 결과 대비 p50 이 --threshold 이상 느려지면 종료 코드 1
+
+실행:
+    uv run python -m benchmarks.bench --docs 200 --chars 2000 --save-baseline
+    uv run python -m benchmarks.bench --docs 200 --chars 2000 --threshold 0.2   # 기준선 비교
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks.corpus import CorpusGenerator
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100, method="inclusive")[int(q) - 1]
+
+
+def _summary(samples: List[float], chars: int) -> Dict:
+    total = sum(samples)
+    return {
+        "calls": len(samples),
+        "p50_ms": _percentile(samples, 50) * 1000,
+        "p99_ms": _percentile(samples, 99) * 1000,
+        "chars_per_s": chars / total if total else 0.0,
+    }
+
+
+def _time_each(fn: Callable, args: List, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        for a in args:
+            t0 = time.perf_counter()
+            fn(*a)
+            samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _alloc_each(fn: Callable, args: List) -> float:
+    """호출 당 최대 추가 할당(KiB) 평균"""
+    peaks = []
+    tracemalloc.start()
+    try:
+        for a in args:
+            base, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            fn(*a)
+            peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    finally:
+        tracemalloc.stop()
+    return statistics.fmean(peaks) / 1024 if peaks else 0.0
+
+
+def run(texts: List[str], repeat: int, alloc_docs: int) -> Dict[str, Dict]:
+    os.environ.setdefault("PARALLEL_ENABLED", "0")
+    from app.metrics import start_trace
+    from app.pii_general import GENERAL_ENTITIES, NLP, REG
+    from app.pii_main import UNIQUE_ID_FINDERS, pii_pipeline
+
+    chars = sum(map(len, texts)) * repeat
+    cases: Dict[str, tuple] = {}
+
+    artifacts = [NLP.process_text(t, "en") for t in texts]
+    for rec in REG.recognizers:
+        entities = [e for e in rec.supported_entities if e in GENERAL_ENTITIES]
+        if not entities:
+            continue
+        name = getattr(rec, "name", type(rec).__name__)
+        args = [(t, entities, a) for t, a in zip(texts, artifacts)]
+        cases[f"recognizer/{name}"] = (lambda t, e, a, _r=rec: _r.analyze(t, e, a), args)
+    for _, find in UNIQUE_ID_FINDERS:
+        cases[f"recognizer/{find.__name__}"] = (find, [(t,) for t in texts])
+
+    # 예열 (모델 세션/정규식 캐시)
+    for t in texts[:5]:
+        pii_pipeline(t)
+
+    report: Dict[str, Dict] = {}
+    for key, (fn, args) in cases.items():
+        report[key] = _summary(_time_each(fn, args, repeat), chars)
+
+    # 단계 별 시간은 같은 호출에서 추적으로 수집
+    stages: Dict[str, List[float]] = {}
+    e2e: List[float] = []
+    for _ in range(repeat):
+        for t in texts:
+            trace = start_trace()
+            t0 = time.perf_counter()
+            pii_pipeline(t)
+            e2e.append(time.perf_counter() - t0)
+            for stage, sec in trace["stages"].items():
+                stages.setdefault(stage, []).append(sec)
+    for stage, samples in stages.items():
+        report[f"stage/{stage}"] = _summary(samples, chars * len(samples) // len(e2e))
+    report["pipeline"] = _summary(e2e, chars)
+
+    # 할당은 시간 측정과 분리 (tracemalloc 오버헤드)
+    subset = slice(0, alloc_docs)
+    for key, (fn, args) in cases.items():
+        report[key]["alloc_kib"] = _alloc_each(fn, args[subset])
+    report["pipeline"]["alloc_kib"] = _alloc_each(pii_pipeline, [(t,) for t in texts[subset]])
+    return report
+
+
+def compare(report: Dict[str, Dict], baseline: Dict[str, Dict], threshold: float) -> List[str]:
+    """p50 기준 회귀 목록"""
+    regressions = []
+    for key, base in baseline.items():
+        cur = report.get(key)
+        if not cur or not base.get("p50_ms"):
+            continue
+        ratio = cur["p50_ms"] / base["p50_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: p50 {base['p50_ms']:.3f}ms -> {cur['p50_ms']:.3f}ms (x{ratio:.2f})")
+    return regressions
+
+
+def _print_table(report: Dict[str, Dict]) -> None:
+    print(f"{'case':<48}{'p50 ms':>10}{'p99 ms':>10}{'chars/s':>14}{'alloc KiB':>12}", file=sys.stderr)
+    for key, r in report.items():
+        alloc = r.get("alloc_kib")
+        print(
+            f"{key:<48}{r['p50_ms']:>10.3f}{r['p99_ms']:>10.3f}{r['chars_per_s']:>14,.0f}"
+            f"{(f'{alloc:.1f}' if alloc is not None else '-'):>12}",
+            file=sys.stderr,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-recognizer / per-stage / end-to-end benchmark")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=2000, help="문서 당 글자 수")
+    parser.add_argument("--density", type=float, default=3.0, help="1,000자 당 PII 개수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--alloc-docs", type=int, default=20, help="할당 측정 문서 수")
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.2, help="허용 p50 증가율 (0.2 = 20%%)")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args()
+
+    gen = CorpusGenerator(args.seed, args.density)
+    texts = [doc["text"] for doc in gen.documents(args.docs, args.chars)]
+    report = run(texts, args.repeat, args.alloc_docs)
+    result = {
+        "corpus": {"docs": args.docs, "chars": args.chars, "density": args.density, "seed": args.seed},
+        "results": report,
+    }
+    _print_table(report)
+    if args.out:
+        Path(args.out).write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    baseline = Path(args.baseline)
+    if args.save_baseline:
+        baseline.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"[BENCH] baseline saved: {baseline}", file=sys.stderr)
+        return
+    if not baseline.exists():
+        print(f"[BENCH] no baseline at {baseline} (run with --save-baseline)", file=sys.stderr)
+        return
+    saved = json.loads(baseline.read_text(encoding="utf-8"))
+    if saved.get("corpus") != result["corpus"]:
+        print(f"[BENCH] corpus differs from baseline {saved.get('corpus')}", file=sys.stderr)
+    regressions = compare(report, saved.get("results", {}), args.threshold)
+    for line in regressions:
+        print(f"[REGRESSION] {line}", file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
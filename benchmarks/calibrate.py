@@ -0,0 +1,105 @@
+"""
+CPU 분할 보정 (워커 수 × 워커 당 스레드 조합 별 부하 테스트 → 최적 CPU_THREADS_PER_WORKER)
+
+- 현재 CPU 예산(app.resources)에서 워커 당 스레드 후보(1, 2, 4, ... 예산 이하)마다 gunicorn 기동
+  (CPU_THREADS_PER_WORKER 만 바꾸고 나머지 스레드 수는 같은 계획으로 도출, benchmarks.loadtest 재사용)
+- text p99 가 후보 중 최솟값의 --max-p99-ratio 배 이내인 조합 중 처리량(req/s) 최대를 선택
+- 결과는 배포 환경변수(CPU_THREADS_PER_WORKER)로 출력, 같은 노드 유형에서 1회 실행
+
+실행:
+    uv run python -m benchmarks.calibrate --duration 30 --concurrency 16 --image-ratio 0.1 --out calibrate.json
+"""
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from app.resources import CpuPlan, cpu_budget
+from benchmarks.corpus import CorpusGenerator
+from benchmarks.loadtest import compare, load_images, run_config, synthetic_images
+
+# 계획이 도출하는 값 (환경변수로 고정되어 있으면 모든 후보에 같은 값, 보고서 fixed_env 로 표시)
+PLANNED_ENV = (
+    "WEB_CONCURRENCY", "SCHED_WORKERS", "NER_INTRA_OP_THREADS", "NER_INTER_OP_THREADS",
+    "OCR_CPU_THREADS", "OCR_TILE_WORKERS", "PARALLEL_WORKERS", "OCR_WORKERS",
+)
+
+
+def candidates(cpus: int) -> List[int]:
+    """워커 당 스레드 후보 (2의 거듭제곱 + 예산 전체)"""
+    out, per = [], 1
+    while per < cpus:
+        out.append(per)
+        per *= 2
+    out.append(cpus)
+    return out
+
+
+def choose(results: List[Dict], max_p99_ratio: float) -> Dict:
+    """p99 허용 범위 안에서 처리량 최대"""
+    p99 = {r["name"]: r["endpoints"].get("/pii/text", {}).get("p99_ms", float("inf")) for r in results}
+    floor = min(p99.values())
+    eligible = [r for r in results if p99[r["name"]] <= floor * max_p99_ratio] or results
+    return max(eligible, key=lambda r: r["rps"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure the best worker/thread split for this CPU budget")
+    parser.add_argument("--threads", type=int, action="append", default=[], help="워커 당 스레드 후보 (반복 지정, 기본: 자동)")
+    parser.add_argument("--max-p99-ratio", type=float, default=1.5, help="허용 text p99 (최솟값 대비 배수)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="후보 당 부하 시간(초)")
+    parser.add_argument("--image-ratio", type=float, default=0.1)
+    parser.add_argument("--images", default="")
+    parser.add_argument("--font", default="")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--chars", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--rss-interval", type=float, default=0.5)
+    parser.add_argument("--log-dir", default=".")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args()
+
+    cpus, source = cpu_budget()
+    print(f"[CALIBRATE] cpus={cpus} ({source})", file=sys.stderr)
+    texts = [doc["text"] for doc in CorpusGenerator(args.seed, args.density).documents(args.docs, args.chars)]
+    images: List[bytes] = []
+    if args.image_ratio > 0:
+        images = load_images(args.images) if args.images else synthetic_images(texts, 20, args.font)
+
+    results = []
+    for per in args.threads or candidates(cpus):
+        plan = CpuPlan(cpus, source, per)
+        name = f"w{plan.workers}x{plan.threads_per_worker}"
+        if any(r["name"] == name for r in results):
+            continue
+        # 서버는 같은 예산으로 후보 계획을 다시 도출 (PLANNED_ENV 가 고정되어 있으면 그 값은 모든 후보에 동일)
+        env = {"CPU_THREADS_PER_WORKER": str(per), "PII_CPU_BUDGET": str(cpus)}
+        print(f"[CALIBRATE] {name} plan: {plan}", file=sys.stderr)
+        result = run_config(name, env, texts, images, args)
+        result["plan"] = plan.as_dict()
+        results.append(result)
+
+    best = choose(results, args.max_p99_ratio)
+    report = {
+        "cpus": cpus,
+        "source": source,
+        "fixed_env": [k for k in PLANNED_ENV if k in os.environ],
+        "results": results,
+        "comparison": compare(results),
+        "best": {"name": best["name"], "env": {"CPU_THREADS_PER_WORKER": best["env"]["CPU_THREADS_PER_WORKER"]}, "plan": best["plan"]},
+    }
+    print(f"[CALIBRATE] best={best['name']} CPU_THREADS_PER_WORKER={best['env']['CPU_THREADS_PER_WORKER']}", file=sys.stderr)
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(out, encoding="utf-8")
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+"""
+합성 한국어 PII 말뭉치 생성기 (결정적, seed 고정)
+
+- 일상 문장 사이에 유효한 PII를 밀도(density, 1,000자 당 개수)에 맞춰 삽입
+  - 주민/외국인등록번호(날짜 + 체크섬), 사업자등록번호(체크섬), 운전면허번호, 여권번호
+  - 은행 별 계좌번호 (app/ruleset.yml banks 정규식에서 직접 생성), 휴대폰번호, 이메일, 카드번호(Luhn), 이름
+- 근접 오탐 유도(decoy): 체크섬 오류 번호, 유선/대표번호, 날짜, 주문번호, 금지 반복열
+- 문서마다 정답 스팬 [(유형, start, end)] 포함 (decoy 는 "DECOY_*")
+
+실행:
+    uv run python -m benchmarks.corpus --docs 200 --chars 2000 --density 3 --out corpus.jsonl
+"""
+import argparse
+import json
+import random
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Tuple
+
+try:
+    import re._parser as sre_parse  # Python 3.11+
+except ImportError:  # pragma: no cover
+    import sre_parse
+
+SURNAMES = "김이박최정강조윤장임한오서신권황안송류전홍고문양손배백허유남심노하곽성차주우구민진나지엄변채원천방공현함염여추도소석선설마길연위표명기반왕금옥육인맹제모탁국어은편용예봉경사부황보"
+GIVEN = ["민준", "서연", "도윤", "지우", "하준", "서윤", "시우", "하은", "주원", "지호", "예은", "수아", "건우", "지민", "현우", "유진", "길동", "철수", "영희", "은지"]
+EMAIL_DOMAINS = ["example.com", "example.co.kr", "mail.test", "corp.example.org"]
+
+FILLERS = [
+    "오늘 회의는 오후 세 시에 시작합니다.",
+    "배송은 영업일 기준 이틀 정도 소요됩니다.",
+    "첨부한 자료를 검토하시고 의견 부탁드립니다.",
+    "지난달 실적은 전년 대비 소폭 증가했습니다.",
+    "보험 청구 서류는 모바일 앱에서도 제출할 수 있습니다.",
+    "고객센터 운영 시간은 평일 오전 아홉 시부터입니다.",
+    "계약 갱신 안내문이 다음 주에 발송될 예정입니다.",
+    "변경된 약관은 홈페이지 공지사항에서 확인해 주세요.",
+    "상담 내용은 품질 향상을 위해 기록될 수 있습니다.",
+    "요청하신 견적서를 메일로 다시 보내드리겠습니다.",
+]
+
+# (유형, 앞 문맥) 문맥 문구
+CONTEXT = {
+    "RRN": ["주민등록번호는", "주민번호:", "생년월일 및 주민번호"],
+    "ARN": ["외국인등록번호는", "외국인 등록번호:"],
+    "DLN": ["운전면허번호는", "면허번호:"],
+    "PASSPORT": ["여권번호는", "여권:"],
+    "KR_BUSINESS_NO": ["사업자등록번호", "사업자번호:"],
+    "KR_BANK_ACCOUNT": ["입금 계좌는", "환불 계좌:"],
+    "KR_PHONE_NUMBER": ["연락처는", "휴대폰:"],
+    "EMAIL_ADDRESS": ["메일 주소는", "이메일:"],
+    "CREDIT_CARD": ["카드번호", "결제 카드:"],
+    "KR_PERSON": ["담당자", "고객명:"],
+}
+
+
+# --- 정규식 기반 문자열 생성 (계좌번호) ---
+
+def _sample(rng: random.Random, items) -> str:
+    out = []
+    for op, av in items:
+        name = str(op)
+        if name == "LITERAL":
+            out.append(chr(av))
+        elif name == "IN":
+            chars = []
+            for kind, val in av:
+                if str(kind) == "CATEGORY":
+                    chars.extend("0123456789")
+                elif str(kind) == "RANGE":
+                    chars.extend(chr(c) for c in range(val[0], val[1] + 1))
+                elif str(kind) == "LITERAL":
+                    chars.append(chr(val))
+            out.append(rng.choice(chars or "0"))
+        elif name in ("MAX_REPEAT", "MIN_REPEAT"):
+            lo, hi, sub = av
+            hi = lo + 2 if str(hi) == "MAXREPEAT" else hi
+            out.extend(_sample(rng, sub) for _ in range(rng.randint(lo, hi)))
+        elif name == "SUBPATTERN":
+            out.append(_sample(rng, av[-1]))
+        elif name == "BRANCH":
+            out.append(_sample(rng, rng.choice(av[1])))
+        elif name == "ANY":
+            out.append(rng.choice("0123456789"))
+        # ASSERT / ASSERT_NOT / AT 은 문자 생성 없음
+    return "".join(out)
+
+
+def sample_regex(rng: random.Random, pattern: str) -> str:
+    return _sample(rng, sre_parse.parse(pattern))
+
+
+# --- 유효 번호 생성 ---
+
+def _birth(rng: random.Random, before_cutoff: bool = True) -> date:
+    start, end = (date(1940, 1, 1), date(2020, 9, 30)) if before_cutoff else (date(2020, 10, 1), date(2024, 12, 31))
+    return start + timedelta(days=rng.randint(0, (end - start).days))
+
+
+def _rrn_checksum(digits: str) -> str:
+    s = sum(int(d) * w for d, w in zip(digits, [2, 3, 4, 5, 6, 7, 8, 9, 2, 3, 4, 5]))
+    return str((11 - s % 11) % 10)
+
+
+def registration_no(rng: random.Random, alien: bool = False, valid: bool = True) -> str:
+    # 체크섬 오류 decoy 는 체크섬 적용 구간(2020-10 이전) 출생일로 생성
+    birth = _birth(rng, before_cutoff=not valid or rng.random() < 0.9)
+    if alien:
+        seventh = rng.choice("5678")
+    else:
+        seventh = rng.choice("12" if birth.year < 2000 else "34")
+    body = birth.strftime("%y%m%d") + seventh + "".join(rng.choice("0123456789") for _ in range(5))
+    check = _rrn_checksum(body)
+    if not valid:
+        check = str((int(check) + rng.randint(1, 9)) % 10)
+    sep = rng.choice(["-", "-", " ", ""])
+    return f"{body[:6]}{sep}{body[6:]}{check}"
+
+
+def business_no(rng: random.Random, valid: bool = True) -> str:
+    while True:
+        d = [rng.randint(0, 9) for _ in range(9)]
+        s = sum(n * w for n, w in zip(d, [1, 3, 7, 1, 3, 7, 1, 3, 5])) + (d[8] * 5) // 10
+        check = (10 - s % 10) % 10
+        if not valid:
+            check = (check + rng.randint(1, 9)) % 10
+        num = "".join(map(str, d)) + str(check)
+        if len(set(num)) > 1:
+            break
+    return f"{num[:3]}-{num[3:5]}-{num[5:]}" if rng.random() < 0.7 else num
+
+
+def driver_license(rng: random.Random) -> str:
+    return f"{rng.randint(11, 26)}-{rng.randint(80, 99) if rng.random() < 0.5 else rng.randint(0, 23):02d}-{rng.randint(1, 999999):06d}-{rng.randint(0, 99):02d}"
+
+
+def passport(rng: random.Random) -> str:
+    return rng.choice("MSRGDT") + f"{rng.randint(1, 99999999):08d}"
+
+
+def phone(rng: random.Random) -> str:
+    while True:
+        mid, last = rng.randint(0, 9999), rng.randint(1, 9999)
+        tail = f"{mid:04d}{last:04d}"
+        if len(set(tail)) > 1 and tail[:4] != tail[4:] and not tail.endswith("0000"):
+            break
+    fmt = rng.choice(["010-{}-{}", "010 {} {}", "010{}{}", "+82 10-{}-{}"])
+    return fmt.format(tail[:4], tail[4:])
+
+
+def luhn_card(rng: random.Random) -> str:
+    digits = [int(rng.choice("4556")), *[rng.randint(0, 9) for _ in range(14)]]
+    total = 0
+    for i, d in enumerate(reversed(digits)):
+        d = d * 2 if i % 2 == 0 else d
+        total += d - 9 if d > 9 else d
+    digits.append((10 - total % 10) % 10)
+    num = "".join(map(str, digits))
+    sep = rng.choice(["-", " ", ""])
+    return sep.join(num[i:i + 4] for i in range(0, 16, 4))
+
+
+def email(rng: random.Random) -> str:
+    user = rng.choice(["gildong", "minjun.kim", "seoyeon_lee", "cs.team", "park99"]) + str(rng.randint(1, 999))
+    return f"{user}@{rng.choice(EMAIL_DOMAINS)}"
+
+
+def person(rng: random.Random) -> str:
+    return rng.choice(SURNAMES) + rng.choice(GIVEN)
+
+
+def bank_account(rng: random.Random, patterns: List[str]) -> str:
+    return sample_regex(rng, rng.choice(patterns))
+
+
+def _bank_patterns() -> List[str]:
+    from app.ruleset import current
+
+    return list(current().bank_patterns)
+
+
+# --- 근접 오탐(decoy) ---
+
+DECOYS: Dict[str, Callable[[random.Random], str]] = {
+    "DECOY_RRN_CHECKSUM": lambda rng: registration_no(rng, valid=False),
+    "DECOY_BRN_CHECKSUM": lambda rng: business_no(rng, valid=False),
+    "DECOY_LANDLINE": lambda rng: f"02-{rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+    "DECOY_REPRESENTATIVE": lambda rng: f"1588-{rng.randint(1000, 9999)}",
+    "DECOY_PHONE_REPEAT": lambda rng: "010-{0}{0}{0}{0}-{0}{0}{0}{0}".format(rng.randint(0, 9)),
+    "DECOY_DATE": lambda rng: _birth(rng).strftime("%Y-%m-%d"),
+    "DECOY_ORDER": lambda rng: f"ORD-{rng.randint(10**9, 10**10 - 1)}",
+}
+
+
+class CorpusGenerator:
+    """seed 가 같으면 같은 문서를 생성"""
+    def __init__(self, seed: int = 0, density: float = 3.0, decoy_ratio: float = 0.3):
+        self.rng = random.Random(seed)
+        self.density = density
+        self.decoy_ratio = decoy_ratio
+        self.bank_patterns = _bank_patterns()
+        self.makers: Dict[str, Callable[[], str]] = {
+            "RRN": lambda: registration_no(self.rng),
+            "ARN": lambda: registration_no(self.rng, alien=True),
+            "DLN": lambda: driver_license(self.rng),
+            "PASSPORT": lambda: passport(self.rng),
+            "KR_BUSINESS_NO": lambda: business_no(self.rng),
+            "KR_BANK_ACCOUNT": lambda: bank_account(self.rng, self.bank_patterns),
+            "KR_PHONE_NUMBER": lambda: phone(self.rng),
+            "EMAIL_ADDRESS": lambda: email(self.rng),
+            "CREDIT_CARD": lambda: luhn_card(self.rng),
+            "KR_PERSON": lambda: person(self.rng),
+        }
+
+    def document(self, chars: int, types: List[str] = None) -> Dict:
+        """약 chars 글자 문서 + 정답 스팬"""
+        rng = self.rng
+        types = types or list(self.makers)
+        parts: List[str] = []
+        spans: List[Tuple[str, int, int]] = []
+        size = 0
+        # 1,000자 당 density 개 → 문장 당 삽입 확률
+        avg_sentence = sum(map(len, FILLERS)) / len(FILLERS) + 1
+        p_insert = min(1.0, self.density * avg_sentence / 1000.0)
+        while size < chars:
+            parts.append(rng.choice(FILLERS))
+            size += len(parts[-1]) + 1
+            if rng.random() >= p_insert:
+                continue
+            if rng.random() < self.decoy_ratio:
+                etype = rng.choice(list(DECOYS))
+                value = DECOYS[etype](rng)
+                prefix = "참고 번호"
+            else:
+                etype = rng.choice(types)
+                value = self.makers[etype]()
+                prefix = rng.choice(CONTEXT[etype])
+            head = f"{prefix} "
+            start = size + len(head)
+            parts.append(f"{head}{value} 입니다.")
+            spans.append((etype, start, start + len(value)))
+            size += len(parts[-1]) + 1
+        return {"text": " ".join(parts), "spans": spans}
+
+    def documents(self, n: int, chars: int, types: List[str] = None) -> Iterator[Dict]:
+        for i in range(n):
+            doc = self.document(chars, types)
+            doc["id"] = i
+            yield doc
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Synthetic Korean PII corpus generator")
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=2000, help="문서 당 글자 수")
+    parser.add_argument("--density", type=float, default=3.0, help="1,000자 당 PII 개수")
+    parser.add_argument("--decoy-ratio", type=float, default=0.3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="-")
+    args = parser.parse_args()
+
+    gen = CorpusGenerator(args.seed, args.density, args.decoy_ratio)
+    lines = (json.dumps(doc, ensure_ascii=False) + "\n" for doc in gen.documents(args.docs, args.chars))
+    if args.out == "-":
+        for line in lines:
+            print(line, end="")
+    else:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""
+로컬 부하 테스트 (gunicorn 서버 기동 → /pii/text, /pii/image 혼합 요청 → 설정 별 비교)
+
+- 설정(환경변수 묶음) 마다 gunicorn 을 로컬 포트로 띄우고 /pii/ready 가 200 이 될 때까지 대기
+- 동시성 N 의 closed-loop 클라이언트(httpx)가 합성 말뭉치 문서와 이미지로 요청
+- 처리량(req/s), 엔드포인트 별 p50/p95/p99/max, 상태 코드 수, 워커 별 RSS(psutil, 최대/마지막)
+- 첫 번째 설정 대비 처리량/p99 비율 비교 (모든 처리는 오프라인, 단일 서버)
+
+실행:
+    uv run python -m benchmarks.loadtest --concurrency 16 --duration 60 --image-ratio 0.1 \\
+        --config "w1:WEB_CONCURRENCY=1" --config "w2:WEB_CONCURRENCY=2" \\
+        --config "w2-nobatch:WEB_CONCURRENCY=2,NER_BATCH_SIZE=1" --out loadtest.json
+    (--images <dir> 를 주지 않으면 합성 이미지를 생성, 한글 렌더링은 --font <ttf>)
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from benchmarks.corpus import CorpusGenerator
+
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
+DEFAULT_CONFIGS = [
+    "w1:WEB_CONCURRENCY=1",
+    "w2:WEB_CONCURRENCY=2",
+    "w2-nobatch:WEB_CONCURRENCY=2,NER_BATCH_SIZE=1",
+    "w2-sched8:WEB_CONCURRENCY=2,SCHED_WORKERS=8",
+    "w2-nobind:WEB_CONCURRENCY=2,NER_IO_BINDING=0",
+]
+
+
+def parse_config(spec: str) -> Tuple[str, Dict[str, str]]:
+    """'이름:KEY=VAL,KEY=VAL' → (이름, env)"""
+    name, _, body = spec.partition(":")
+    env = dict(kv.split("=", 1) for kv in body.split(",") if kv.strip())
+    return name, env
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+# --- 요청 데이터 ---
+
+def synthetic_images(texts: List[str], n: int, font: str = "") -> List[bytes]:
+    """문서 일부를 렌더링한 PNG (한글 글꼴 미지정 시 기본 글꼴)"""
+    from PIL import Image, ImageDraw, ImageFont
+
+    face = ImageFont.truetype(font, 24) if font else ImageFont.load_default()
+    images = []
+    for text in texts[:n]:
+        lines = [text[i:i + 40] for i in range(0, min(len(text), 480), 40)]
+        image = Image.new("RGB", (960, 40 * len(lines) + 40), "white")
+        draw = ImageDraw.Draw(image)
+        for row, line in enumerate(lines):
+            draw.text((20, 20 + 40 * row), line, fill="black", font=face)
+        buf = io.BytesIO()
+        image.save(buf, format="PNG")
+        images.append(buf.getvalue())
+    return images
+
+
+def load_images(image_dir: str) -> List[bytes]:
+    return [p.read_bytes() for p in sorted(Path(image_dir).rglob("*")) if p.suffix.lower() in IMAGE_EXTS]
+
+
+# --- 서버 ---
+
+class Server:
+    """gunicorn 서브프로세스 (설정 env 적용)"""
+    def __init__(self, env: Dict[str, str], port: int, log_path: Path):
+        self.port = port
+        self.log = open(log_path, "wb")
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "python:app.gunicorn_conf", "app.main:app"],
+            env=dict(os.environ, **env, BIND=f"127.0.0.1:{port}"),
+            stdout=self.log,
+            stderr=subprocess.STDOUT,
+        )
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def wait_ready(self, timeout: float) -> float:
+        """모든 워커가 준비될 때까지 대기 (/pii/ready 연속 성공), 소요 시간 반환"""
+        import httpx
+
+        t0 = time.perf_counter()
+        streak = 0
+        while time.perf_counter() - t0 < timeout:
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"server exited with {self.proc.returncode} (see {self.log.name})")
+            try:
+                ok = httpx.get(f"{self.url}/pii/ready", timeout=2).status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            streak = streak + 1 if ok else 0
+            if streak >= 2 * max(1, len(self.workers())):
+                return time.perf_counter() - t0
+            time.sleep(0.5)
+        raise TimeoutError(f"server not ready in {timeout}s")
+
+    def workers(self) -> List:
+        import psutil
+
+        try:
+            return psutil.Process(self.proc.pid).children()
+        except psutil.NoSuchProcess:
+            return []
+
+    def stop(self) -> None:
+        if self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGTERM)
+            try:
+                self.proc.wait(timeout=40)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        self.log.close()
+
+
+# --- 부하 ---
+
+async def _sample_rss(server: Server, stop: asyncio.Event, rss: Dict[int, List[float]], interval: float) -> None:
+    import psutil
+
+    while not stop.is_set():
+        for proc in server.workers():
+            try:
+                rss.setdefault(proc.pid, []).append(proc.memory_info().rss / 2**20)
+            except psutil.NoSuchProcess:
+                pass
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def drive(server: Server, texts: List[str], images: List[bytes], args) -> Dict:
+    """closed-loop 클라이언트 concurrency 개로 duration 초 동안 요청"""
+    import httpx
+
+    rng = random.Random(args.seed)
+    latencies: Dict[str, List[float]] = {"/pii/text": [], "/pii/image": []}
+    statuses: Dict[str, int] = {}
+    rss: Dict[int, List[float]] = {}
+    stop = asyncio.Event()
+    deadline = time.perf_counter() + args.duration
+
+    async def client(c: httpx.AsyncClient, seed: int) -> None:
+        local = random.Random(seed)
+        while time.perf_counter() < deadline:
+            if images and local.random() < args.image_ratio:
+                endpoint = "/pii/image"
+                req = c.post(endpoint, files=[("files", ("page.png", local.choice(images), "image/png"))])
+            else:
+                endpoint = "/pii/text"
+                req = c.post(endpoint, json={"text": local.choice(texts)})
+            t0 = time.perf_counter()
+            try:
+                status = str((await req).status_code)
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            latencies[endpoint].append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=server.url, timeout=args.timeout, limits=limits) as c:
+        sampler = asyncio.create_task(_sample_rss(server, stop, rss, args.rss_interval))
+        t0 = time.perf_counter()
+        await asyncio.gather(*(client(c, rng.randrange(2**32)) for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await sampler
+
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "elapsed_s": elapsed,
+        "requests": total,
+        "rps": total / elapsed if elapsed else 0.0,
+        "statuses": statuses,
+        "endpoints": {k: _latency_summary(v) for k, v in latencies.items() if v},
+        "rss_mb": {str(pid): {"max": max(v), "last": v[-1]} for pid, v in rss.items() if v},
+    }
+
+
+def _latency_summary(samples: List[float]) -> Dict:
+    q = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else samples * 99
+    return {
+        "count": len(samples),
+        "p50_ms": q[49] * 1000,
+        "p95_ms": q[94] * 1000,
+        "p99_ms": q[98] * 1000,
+        "max_ms": max(samples) * 1000,
+    }
+
+
+def run_config(name: str, env: Dict[str, str], texts: List[str], images: List[bytes], args) -> Dict:
+    port = _free_port()
+    log_path = Path(args.log_dir) / f"loadtest-{name}.log"
+    server = Server(env, port, log_path)
+    try:
+        ready_s = server.wait_ready(args.ready_timeout)
+        result = asyncio.run(drive(server, texts, images, args))
+    finally:
+        server.stop()
+    return {"name": name, "env": env, "ready_s": ready_s, "log": str(log_path), **result}
+
+
+def compare(results: List[Dict]) -> List[Dict]:
+    """첫 번째 설정 대비 처리량/p99 비율"""
+    base = results[0]
+    rows = []
+    for r in results:
+        row = {"name": r["name"], "rps": r["rps"], "rps_ratio": r["rps"] / base["rps"] if base["rps"] else None}
+        for endpoint, s in r["endpoints"].items():
+            b = base["endpoints"].get(endpoint)
+            row[f"{endpoint} p99_ms"] = s["p99_ms"]
+            row[f"{endpoint} p99_ratio"] = s["p99_ms"] / b["p99_ms"] if b and b["p99_ms"] else None
+        row["rss_max_mb"] = max((v["max"] for v in r["rss_mb"].values()), default=0.0)
+        rows.append(row)
+    return rows
+
+
+def _print_rows(rows: List[Dict]) -> None:
+    for row in rows:
+        parts = [f"{k}={v:.2f}" if isinstance(v, float) else f"{k}={v}" for k, v in row.items()]
+        print("[LOADTEST] " + " ".join(parts), file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Local end-to-end load test across server configurations")
+    parser.add_argument("--config", action="append", default=[], help="'이름:KEY=VAL,...' (반복 지정)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=60.0, help="설정 당 부하 시간(초)")
+    parser.add_argument("--image-ratio", type=float, default=0.1, help="/pii/image 요청 비율")
+    parser.add_argument("--images", default="", help="이미지 디렉토리 (없으면 합성 이미지)")
+    parser.add_argument("--font", default="", help="합성 이미지 글꼴(ttf)")
+    parser.add_argument("--docs", type=int, default=500)
+    parser.add_argument("--chars", type=int, default=1000)
+    parser.add_argument("--density", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃(초)")
+    parser.add_argument("--ready-timeout", type=float, default=300.0)
+    parser.add_argument("--rss-interval", type=float, default=0.5)
+    parser.add_argument("--log-dir", default=".")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args()
+
+    texts = [doc["text"] for doc in CorpusGenerator(args.seed, args.density).documents(args.docs, args.chars)]
+    images: List[bytes] = []
+    if args.image_ratio > 0:
+        images = load_images(args.images) if args.images else synthetic_images(texts, 20, args.font)
+
+    results = []
+    for spec in args.config or DEFAULT_CONFIGS:
+        name, env = parse_config(spec)
+        print(f"[LOADTEST] {name} env={env}", file=sys.stderr)
+        results.append(run_config(name, env, texts, images, args))
+        _print_rows(compare(results)[-1:])
+
+    report = {"results": results, "comparison": compare(results)}
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(out, encoding="utf-8")
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+OCR 엔진 비교 벤치마크 (paddle vs onnx)
+
+- 엔진 별로 별도 프로세스에서 실행 (import/모델 로드 시간, RSS 분리 측정)
+- 이미지 별 지연시간, 인식 텍스트 일치율(문자 유사도), PII 판정 일치 여부
+
+실행:
+    uv run python -m benchmarks.ocr_parity <image_dir> [--out report.json]
+"""
+import argparse
+import difflib
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp"}
+
+
+def _images(image_dir: str) -> List[Path]:
+    return sorted(p for p in Path(image_dir).rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+
+
+def run_engine(image_dir: str) -> Dict:
+    """현재 프로세스에서 OCR_ENGINE 엔진 실행 (자식 프로세스 진입점)"""
+    import numpy as np
+    from PIL import Image
+
+    t0 = time.perf_counter()
+    from app import pii_ocr
+    ocr = pii_ocr.build_ocr()
+    startup = time.perf_counter() - t0
+
+    rows = []
+    for path in _images(image_dir):
+        with Image.open(path) as image:
+            image, _ = pii_ocr.resize_image_for_ocr(image.convert("RGB"))
+            arr = np.array(image)
+        t1 = time.perf_counter()
+        texts = pii_ocr.ocr_texts(ocr, arr)
+        rows.append({
+            "image": str(path),
+            "latency": time.perf_counter() - t1,
+            "text": pii_ocr.normalize_ocr_text(" ".join(texts)),
+        })
+
+    return {
+        "engine": pii_ocr.OCR_ENGINE,
+        "startup": startup,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "images": rows,
+    }
+
+
+def _spawn(engine: str, image_dir: str) -> Dict:
+    env = dict(os.environ, OCR_ENGINE=engine)
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.ocr_parity", image_dir, "--child"],
+        env=env, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(paddle: Dict, onnx: Dict) -> Dict:
+    from app.pii_main import pii_pipeline
+
+    rows = []
+    for a, b in zip(paddle["images"], onnx["images"]):
+        verdict_a = pii_pipeline(a["text"])[0] if a["text"] else False
+        verdict_b = pii_pipeline(b["text"])[0] if b["text"] else False
+        rows.append({
+            "image": a["image"],
+            "similarity": difflib.SequenceMatcher(None, a["text"], b["text"]).ratio(),
+            "exact": a["text"] == b["text"],
+            "verdict_match": verdict_a == verdict_b,
+            "latency_paddle": a["latency"],
+            "latency_onnx": b["latency"],
+        })
+
+    n = max(1, len(rows))
+    summary = {
+        "images": len(rows),
+        "mean_similarity": sum(r["similarity"] for r in rows) / n,
+        "exact_rate": sum(r["exact"] for r in rows) / n,
+        "verdict_agreement": sum(r["verdict_match"] for r in rows) / n,
+    }
+    for eng in (paddle, onnx):
+        name = eng["engine"]
+        lat = sorted(r["latency"] for r in eng["images"]) or [0.0]
+        summary[name] = {
+            "startup_s": eng["startup"],
+            "max_rss_mb": eng["max_rss_mb"],
+            "latency_p50_s": lat[len(lat) // 2],
+            "latency_mean_s": sum(lat) / len(lat),
+        }
+    return {"summary": summary, "images": rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="OCR engine parity benchmark (paddle vs onnx)")
+    parser.add_argument("image_dir")
+    parser.add_argument("--out", default="")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_engine(args.image_dir), ensure_ascii=False))
+        return
+
+    report = compare(_spawn("paddle", args.image_dir), _spawn("onnx", args.image_dir))
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(text, encoding="utf-8")
+    print(json.dumps(report["summary"], ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
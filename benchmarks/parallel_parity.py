@@ -0,0 +1,129 @@
+"""
+대용량 텍스트 병렬 분석 비교 (단일 스레드 vs app.pii_parallel)
+
+- 같은 텍스트에 대해 analyze_general(단일) / analyze_parallel 스팬 집합과 pii_pipeline 결과 일치 여부
+- 지연시간 비교 (PARALLEL_WORKERS 별로 반복 실행하여 코어 수 대비 확장성 확인)
+- scaling: 풀 종류(process, thread) x --workers 별 analyze_parallel 지연시간과 단일 대비 배율
+
+실행:
+    uv run python -m benchmarks.parallel_parity <text_file ...> [--repeat 3] [--workers 1,2,4] [--out report.json]
+    (텍스트 파일이 없으면 --synthetic <chars> 로 합성 텍스트 생성)
+"""
+import argparse
+import json
+import os
+import random
+import time
+from functools import partial
+from pathlib import Path
+from typing import Dict, List
+
+SNIPPETS = [
+    "홍길동 고객님 연락처는 010-2871-0779 입니다.",
+    "메일 gildong@example.com 으로 회신 바랍니다.",
+    "국민은행 123456-78-901234 로 입금해주세요.",
+    "사업자등록번호 220-81-62517 확인 부탁드립니다.",
+    "오늘 회의는 오후 3시에 시작합니다.",
+    "배송 조회 번호는 아직 발급되지 않았습니다.",
+]
+
+
+def synthetic(chars: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts: List[str] = []
+    size = 0
+    while size < chars:
+        s = rng.choice(SNIPPETS)
+        parts.append(s)
+        size += len(s) + 1
+    return " ".join(parts)[:chars]
+
+
+def _spans(results) -> List:
+    return sorted((r.entity_type, r.start, r.end, round(r.score, 6)) for r in results)
+
+
+def _best(repeat: int, fn, *args):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def scaling(text: str, repeat: int, workers: List[int], single_s: float) -> Dict:
+    """풀 종류 x 풀 크기 별 지연시간 (설정마다 풀을 다시 생성)"""
+    from app import pii_parallel
+
+    report: Dict = {}
+    saved = pii_parallel.PARALLEL_EXECUTOR, pii_parallel.PARALLEL_WORKERS
+    try:
+        for executor in ("process", "thread"):
+            for n in workers:
+                pii_parallel.stop_pools()
+                pii_parallel.PARALLEL_EXECUTOR, pii_parallel.PARALLEL_WORKERS = executor, n
+                pii_parallel.start_pools()
+                seconds, _ = _best(repeat, pii_parallel.analyze_parallel, text)
+                report.setdefault(executor, {})[n] = {"seconds": seconds, "speedup": single_s / seconds if seconds else None}
+    finally:
+        pii_parallel.stop_pools()
+        pii_parallel.PARALLEL_EXECUTOR, pii_parallel.PARALLEL_WORKERS = saved
+    return report
+
+
+def run(text: str, repeat: int, workers: List[int]) -> Dict:
+    os.environ["PARALLEL_ENABLED"] = "0"
+    from app import pii_general
+    from app.pii_main import pii_pipeline
+    from app.pii_parallel import PARALLEL_EXECUTOR, PARALLEL_WORKERS, analyze_parallel, split_segments
+
+    _timed = partial(_best, repeat)
+    single_s, single = _timed(pii_general.analyze_general, text)
+    parallel_s, parallel = _timed(analyze_parallel, text)
+    a, b = _spans(single), _spans(parallel)
+
+    pipeline_single = pii_pipeline(text)
+    pii_general.PARALLEL_ENABLED = True
+    pii_general.PARALLEL_MIN_CHARS = 0
+    pipeline_parallel = pii_pipeline(text)
+
+    return {
+        "chars": len(text),
+        "segments": len(split_segments(text)),
+        "executor": PARALLEL_EXECUTOR,
+        "workers": PARALLEL_WORKERS,
+        "spans": len(a),
+        "identical_spans": a == b,
+        "missing": [list(x) for x in sorted(set(a) - set(b))][:20],
+        "extra": [list(x) for x in sorted(set(b) - set(a))][:20],
+        "identical_pipeline": pipeline_single == pipeline_parallel,
+        "single_s": single_s,
+        "parallel_s": parallel_s,
+        "speedup": single_s / parallel_s if parallel_s else None,
+        "cpus": os.cpu_count(),
+        "scaling": scaling(text, repeat, workers, single_s),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parallel segmented analysis parity benchmark")
+    parser.add_argument("files", nargs="*")
+    parser.add_argument("--synthetic", type=int, default=1_000_000, help="텍스트 파일이 없을 때 합성 텍스트 길이")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", default="1,2,4", help="scaling 에서 비교할 풀 크기 (쉼표 구분)")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args()
+    workers = [int(n) for n in args.workers.split(",") if n.strip()]
+
+    texts = {f: Path(f).read_text(encoding="utf-8") for f in args.files} or {"synthetic": synthetic(args.synthetic)}
+    report = {name: run(text, args.repeat, workers) for name, text in texts.items()}
+
+    out = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        Path(args.out).write_text(out, encoding="utf-8")
+    print(out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+테스트 공통 설정
+
+- stub_analysis: Presidio/KoELECTRA 없이 실행하는 단위 테스트용 분석기 대역
+  (app.pii_general.analyze_general / involved_types, app.pii_main.find_unique_spans / mask_unique_ids)
+  정규식으로 이름(NAMES), 전화번호, 이메일, 주민등록번호(형식만)를 찾음
+"""
+import importlib
+import re
+import sys
+import types
+from typing import List, Tuple
+import pytest
+
+NAMES = ("홍길동", "김영희")
+GENERAL = [
+    ("KR_PERSON", re.compile("|".join(NAMES))),
+    ("KR_PHONE_NUMBER", re.compile(r"(?<!\d)01[016789]-\d{3,4}-\d{4}(?!\d)")),
+    ("EMAIL_ADDRESS", re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")),
+]
+RRN = re.compile(r"(?<!\d)\d{6}-[1-4]\d{6}(?!\d)")
+
+
+class Result:
+    def __init__(self, entity_type: str, start: int, end: int, score: float = 0.85):
+        self.entity_type, self.start, self.end, self.score = entity_type, start, end, score
+
+
+def analyze_general(text: str) -> List[Result]:
+    return sorted(
+        (Result(etype, m.start(), m.end()) for etype, pattern in GENERAL for m in pattern.finditer(text)),
+        key=lambda r: r.start,
+    )
+
+
+def involved_types(by_type) -> set:
+    from app.ruleset import current
+    return current().involved(by_type)
+
+
+def find_unique_spans(text: str) -> List[Tuple[str, int, int]]:
+    return [("주민등록번호", m.start(), m.end()) for m in RRN.finditer(text)]
+
+
+def mask_unique_ids(text: str) -> Tuple[bool, str, List[str]]:
+    masked = RRN.sub("[주민등록번호]", text)
+    return masked != text, masked, ["주민등록번호"] if masked != text else []
+
+
+@pytest.fixture
+def stub_analysis(monkeypatch):
+    """대역 분석기를 설치하고, 이를 import 하는 모듈은 새로 import 하도록 캐시에서 제거 (import_fresh 반환)"""
+    general = types.ModuleType("app.pii_general")
+    general.analyze_general, general.involved_types = analyze_general, involved_types
+    main = types.ModuleType("app.pii_main")
+    main.find_unique_spans, main.mask_unique_ids = find_unique_spans, mask_unique_ids
+    monkeypatch.setitem(sys.modules, "app.pii_general", general)
+    monkeypatch.setitem(sys.modules, "app.pii_main", main)
+
+    def import_fresh(name: str):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        return importlib.import_module(name)
+
+    for name in ("app.pii_stream", "app.pii_session"):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    return import_fresh
@@ -0,0 +1,38 @@
+"""
+품질 단계(app.degrade) fail-closed 동작
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import contextvars
+import pytest
+from app import degrade
+
+pii_main = pytest.importorskip("app.pii_main")
+
+NAME_PHONE = "홍길동 010-1234-5678"
+
+
+def _pipeline_at(tier: int, text: str, monkeypatch) -> tuple:
+    """스케줄러 워커와 같이 작업 컨텍스트에 단계를 설정한 뒤 pii_pipeline 실행"""
+    monkeypatch.setattr(degrade, "DEGRADE_FORCE_TIER", tier)
+
+    def _job():
+        degrade.enter_tier("text", degrade.TIERS.observe("text", 0.0, 0.0))
+        return pii_main.pii_pipeline(text)
+
+    return contextvars.copy_context().run(_job)
+
+
+def test_name_phone_blocked_at_tier3(monkeypatch):
+    blocked, masked, labels, reason = _pipeline_at(3, NAME_PHONE, monkeypatch)
+    assert blocked
+    assert reason == "일반개인정보"
+    assert "전화번호" in labels
+    assert "010-1234-5678" not in masked
+
+
+def test_tier3_not_more_permissive_than_tier1(monkeypatch):
+    full = _pipeline_at(1, NAME_PHONE, monkeypatch)
+    degraded = _pipeline_at(3, NAME_PHONE, monkeypatch)
+    assert full[0] and degraded[0]
@@ -0,0 +1,52 @@
+"""
+이름 사전(app.gazetteer) 탐색과 cascade 모델 입력 구간
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import pytest
+from app.gazetteer import Gazetteer, outside
+
+MIXED = "홍길동 님과 김영희 님께 보고서를 전달했습니다."  # 홍길동: 명부, 김영희: 명부 밖
+
+
+@pytest.fixture
+def gazetteer() -> Gazetteer:
+    return Gazetteer.from_names(["홍길동", "이순신"])
+
+
+def test_find_respects_word_boundaries(gazetteer):
+    assert gazetteer.find("홍길동님, 이순신에게") == [(0, 3), (6, 9)]
+    assert gazetteer.find("홍길동전") == []
+
+
+def test_outside_keeps_out_of_directory_name(gazetteer):
+    hits = gazetteer.find(MIXED)
+    assert [MIXED[s:e] for s, e in hits] == ["홍길동"]
+
+    segments = outside(MIXED, hits)
+    covered = "".join(MIXED[s:e] for s, e in segments)
+    assert "김영희" in covered
+    assert all(e <= hits[0][0] or s >= hits[0][1] for s, e in segments)
+
+
+def test_outside_drops_empty_segments():
+    text = "홍길동, 이순신"
+    assert outside(text, [(0, 3), (5, 8)]) == []
+    assert outside(text, []) == [(0, len(text))]
+
+
+def test_cascade_runs_model_on_out_of_directory_name(gazetteer):
+    pytest.importorskip("onnxruntime")
+    pytest.importorskip("presidio_analyzer")
+    from presidio_analyzer import RecognizerResult
+    from app.recognizer.per_recognizer import KRPersonRecognizer
+
+    rec = KRPersonRecognizer.__new__(KRPersonRecognizer)
+    rec.skip_on_hit, rec.batch_size = True, 8
+    rec._chunk_by_tokens = lambda text: [(text, 0)]
+    found = [RecognizerResult("KR_PERSON", s, e, 0.85) for s, e in gazetteer.find(MIXED)]
+
+    inputs = [(chunk, base) for texts, bases in rec._batches(MIXED, found) for chunk, base in zip(texts, bases)]
+    assert any("김영희" in chunk and MIXED[base:base + len(chunk)] == chunk for chunk, base in inputs)
+    assert not any("홍길동" in chunk for chunk, _ in inputs)
@@ -0,0 +1,71 @@
+"""
+탐지 규칙(app.ruleset) 교체, 요청 고정, 조합 판정
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import contextvars
+import pytest
+import yaml
+from app import ruleset
+
+
+@pytest.fixture
+def rules_file(tmp_path, monkeypatch):
+    """현재 규칙 파일 복사본 (테스트 후 기존 규칙 복원)"""
+    monkeypatch.setattr(ruleset, "_current", ruleset._current)
+    path = tmp_path / "ruleset.yml"
+    path.write_bytes(ruleset.RULESET_PATH.read_bytes())
+    return path
+
+
+def _edit(path, **changes) -> None:
+    data = yaml.safe_load(path.read_text(encoding="utf-8"))
+    data.update(changes)
+    path.write_text(yaml.safe_dump(data, allow_unicode=True), encoding="utf-8")
+
+
+def test_reload_swaps_rules_and_reports_version(rules_file):
+    before = ruleset.current()
+    assert ruleset.reload(rules_file) == (False, before.version)
+
+    _edit(rules_file, window=50)
+    changed, version = ruleset.reload(rules_file)
+    assert changed and version != before.version
+    assert ruleset.current().window == 50
+    assert before.window != 50  # 기존 객체는 그대로 (불변)
+
+
+@pytest.mark.parametrize("content", ["window: [", "- not a mapping", "window: 10\nand_rules: [[KR_PERSON, NEW_TYPE]]\nlabel_map: {}\ntag_map: {}"])
+def test_invalid_reload_keeps_current_rules(rules_file, content):
+    before = ruleset.current()
+    rules_file.write_text(content, encoding="utf-8")
+    with pytest.raises(ruleset.RulesetError):
+        ruleset.reload(rules_file)
+    assert ruleset.current() is before
+
+
+def test_pinned_request_keeps_rules_across_reload(rules_file):
+    before = ruleset.current()
+    request = contextvars.copy_context()
+    assert request.run(ruleset.pin) is before
+
+    _edit(rules_file, window=50)
+    ruleset.reload(rules_file)
+    assert request.run(ruleset.current) is before
+    assert ruleset.current().window == 50
+
+
+def test_rules_are_immutable():
+    with pytest.raises(AttributeError):
+        ruleset.current().window = 0
+
+
+def test_involved_respects_window():
+    rules = ruleset.current()
+    near = {"KR_PERSON": [(0, 3)], "KR_PHONE_NUMBER": [(10, 23)]}
+    far = {"KR_PERSON": [(0, 3)], "KR_PHONE_NUMBER": [(rules.window + 10, rules.window + 23)]}
+    assert rules.involved(near) == {"KR_PERSON", "KR_PHONE_NUMBER"}
+    assert rules.involved(far) == set()
+    assert rules.involved(far, 0) == {"KR_PERSON", "KR_PHONE_NUMBER"}
+    assert rules.involved({"KR_PERSON": [(0, 3)]}) == set()
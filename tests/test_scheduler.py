@@ -0,0 +1,104 @@
+"""
+스케줄러(app.scheduler) 가중치 순서, 수용 제어, text 예약
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import asyncio
+import threading
+import pytest
+from app.scheduler import Overloaded, Scheduler, WorkloadClass
+
+
+def _scheduler(workers: int = 1, reserved: int = 0, **classes) -> Scheduler:
+    """classes: 이름=(큐 크기, 가중치, 동시 실행 상한, 마감 ms)"""
+    return Scheduler({name: WorkloadClass(name, *spec) for name, spec in classes.items()}, workers, reserved=reserved)
+
+
+async def _blocked(sched: Scheduler, cls: str, gate: threading.Event) -> asyncio.Future:
+    """gate 가 열릴 때까지 워커를 점유하는 작업 (실행 시작까지 대기)"""
+    started = threading.Event()
+
+    def _hold():
+        started.set()
+        gate.wait(5)
+
+    task = asyncio.ensure_future(sched.run(cls, _hold))
+    while not started.is_set():
+        await asyncio.sleep(0.005)
+    return task
+
+
+def test_weighted_round_robin_order():
+    sched = _scheduler(hold=(1, 1, 1, 5000), text=(16, 3, 1, 5000), image=(16, 1, 1, 5000))
+    order = []
+
+    async def main():
+        gate = threading.Event()
+        blocker = await _blocked(sched, "hold", gate)
+        jobs = [asyncio.ensure_future(sched.run(cls, order.append, cls)) for cls in ["text"] * 6 + ["image"] * 6]
+        await asyncio.sleep(0.02)
+        gate.set()
+        await asyncio.gather(blocker, *jobs)
+
+    asyncio.run(main())
+    # smooth weighted round-robin 3:1 → text, text, image, text 반복
+    assert order[:8] == ["text", "text", "image", "text"] * 2
+
+
+def test_queue_full_rejects_with_429():
+    sched = _scheduler(text=(1, 1, 1, 5000))
+
+    async def main():
+        gate = threading.Event()
+        blocker = await _blocked(sched, "text", gate)
+        queued = asyncio.ensure_future(sched.run("text", lambda: "ok"))
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded) as exc:
+            await sched.run("text", lambda: "rejected")
+        gate.set()
+        assert await queued == "ok"
+        await blocker
+        return exc.value
+
+    error = asyncio.run(main())
+    assert (error.reason, error.status_code) == ("queue_full", 429)
+    assert error.retry_after >= 1
+
+
+def test_deadline_expired_in_queue_rejects_with_503():
+    sched = _scheduler(text=(4, 1, 1, 5000))
+    ran = []
+
+    async def main():
+        gate = threading.Event()
+        blocker = await _blocked(sched, "text", gate)
+        late = asyncio.ensure_future(sched.run("text", ran.append, 1, deadline_ms=10))
+        await asyncio.sleep(0.05)
+        gate.set()
+        await blocker
+        with pytest.raises(Overloaded) as exc:
+            await late
+        return exc.value
+
+    error = asyncio.run(main())
+    assert (error.reason, error.status_code) == ("deadline", 503)
+    assert ran == []
+
+
+def test_text_runs_while_background_classes_hold_shared_workers():
+    sched = _scheduler(workers=2, reserved=1, text=(8, 8, 2, 5000), image=(8, 1, 1, 60000), job=(8, 1, 1, 60000))
+
+    async def main():
+        gate = threading.Event()
+        image = await _blocked(sched, "image", gate)
+        job_started = threading.Event()
+        job = asyncio.ensure_future(sched.run("job", job_started.set))
+        # 남은 워커 1개는 text 전용: job 은 대기, text 는 바로 실행
+        assert await asyncio.wait_for(sched.run("text", lambda: "text"), 1) == "text"
+        assert not job_started.is_set()
+        gate.set()
+        await asyncio.gather(image, job)
+        assert job_started.is_set()
+
+    asyncio.run(main())
@@ -0,0 +1,61 @@
+"""
+대화 세션 증분 분석(app.pii_session) offset 확인, 세션 단위 판정
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import pytest
+
+
+@pytest.fixture
+def pii_session(stub_analysis):
+    return stub_analysis("app.pii_session")
+
+
+@pytest.fixture
+def store(pii_session):
+    return pii_session.SessionStore()
+
+
+def test_offset_mismatch_raises_with_current_length(pii_session, store):
+    store.append("c1", "안녕하세요.", 0)
+    with pytest.raises(pii_session.SessionOffsetError) as exc:
+        store.append("c1", " 다음 메시지", 3)
+    assert exc.value.length == len("안녕하세요.")
+
+
+def test_unknown_session_with_nonzero_offset_is_rejected(pii_session, store):
+    # 다른 워커/만료된 세션에 이어 붙이지 않음 (클라이언트는 전체 텍스트를 offset=0 으로 재전송)
+    with pytest.raises(pii_session.SessionOffsetError) as exc:
+        store.append("missing", "텍스트", 10)
+    assert exc.value.length == 0
+
+
+def test_offset_zero_resets_session(store):
+    store.append("c1", "홍길동 님 010-1234-5678", 0)
+    result = store.append("c1", "새 대화", 0)
+    assert result["offset"] == len("새 대화")
+    assert result["blocked"] is False
+
+
+def test_pair_across_appends_blocks_and_masks_prefix(store):
+    first = "담당자는 홍길동 입니다."
+    r1 = store.append("c1", first, 0)
+    assert r1["blocked"] is False and r1["masked_text"] == first
+
+    r2 = store.append("c1", " 연락처 010-1234-5678", r1["offset"])
+    assert r2["blocked"] and r2["reason"] == "일반개인정보"
+    assert set(r2["label_list"]) == {"이름", "전화번호"}
+    assert r2["masked_text"] == " 연락처 [전화번호]"
+    assert r2["prefix_masks"] == [{"start": 5, "end": 8, "tag": "[이름]"}]
+
+    # 이미 알린 앞부분 마스크는 다시 보내지 않음
+    r3 = store.append("c1", " 감사합니다.", r2["offset"])
+    assert r3["blocked"] and r3["prefix_masks"] == []
+
+
+def test_unique_id_split_across_appends(store):
+    r1 = store.append("c1", "주민번호 900101-12", 0)
+    r2 = store.append("c1", "34567 입니다", r1["offset"])
+    assert r2["reason"] == "고유식별번호"
+    assert r2["prefix_masks"] == [{"start": 5, "end": 19, "tag": "[주민등록번호]"}]
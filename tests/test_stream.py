@@ -0,0 +1,72 @@
+"""
+스트리밍 마스킹(app.pii_stream) 보류/판정
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import pytest
+
+
+@pytest.fixture
+def pii_stream(stub_analysis):
+    return stub_analysis("app.pii_stream")
+
+
+def _stream(pii_stream, text: str, step: int = 5):
+    masker = pii_stream.StreamMasker()
+    out = [masker.feed(text[i:i + step]) for i in range(0, len(text), step)]
+    out.append(masker.close())
+    return "".join(out), masker
+
+
+def test_forced_flush_masks_without_labels(pii_stream, monkeypatch):
+    # 짝이 올 수 있는 동안 보류 중인 단독 전화번호가 보류 상한으로 강제 방출되는 경우
+    monkeypatch.setattr(pii_stream, "STREAM_MAX_HOLDBACK", 64)
+    out, masker = _stream(pii_stream, "연락처 010-1234-5678 " + "오늘 회의는 오후에 시작합니다. " * 10)
+    assert "010-1234-5678" not in out and "[전화번호]" in out
+    assert masker.forced == 1
+    blocked, labels, reason = masker.verdict()
+    assert (blocked, labels, reason) == (False, [], "")
+
+
+def test_labels_imply_blocked(pii_stream):
+    out, masker = _stream(pii_stream, "홍길동 고객님 연락처는 010-1234-5678 입니다.")
+    blocked, labels, reason = masker.verdict()
+    assert blocked and reason == "일반개인정보"
+    assert set(labels) == {"이름", "전화번호"}
+    assert out == "[이름] 고객님 연락처는 [전화번호] 입니다."
+
+
+@pytest.mark.parametrize("step", [1, 3, 7, 16])
+def test_pair_across_chunks_is_masked_retroactively(pii_stream, step):
+    # 이름이 먼저 방출 대상이 되어도 window 안에 짝(전화번호)이 올 수 있는 동안 보류
+    text = "담당자는 홍길동 입니다. " + "일정은 다음 주에 다시 공유드리겠습니다. " * 3 + "연락처 010-1234-5678"
+    out, masker = _stream(pii_stream, text, step)
+    assert "홍길동" not in out and "010-1234-5678" not in out
+    assert out.count("[이름]") == 1 and out.count("[전화번호]") == 1
+    assert masker.verdict()[0]
+
+
+@pytest.mark.parametrize("step", [1, 2, 5, 11])
+def test_unique_id_split_across_chunks_is_masked(pii_stream, step):
+    text = "주민번호는 900101-1234567 이고 " + "나머지 내용입니다. " * 10
+    out, masker = _stream(pii_stream, text, step)
+    assert "1234567" not in out and "[주민등록번호]" in out
+    assert masker.verdict() == (True, ["주민등록번호"], "고유식별번호")
+
+
+def test_forced_flush_never_splits_unique_id_in_long_run(pii_stream, monkeypatch):
+    # 공백 없는 긴 런(JSON) 안에서 강제 방출해도 번호를 나누지 않음
+    monkeypatch.setattr(pii_stream, "STREAM_MAX_HOLDBACK", 64)
+    text = "".join('{"id":"900101-1234567","n":%d},' % i for i in range(40))
+    for step in (1, 7, 13):
+        out, _ = _stream(pii_stream, text, step)
+        assert "1234567" not in out
+        assert out.count("[주민등록번호]") == 40
+
+
+def test_output_matches_input_without_pii(pii_stream):
+    text = "오늘 회의는 오후 3시에 시작합니다. " * 20
+    out, masker = _stream(pii_stream, text, 4)
+    assert out == text
+    assert masker.verdict() == (False, [], "")
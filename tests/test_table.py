@@ -0,0 +1,134 @@
+"""
+표(CSV) 열 단위 검사(app.pii_table) NumPy 검증기와 기존 인식기(셀 단위) 판정 일치
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import importlib.util
+import random
+from datetime import datetime
+from pathlib import Path
+import numpy as np
+import pytest
+from app import pii_table
+
+RECOGNIZER_DIR = Path(__file__).resolve().parents[1] / "app" / "recognizer"
+SAMPLES = 20000
+
+
+def _scalar(name: str):
+    """Presidio 를 쓰지 않는 인식기 모듈 (패키지 __init__ 를 거치지 않고 로드)"""
+    spec = importlib.util.spec_from_file_location(f"_scalar_{name}", RECOGNIZER_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _matrix(digits):
+    return pii_table._digit_matrix(digits, len(digits[0]))
+
+
+def _registration_samples(rng: random.Random):
+    """날짜/7번째 자리/체크섬 경계가 섞이도록 만든 13자리 번호"""
+    out = []
+    for _ in range(SAMPLES):
+        front = f"{rng.randrange(100):02d}{rng.randrange(14):02d}{rng.randrange(33):02d}"
+        body = front + str(rng.randrange(10)) + "".join(str(rng.randrange(10)) for _ in range(5))
+        s = sum(int(c) * w for c, w in zip(body, pii_table.RRN_WEIGHTS.tolist()))
+        check = (11 - s % 11) % 10 if rng.random() < 0.5 else rng.randrange(10)
+        out.append(body + str(check))
+    return out + ["0002291234560", "0102291234560", "2010014000000", "2009304000000", "9001011234568"]
+
+
+@pytest.mark.parametrize("name, alien", [("rrn_recognizer", False), ("arn_recognizer", True)])
+def test_registration_matches_scalar(name, alien):
+    module = _scalar(name)
+    pattern, valid = (module.ARN_PATTERN, module._valid_arn) if alien else (module.RRN_PATTERN, module._valid_rrn)
+    digits = _registration_samples(random.Random(0))
+    expected = [bool((m := pattern.fullmatch(d)) and valid(m)) for d in digits]
+    assert pii_table.valid_registration(_matrix(digits), alien=alien).tolist() == expected
+    assert sum(expected) > 100
+
+
+def test_driver_license_matches_scalar():
+    module = _scalar("dln_recognizer")
+    rng = random.Random(0)
+    now = datetime.now()
+    digits = [
+        f"{rng.randrange(5, 30):02d}{rng.randrange(100):02d}"
+        + ("000000" if rng.random() < 0.1 else f"{rng.randrange(10 ** 6):06d}")
+        + f"{rng.randrange(100):02d}"
+        for _ in range(SAMPLES)
+    ]
+    cells = [f"{d[:2]}-{d[2:4]}-{d[4:10]}-{d[10:]}" for d in digits]
+    expected = [module._valid_dln(module.DLN_PATTERN.fullmatch(c), now) for c in cells]
+    assert pii_table.valid_driver_license(_matrix(digits), now).tolist() == expected
+    assert sum(expected) > 100
+
+
+def test_business_no_matches_scalar():
+    pytest.importorskip("presidio_analyzer")
+    from app.recognizer.brn_recognizer import KRBusinessRegistrationRecognizer as brn
+
+    rng = random.Random(0)
+    digits = [f"{rng.randrange(10 ** 10):010d}" for _ in range(SAMPLES)] + ["0000000000", "1111111111", "2208162517"]
+    expected = [brn._checksum_ok(d) and not brn._looks_bad(d) for d in digits]
+    assert pii_table.valid_business_no(_matrix(digits)).tolist() == expected
+
+
+def test_phone_matches_scalar():
+    pytest.importorskip("presidio_analyzer")
+    from app.recognizer.phone_recognizer import KRPhoneRecognizer
+
+    rng = random.Random(0)
+    digits = [f"010{rng.randrange(10 ** 8):08d}" for _ in range(SAMPLES)]
+    digits += ["01012340000", "01011111111", "01012341234", "01012345678"]
+    expected = [not KRPhoneRecognizer._looks_bad(d) for d in digits]
+    assert pii_table.valid_phone(_matrix(digits)).tolist() == expected
+
+
+def _luhn(d: str) -> bool:
+    total = 0
+    for i, c in enumerate(reversed(d)):
+        n = int(c) * (2 if i % 2 else 1)
+        total += n - 9 if n > 9 else n
+    return total % 10 == 0
+
+
+@pytest.mark.parametrize("width", [13, 15, 16, 19])
+def test_luhn_matches_scalar(width):
+    rng = random.Random(width)
+    digits = [f"{rng.randrange(10 ** width):0{width}d}" for _ in range(SAMPLES)]
+    assert pii_table.valid_luhn(_matrix(digits)).tolist() == [_luhn(d) for d in digits]
+
+
+def test_date_ok_leap_years():
+    year = np.array([2000, 1900, 2024, 2023, 2023, 2023])
+    month = np.array([2, 2, 2, 2, 4, 13])
+    day = np.array([29, 29, 29, 29, 31, 1])
+    assert pii_table._date_ok(year, month, day).tolist() == [True, False, True, False, False, False]
+
+
+def test_scan_id_column_whole_cell_shapes():
+    values = [
+        "900101-1234568",        # 주민등록번호 (체크섬 일치)
+        "900101-1234567",        # 체크섬 불일치: 형태는 맞으므로 text 처리 없음
+        " 010-2345-6789 ",       # 휴대폰번호 (앞뒤 공백 유지한 위치)
+        "010-2345-6789, 010-3456-7890",  # 번호 여러 개: text 처리로
+        "M12345678",             # 여권번호
+        "4111 1111 1111 1111",   # 카드번호 (Luhn)
+        "12-34",                 # 자릿수 부족: 무시
+        "",
+    ]
+    unique, general, fallback = pii_table.scan_id_column(values)
+    assert unique == {0: [("주민등록번호", 0, 14)], 4: [("여권번호", 0, 9)]}
+    assert general[2] == [("KR_PHONE_NUMBER", 1, 14)]
+    assert general[5] == [("CREDIT_CARD", 0, 19)]
+    assert 1 not in unique and 1 not in general
+    assert fallback == [3]
+
+
+def test_infer_column_types():
+    columns = ["id", "memo", "blank"]
+    sample = [["900101-1234568", "안녕하세요", ""], ["010-2345-6789", "메모 123", " "], ["M12345678", "-", ""]]
+    assert pii_table.infer_column_types(columns, sample) == {"id": "id", "memo": "text", "blank": "empty"}
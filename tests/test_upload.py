@@ -0,0 +1,104 @@
+"""
+multipart 스트리밍 수신(app.upload) 형식 판별, 크기/개수 제한
+
+실행:
+    uv run python -m pytest -q tests
+"""
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from app import upload
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64
+PDF = b"%PDF-1.7\n" + b"\x00" * 64
+
+
+@pytest.fixture
+def client():
+    """read_uploads 만 거치는 최소 앱 (파일 이름, 형식, 크기 반환)"""
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def _upload(request: Request):
+        files = await upload.read_uploads(request)
+        try:
+            return [[f.filename, f.content_type, f.size] for f in files]
+        finally:
+            upload.close_uploads(files)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("head, mime", [
+    (PNG, "image/png"),
+    (b"\xff\xd8\xff\xe0" + b"\x00" * 12, "image/jpeg"),
+    (b"GIF89a" + b"\x00" * 10, "image/gif"),
+    (b"II*\x00" + b"\x00" * 12, "image/tiff"),
+    (b"RIFF\x00\x00\x00\x00WEBPVP8 ", "image/webp"),
+    (PDF, "application/pdf"),
+    (b"RIFF\x00\x00\x00\x00WAVEfmt ", None),
+    (b"PK\x03\x04" + b"\x00" * 12, None),
+    (b"", None),
+])
+def test_sniff_type(head, mime):
+    assert upload.sniff_type(head[:upload.SNIFF_BYTES]) == mime
+
+
+def test_type_checked_by_content_not_extension(client):
+    response = client.post("/upload", files=[
+        ("files", ("scan.pdf", PNG, "application/pdf")),
+        ("files", ("doc.png", PDF, "image/png")),
+    ])
+    assert response.status_code == 200
+    assert response.json() == [["scan.pdf", "image/png", len(PNG)], ["doc.png", "application/pdf", len(PDF)]]
+
+
+@pytest.mark.parametrize("data", [b"MZ\x90\x00" + b"\x00" * 64, b"\x89P"])
+def test_unsupported_type_is_415(client, data):
+    # 짧은 파일(SNIFF_BYTES 미만)은 finish 에서 판별
+    response = client.post("/upload", files=[("files", ("a.png", data, "image/png"))])
+    assert response.status_code == 415
+
+
+def test_file_too_large_is_413(client, monkeypatch):
+    monkeypatch.setattr(upload, "MAX_UPLOAD_FILE_BYTES", 32)
+    response = client.post("/upload", files=[("files", ("a.png", PNG, "image/png"))])
+    assert response.status_code == 413
+
+
+def test_request_too_large_is_413(client, monkeypatch):
+    monkeypatch.setattr(upload, "MAX_UPLOAD_REQUEST_BYTES", 100)
+    response = client.post("/upload", files=[("files", ("a.png", PNG, "image/png")), ("files", ("b.png", PNG, "image/png"))])
+    assert response.status_code == 413
+
+
+def test_too_many_files_is_413(client, monkeypatch):
+    monkeypatch.setattr(upload, "MAX_UPLOAD_FILES", 1)
+    response = client.post("/upload", files=[("files", ("a.png", PNG, "image/png")), ("files", ("b.png", PNG, "image/png"))])
+    assert response.status_code == 413
+
+
+def test_no_files_in_field_is_422(client):
+    response = client.post("/upload", files=[("other", ("a.png", PNG, "image/png"))], data={"files": "text"})
+    assert response.status_code == 422
+
+
+def test_non_multipart_is_415(client):
+    response = client.post("/upload", json={"files": []})
+    assert response.status_code == 415
+
+
+def test_large_file_spools_to_disk(monkeypatch):
+    monkeypatch.setattr(upload, "UPLOAD_SPOOL_BYTES", 16)
+    spooled = upload.SpooledUpload("a.png")
+    for i in range(0, len(PNG), 8):
+        spooled.write(PNG[i:i + 8])
+    spooled.finish()
+    assert spooled.file._rolled
+    with spooled.buffer() as buf:
+        assert bytes(buf[:len(PNG)]) == PNG
+    spooled.close()